@@ -300,7 +300,12 @@ class IndraNetAssembler():
 
             More columns can be added by providing the extra_columns parameter.
         """
-        rows = []
+        # The data frame is built column by column, with the values that
+        # only depend on the statement computed once for all its edges
+        columns = OrderedDict((col, []) for col in df_columns)
+        if extra_columns:
+            for col_name, _ in extra_columns:
+                columns[col_name] = []
         if exclude_stmts:
             exclude_types = tuple(
                 get_statement_by_name(st_type) for st_type in exclude_stmts)
@@ -312,86 +317,33 @@ class IndraNetAssembler():
                 logger.debug('Skipping a statement of a type %s.'
                              % type(stmt).__name__)
                 continue
-            not_none_agents = stmt.real_agent_list()
-
-            # Exclude statements with less than 2 agents
-            if len(not_none_agents) < 2:
-                continue
-            # Special handling for Influences and Associations
-            if isinstance(stmt, (Influence, Association)):
-                stmt_pol = stmt.overall_polarity()
-                if stmt_pol == 1:
-                    sign = 0
-                elif stmt_pol == -1:
-                    sign = 1
-                else:
-                    sign = None
-                if isinstance(stmt, Influence):
-                    edges = [(stmt.subj.concept, stmt.obj.concept, sign)]
-                else:
-                    edges = [(a, b, sign) for a, b in
-                             permutations(not_none_agents, 2)]
-            # Handle complexes by creating pairs of their
-            # not-none-agents.
-            elif isinstance(stmt, Complex):
-                # Do not add complexes with more members than complex_members
-                if len(not_none_agents) > complex_members:
-                    logger.debug('Skipping a complex with %d members.'
-                                 % len(not_none_agents))
-                    continue
-                else:
-                    # add every permutation with a neutral polarity
-                    edges = [(a, b, None) for a, b in
-                             permutations(not_none_agents, 2)]
-            elif isinstance(stmt, Conversion):
-                edges = []
-                if stmt.subj:
-                    for obj in stmt.obj_from:
-                        edges.append((stmt.subj, obj, 1))
-                    for obj in stmt.obj_to:
-                        edges.append((stmt.subj, obj, 0))
-            # This is for any remaining statement type that may not be
-            # handled above explicitly but somehow has more than two
-            # not-none-agents at this point
-            elif len(not_none_agents) > 2:
+            edges = _get_stmt_edges(stmt, complex_members)
+            # Filter out self-loops
+            if not keep_self_loops:
+                edges = [(agA, agB, sign) for agA, agB, sign in edges
+                         if agA.name != agB.name]
+            if not edges:
                 continue
-            else:
-                edges = [(not_none_agents[0], not_none_agents[1], None)]
-            for (agA, agB, sign) in edges:
-                # Filter out self-loops
-                if not keep_self_loops and agA.name == agB.name:
-                    continue
-                agA_ns, agA_id = get_ag_ns_id(agA)
-                agB_ns, agB_id = get_ag_ns_id(agB)
-                stmt_type = type(stmt).__name__
-                try:
-                    res = stmt.residue
-                except AttributeError:
-                    res = None
-                try:
-                    pos = stmt.position
-                except AttributeError:
-                    pos = None
-                row = OrderedDict([
-                    ('agA_name', agA.name),
-                    ('agB_name', agB.name),
-                    ('agA_ns', agA_ns),
-                    ('agA_id', agA_id),
-                    ('agB_ns', agB_ns),
-                    ('agB_id', agB_id),
-                    ('residue', res),
-                    ('position', pos),
-                    ('stmt_type', stmt_type),
-                    ('evidence_count', len(stmt.evidence)),
-                    ('stmt_hash', stmt.get_hash(refresh=True)),
-                    ('belief', stmt.belief),
-                    ('source_counts', _get_source_counts(stmt)),
-                    ('initial_sign', sign)])
-                if extra_columns:
-                    for col_name, func in extra_columns:
-                        row[col_name] = func(stmt)
-                rows.append(row)
-        df = pd.DataFrame.from_dict(rows)
+            ns_ids = {}
+            for agA, agB, sign in edges:
+                for ag in (agA, agB):
+                    if id(ag) not in ns_ids:
+                        ns_ids[id(ag)] = get_ag_ns_id(ag)
+                agA_ns, agA_id = ns_ids[id(agA)]
+                agB_ns, agB_id = ns_ids[id(agB)]
+                columns['agA_name'].append(agA.name)
+                columns['agB_name'].append(agB.name)
+                columns['agA_ns'].append(agA_ns)
+                columns['agA_id'].append(agA_id)
+                columns['agB_ns'].append(agB_ns)
+                columns['agB_id'].append(agB_id)
+                columns['initial_sign'].append(sign)
+            stmt_values = _get_edge_data(stmt, extra_columns)
+            for col_name, value in stmt_values.items():
+                columns[col_name].extend([value] * len(edges))
+        if not columns['agA_name']:
+            return pd.DataFrame()
+        df = pd.DataFrame(columns)
         df = df.where((pd.notnull(df)), None)
         return df
 
@@ -557,6 +509,62 @@ class IndraNetAssembler():
         return G
 
 
+df_columns = ['agA_name', 'agB_name', 'agA_ns', 'agA_id', 'agB_ns', 'agB_id',
+              'residue', 'position', 'stmt_type', 'evidence_count',
+              'stmt_hash', 'belief', 'source_counts', 'initial_sign']
+
+
+def _get_stmt_edges(stmt, complex_members):
+    """Return the (agent A, agent B, sign) tuples of the edges of a statement.
+    """
+    not_none_agents = stmt.real_agent_list()
+
+    # Exclude statements with less than 2 agents
+    if len(not_none_agents) < 2:
+        return []
+    # Special handling for Influences and Associations
+    if isinstance(stmt, (Influence, Association)):
+        stmt_pol = stmt.overall_polarity()
+        if stmt_pol == 1:
+            sign = 0
+        elif stmt_pol == -1:
+            sign = 1
+        else:
+            sign = None
+        if isinstance(stmt, Influence):
+            edges = [(stmt.subj.concept, stmt.obj.concept, sign)]
+        else:
+            edges = [(a, b, sign) for a, b in
+                     permutations(not_none_agents, 2)]
+    # Handle complexes by creating pairs of their
+    # not-none-agents.
+    elif isinstance(stmt, Complex):
+        # Do not add complexes with more members than complex_members
+        if len(not_none_agents) > complex_members:
+            logger.debug('Skipping a complex with %d members.'
+                         % len(not_none_agents))
+            return []
+        else:
+            # add every permutation with a neutral polarity
+            edges = [(a, b, None) for a, b in
+                     permutations(not_none_agents, 2)]
+    elif isinstance(stmt, Conversion):
+        edges = []
+        if stmt.subj:
+            for obj in stmt.obj_from:
+                edges.append((stmt.subj, obj, 1))
+            for obj in stmt.obj_to:
+                edges.append((stmt.subj, obj, 0))
+    # This is for any remaining statement type that may not be
+    # handled above explicitly but somehow has more than two
+    # not-none-agents at this point
+    elif len(not_none_agents) > 2:
+        return []
+    else:
+        edges = [(not_none_agents[0], not_none_agents[1], None)]
+    return edges
+
+
 def _get_source_counts(stmt):
     source_counts = defaultdict(int)
     for ev in stmt.evidence:
@@ -27,16 +27,17 @@ INDRA_RESOURCES = path.join(INDRA_ROOT, 'resources')
 with open(path.join(INDRA_RESOURCES, 'source_mapping.json'), 'r') as f:
     db_source_mapping = json.load(f)
 
+mandatory_columns = ['agA_name', 'agB_name', 'agA_ns', 'agA_id', 'agB_ns',
+                     'agB_id', 'stmt_type', 'evidence_count', 'stmt_hash',
+                     'belief', 'source_counts']
+
 
 class IndraNet(nx.MultiDiGraph):
     """A Networkx representation of INDRA Statements."""
     def __init__(self, incoming_graph_data=None, **attr):
         super().__init__(incoming_graph_data, **attr)
         self._is_multi = True
-        self.mandatory_columns = ['agA_name', 'agB_name', 'agA_ns', 'agA_id',
-                                  'agB_ns', 'agB_id', 'stmt_type',
-                                  'evidence_count', 'stmt_hash', 'belief',
-                                  'source_counts']
+        self.mandatory_columns = list(mandatory_columns)
 
     @classmethod
     def from_df(cls, df):
@@ -66,60 +67,9 @@ class IndraNet(nx.MultiDiGraph):
             An IndraNet object
         """
         graph = cls()
-        mandatory_columns = graph.mandatory_columns
-        if not set(mandatory_columns).issubset(set(df.columns)):
-            raise ValueError('Missing one or more columns of %s in data '
-                             'frame' % mandatory_columns)
-        node_keys = {'agA': set(), 'agB': set()}
-        edge_keys = set()
-        for key in df.columns:
-            if key not in mandatory_columns:
-                if key.startswith('agA_'):
-                    node_keys['agA'].add(key)
-                if key.startswith('agB_'):
-                    node_keys['agB'].add(key)
-                if not key.startswith('ag'):
-                    edge_keys.add(key)
-        index = 0
-        skipped = 0
-        for index, row in df.iterrows():
-            if row['agA_name'] is None or row['agB_name'] is None:
-                skipped += 1
-                logger.warning('None found as node (index %d)' % index)
-                continue
-            # Check and get node/edge attributes
-            nodeA_attr = {}
-            nodeB_attr = {}
-            edge_attr = {}
-            if node_keys['agA']:
-                for key in node_keys['agA']:
-                    nodeA_attr[key] = row[key]
-            if node_keys['agB']:
-                for key in node_keys['agB']:
-                    nodeB_attr[key] = row[key]
-            if edge_keys:
-                for key in edge_keys:
-                    edge_attr[key] = row[key]
-
-            # Add non-existing nodes
-            if row['agA_name'] not in graph.nodes:
-                graph.add_node(row['agA_name'], ns=row['agA_ns'],
-                               id=row['agA_id'], **nodeA_attr)
-            if row['agB_name'] not in graph.nodes:
-                graph.add_node(row['agB_name'], ns=row['agB_ns'],
-                               id=row['agB_id'], **nodeB_attr)
-            # Add edges
-            ed = {'u_for_edge': row['agA_name'],
-                  'v_for_edge': row['agB_name'],
-                  'stmt_hash': row['stmt_hash'],
-                  'stmt_type': row['stmt_type'],
-                  'evidence_count': row['evidence_count'],
-                  'belief': row['belief'],
-                  'source_counts': row['source_counts'],
-                  **edge_attr}
-            graph.add_edge(**ed)
-        if skipped:
-            logger.warning('Skipped %d edges with None as node' % skipped)
+        nodes, edges = _get_nodes_edges_from_df(df)
+        graph.add_nodes_from(nodes.items())
+        graph.add_edges_from(edges)
         return graph
 
     def to_digraph(self, flattening_method=None, weight_mapping=None):
@@ -139,22 +89,8 @@ class IndraNet(nx.MultiDiGraph):
         G : IndraNet(nx.DiGraph)
             An IndraNet graph flattened to a DiGraph
         """
-        G = nx.DiGraph()
-        for u, v, data in self.edges(data=True):
-            # Add nodes and their attributes
-            if u not in G.nodes:
-                G.add_node(u, **self.nodes[u])
-            if v not in G.nodes:
-                G.add_node(v, **self.nodes[v])
-            # Add edges and their attributes
-            if G.has_edge(u, v):
-                G[u][v]['statements'].append(data)
-            else:
-                G.add_edge(u, v, statements=[data])
-        G = self._update_edge_belief(G, flattening_method)
-        if weight_mapping:
-            G = weight_mapping(G)
-        return G
+        return self._make_digraph(self.edges(data=True), self.nodes,
+                                  flattening_method, weight_mapping)
 
     def to_signed_graph(self, sign_dict=None,
                         flattening_method=None, weight_mapping=None):
@@ -205,35 +141,17 @@ class IndraNet(nx.MultiDiGraph):
         SG : IndraNet(nx.MultiDiGraph)
             An IndraNet graph flattened to a signed graph
         """
-        sign_dict = default_sign_dict if not sign_dict else sign_dict
-
-        SG = nx.MultiDiGraph()
-        for u, v, data in self.edges(data=True):
-            # Add nodes and their attributes
-            if u not in SG.nodes:
-                SG.add_node(u, **self.nodes[u])
-            if v not in SG.nodes:
-                SG.add_node(v, **self.nodes[v])
-            # Explicit 'is not None' needed to accept 0
-            if data.get('initial_sign') is not None:
-                sign = data['initial_sign']
-            elif data['stmt_type'] not in sign_dict:
-                continue
-            else:
-                sign = sign_dict[data['stmt_type']]
-            if SG.has_edge(u, v, sign):
-                SG[u][v][sign]['statements'].append(data)
-            else:
-                SG.add_edge(u, v, sign, statements=[data], sign=sign)
-        SG = self._update_edge_belief(SG, flattening_method)
-        if weight_mapping:
-            SG = weight_mapping(SG)
-        return SG
+        return self._make_signed_graph(self.edges(data=True), self.nodes,
+                                       sign_dict, flattening_method,
+                                       weight_mapping)
 
     @classmethod
     def digraph_from_df(cls, df, flattening_method=None, weight_mapping=None):
         """Create a digraph from a pandas DataFrame.
 
+        The digraph is built directly from the columns of the DataFrame
+        without first building the unflattened IndraNet.
+
         Parameters
         ----------
         df : pd.DataFrame
@@ -249,15 +167,18 @@ class IndraNet(nx.MultiDiGraph):
         -------
         IndraNet(nx.DiGraph)
              An IndraNet graph flattened to a DiGraph"""
-        net = cls.from_df(df)
-        return net.to_digraph(flattening_method=flattening_method,
-                              weight_mapping=weight_mapping)
+        nodes, edges = _get_nodes_edges_from_df(df)
+        return cls._make_digraph(edges, nodes, flattening_method,
+                                 weight_mapping)
 
     @classmethod
     def signed_from_df(cls, df, sign_dict=None, flattening_method=None,
                        weight_mapping=None):
         """Create a signed graph from a pandas DataFrame.
 
+        The signed graph is built directly from the columns of the DataFrame
+        without first building the unflattened IndraNet.
+
         Parameters
         ----------
         df : pd.DataFrame
@@ -280,10 +201,67 @@ class IndraNet(nx.MultiDiGraph):
         IndraNet(nx.MultiDiGraph)
             An IndraNet graph flattened to a signed graph
         """
-        net = cls.from_df(df)
-        return net.to_signed_graph(sign_dict=sign_dict,
-                                   flattening_method=flattening_method,
-                                   weight_mapping=weight_mapping)
+        nodes, edges = _get_nodes_edges_from_df(df)
+        return cls._make_signed_graph(edges, nodes, sign_dict,
+                                      flattening_method, weight_mapping)
+
+    @classmethod
+    def _make_digraph(cls, edges, nodes, flattening_method, weight_mapping):
+        """Return a DiGraph with the edges between each pair of nodes
+        flattened into a single edge.
+
+        The edges are given as (u, v, data) tuples and nodes maps each node
+        to its attributes. The statements of a flattened edge are collected
+        first so that nodes and edges can be added to the graph in bulk.
+        """
+        graph_nodes = {}
+        edge_stmts = {}
+        for u, v, data in edges:
+            graph_nodes[u] = None
+            graph_nodes[v] = None
+            edge_stmts.setdefault((u, v), []).append(data)
+        G = nx.DiGraph()
+        G.add_nodes_from((node, nodes[node]) for node in graph_nodes)
+        G.add_edges_from((u, v, {'statements': stmts})
+                         for (u, v), stmts in edge_stmts.items())
+        G = cls._update_edge_belief(G, flattening_method)
+        if weight_mapping:
+            G = weight_mapping(G)
+        return G
+
+    @classmethod
+    def _make_signed_graph(cls, edges, nodes, sign_dict, flattening_method,
+                           weight_mapping):
+        """Return a MultiDiGraph with the edges between each pair of nodes
+        flattened into a single edge per sign.
+
+        The edges are given as (u, v, data) tuples and nodes maps each node
+        to its attributes. The statements of a flattened edge are collected
+        first so that nodes and edges can be added to the graph in bulk.
+        """
+        sign_dict = default_sign_dict if not sign_dict else sign_dict
+        graph_nodes = {}
+        edge_stmts = {}
+        for u, v, data in edges:
+            # Nodes are added even if the edge has no sign
+            graph_nodes[u] = None
+            graph_nodes[v] = None
+            # Explicit 'is not None' needed to accept 0
+            if data.get('initial_sign') is not None:
+                sign = data['initial_sign']
+            elif data['stmt_type'] not in sign_dict:
+                continue
+            else:
+                sign = sign_dict[data['stmt_type']]
+            edge_stmts.setdefault((u, v, sign), []).append(data)
+        SG = nx.MultiDiGraph()
+        SG.add_nodes_from((node, nodes[node]) for node in graph_nodes)
+        SG.add_edges_from((u, v, sign, {'statements': stmts, 'sign': sign})
+                          for (u, v, sign), stmts in edge_stmts.items())
+        SG = cls._update_edge_belief(SG, flattening_method)
+        if weight_mapping:
+            SG = weight_mapping(SG)
+        return SG
 
     @staticmethod
     def _update_edge_belief(G, flattening_method):
@@ -299,8 +277,8 @@ class IndraNet(nx.MultiDiGraph):
         """
 
         if not flattening_method or flattening_method == 'simple_scorer':
-            for e in G.edges:
-                G.edges[e]['belief'] = _simple_scorer_update(G, edge=e)
+            for e, belief in _simple_scorer_update_all(G).items():
+                G.edges[e]['belief'] = belief
         elif flattening_method == 'complementary_belief':
             for e in G.edges:
                 G.edges[e]['belief'] = _complementary_belief(G, edge=e)
@@ -310,7 +288,70 @@ class IndraNet(nx.MultiDiGraph):
         return G
 
 
-def _simple_scorer_update(G, edge):
+def _get_nodes_edges_from_df(df):
+    """Return the nodes and edges of the rows of an IndraNet DataFrame.
+
+    The columns of the DataFrame are read as a whole rather than row by row
+    so that the nodes and edges can be added to a graph in bulk.
+
+    Returns
+    -------
+    nodes : dict
+        A dict mapping each node name to its attributes, taken from the
+        first row in which the node appears.
+    edges : list[tuple]
+        A list of (u, v, data) tuples for each row with both node names set.
+    """
+    if not set(mandatory_columns).issubset(set(df.columns)):
+        raise ValueError('Missing one or more columns of %s in data '
+                         'frame' % mandatory_columns)
+    node_keys = {'agA': [], 'agB': []}
+    edge_keys = ['stmt_hash', 'stmt_type', 'evidence_count', 'belief',
+                 'source_counts']
+    for key in df.columns:
+        if key not in mandatory_columns:
+            if key.startswith('agA_'):
+                node_keys['agA'].append(key)
+            if key.startswith('agB_'):
+                node_keys['agB'].append(key)
+            if not key.startswith('ag'):
+                edge_keys.append(key)
+    columns = {key: df[key].tolist() for key in df.columns}
+
+    def get_records(keys, renamed=None):
+        # Zip the given columns into a dict of values for each row
+        renamed = renamed if renamed else {}
+        names = [renamed.get(key, key) for key in keys]
+        return [dict(zip(names, values))
+                for values in zip(*[columns[key] for key in keys])]
+
+    node_records = {
+        ag: get_records(['%s_ns' % ag, '%s_id' % ag] + node_keys[ag],
+                        {'%s_ns' % ag: 'ns', '%s_id' % ag: 'id'})
+        for ag in ('agA', 'agB')}
+    edge_records = get_records(edge_keys)
+    nodes = {}
+    edges = []
+    skipped = 0
+    for index, u, v, u_attr, v_attr, edge_attr in \
+            zip(df.index, columns['agA_name'], columns['agB_name'],
+                node_records['agA'], node_records['agB'], edge_records):
+        if u is None or v is None:
+            skipped += 1
+            logger.warning('None found as node (index %d)' % index)
+            continue
+        # Keep the attributes of the first row in which a node appears
+        if u not in nodes:
+            nodes[u] = u_attr
+        if v not in nodes:
+            nodes[v] = v_attr
+        edges.append((u, v, edge_attr))
+    if skipped:
+        logger.warning('Skipped %d edges with None as node' % skipped)
+    return nodes, edges
+
+
+def _get_edge_evidence(G, edge):
     evidence_list = []
     for stmt_data in G.edges[edge]['statements']:
         for k, v in stmt_data['source_counts'].items():
@@ -320,7 +361,23 @@ def _simple_scorer_update(G, edge):
                 s = k
             for _ in range(v):
                 evidence_list.append(Evidence(source_api=s))
+    return evidence_list
+
+
+def _simple_scorer_update_all(G):
+    # Score the edges in a single batch, which gives the same beliefs as
+    # scoring them one by one, unless an underflow has to be handled
+    edges = list(G.edges)
+    try:
+        beliefs = simple_scorer.score_evidence_lists(
+            [_get_edge_evidence(G, e) for e in edges])
+    except FloatingPointError:
+        beliefs = [_simple_scorer_update(G, e) for e in edges]
+    return dict(zip(edges, beliefs))
+
 
+def _simple_scorer_update(G, edge):
+    evidence_list = _get_edge_evidence(G, edge)
     try:
         ag_belief = simple_scorer.score_statement(
                                             Statement(evidence=evidence_list))
@@ -194,6 +194,254 @@ class SimpleScorer(BeliefScorer):
         score = pp * (1 - np)
         return score
 
+    def score_evidence_lists(
+        self,
+        evidence_lists: Sequence[List[Evidence]],
+    ) -> List[float]:
+        """Return belief scores given a list of lists of supporting evidences.
+
+        The evidences of all the lists are encoded into flat arrays of
+        statement indices, source IDs, random error priors and negation flags
+        and the beliefs are calculated with grouped array operations rather
+        than one list at a time. The products are taken in the same order as
+        in :py:meth:`score_evidence_list` so the results are identical to
+        scoring each list separately. If a subclass overrides
+        `score_evidence_list`, that method is applied to each list instead.
+
+        Parameters
+        ----------
+        evidence_lists :
+            A list of lists of evidences, each used to calculate the belief
+            of one statement.
+
+        Returns
+        -------
+        :
+            Belief values based on each list of evidences.
+        """
+        if not self._is_batch_scorable():
+            return [self.score_evidence_list(evidences)
+                    for evidences in evidence_lists]
+        n_lists = len(evidence_lists)
+        stmt_idx = []
+        negated = []
+        tag_ids = []
+        tags = {}
+        for ix, evidences in enumerate(evidence_lists):
+            for ev in evidences:
+                stmt_idx.append(ix)
+                negated.append(bool(ev.epistemics.get('negated')))
+                tag = tag_evidence_subtype(ev)
+                tag_id = tags.get(tag)
+                if tag_id is None:
+                    tag_id = tags[tag] = len(tags)
+                tag_ids.append(tag_id)
+        if not stmt_idx:
+            return [0] * n_lists
+        # Look up the prior probabilities once per unique source/subtype
+        tag_list = list(tags)
+        rand_by_tag = numpy.array([
+            _random_noise_prior(stype, subtype, self.prior_probs['rand'],
+                                self.subtype_probs)
+            for stype, subtype in tag_list], dtype=float)
+        # Source IDs are ranks in the sorted list of sources so that sources
+        # are multiplied in the same order as by numpy.unique
+        sources = sorted({stype for stype, _ in tag_list})
+        syst_by_source = numpy.array([self.prior_probs['syst'][s]
+                                      for s in sources], dtype=float)
+        source_ranks = {s: idx for idx, s in enumerate(sources)}
+        source_by_tag = numpy.array([source_ranks[stype]
+                                     for stype, _ in tag_list], dtype=int)
+        tag_ids = numpy.array(tag_ids, dtype=int)
+        stmt_idx = numpy.array(stmt_idx, dtype=int)
+        negated = numpy.array(negated, dtype=int)
+        source_ids = source_by_tag[tag_ids]
+        # A stable sort groups evidences by statement, polarity and source
+        # while keeping the original order of evidences within each group
+        order = numpy.lexsort((source_ids, negated, stmt_idx))
+        rand = rand_by_tag[tag_ids][order]
+        keys = numpy.stack([stmt_idx[order], negated[order],
+                            source_ids[order]])
+        starts = numpy.flatnonzero(
+            numpy.concatenate([[True],
+                               numpy.any(keys[:, 1:] != keys[:, :-1],
+                                         axis=0)]))
+        group_stmt, group_neg, group_source = keys[:, starts]
+        # The error probability of each source within a statement's
+        # positive or negative evidence
+        source_factors = syst_by_source[group_source] + \
+            numpy.multiply.reduceat(rand, starts)
+        # The position of each source within its statement/polarity group,
+        # used to multiply the source factors sequentially
+        sub_starts = numpy.flatnonzero(
+            numpy.concatenate([[True],
+                               (group_stmt[1:] != group_stmt[:-1]) |
+                               (group_neg[1:] != group_neg[:-1])]))
+        sub_lengths = numpy.diff(numpy.append(sub_starts, len(group_stmt)))
+        positions = numpy.arange(len(group_stmt)) - \
+            numpy.repeat(sub_starts, sub_lengths)
+        neg_prob_prior = numpy.ones((2, n_lists))
+        for pos in range(positions.max() + 1):
+            mask = positions == pos
+            neg_prob_prior[group_neg[mask], group_stmt[mask]] *= \
+                source_factors[mask]
+        # Lists with no positive or negative evidence have a prior of 0
+        has_ev = numpy.zeros((2, n_lists), dtype=bool)
+        has_ev[group_neg[sub_starts], group_stmt[sub_starts]] = True
+        prob_prior = numpy.where(has_ev, 1 - neg_prob_prior, 0)
+        pp, np = prob_prior
+        return (pp * (1 - np)).tolist()
+
+    def _is_batch_scorable(self) -> bool:
+        """Return True if beliefs can be calculated without calling
+        score_evidence_list, i.e., it isn't overridden by a subclass."""
+        return type(self).score_evidence_list is \
+            SimpleScorer.score_evidence_list
+
+    def score_hierarchy(
+        self,
+        statements: Sequence[Statement],
+        refinements_graph: networkx.DiGraph,
+        matches_fun: Optional[Callable[[Statement], str]] = None,
+    ) -> List[float]:
+        """Computes hierarchical belief probabilities for INDRA Statements.
+
+        The result is the same as scoring each statement with the evidences
+        collected from its refinements by
+        :py:func:`get_ev_for_stmts_from_supports`, however, rather than
+        collecting the evidences of all the refinements of each statement,
+        the graph is traversed once in topological order, and the product
+        of random error priors per source is propagated from more specific
+        to less specific statements. Products are combined directly if the
+        refinements of a statement's refinements are disjoint, and are
+        recalculated from the refinements otherwise, so that each evidence is
+        counted once.
+
+        Parameters
+        ----------
+        statements :
+            INDRA Statements whose belief scores are to be calculated.
+        refinements_graph :
+            A networkx graph whose nodes are statement hashes carrying a stmt
+            attribute with the actual statement object. Edges point from less
+            detailed to more detailed statements.
+        matches_fun :
+            An optional function to calculate the matches key and hash of a
+            given statement. If not provided, the default matches function is
+            used. Default: None.
+
+        Returns
+        -------
+        :
+            The computed hierarchical probabilities for each statement.
+        """
+        # Evidences are deduplicated by identity when they are collected
+        # from refinements, the statistics propagated here assume that no
+        # Evidence object is shared between different statements.
+        if not self._is_batch_scorable() or \
+                _has_shared_evidence(statements, refinements_graph,
+                                     matches_fun):
+            extra_evidence = get_ev_for_stmts_from_supports(
+                statements, refinements_graph, matches_fun)
+            return self.score_statements(statements, extra_evidence)
+        assert_no_cycle(refinements_graph)
+        hashes = [stmt.get_hash(matches_fun=matches_fun)
+                  for stmt in statements]
+        for stmt_hash in hashes:
+            if stmt_hash not in refinements_graph:
+                raise networkx.NetworkXError('The node %s is not in the '
+                                             'digraph.' % stmt_hash)
+        rand_priors = {}
+
+        def get_rand_factors(evidences):
+            # The product of random error priors per source
+            factors = {}
+            for ev in evidences:
+                tag = tag_evidence_subtype(ev)
+                rand = rand_priors.get(tag)
+                if rand is None:
+                    rand = rand_priors[tag] = _random_noise_prior(
+                        tag[0], tag[1], self.prior_probs['rand'],
+                        self.subtype_probs)
+                factors[tag[0]] = factors.get(tag[0], 1) * rand
+            return factors
+
+        stmt_hashes = set(hashes)
+        # The random error factors of each statement's own non-negated
+        # evidence, and those of the evidences of all of its refinements
+        own_factors = {}
+        refinement_factors = {}
+        # The set of nodes in the graph that refine a given node including
+        # the node itself, along with the corresponding random error factors.
+        # These are only kept until all the less specific nodes are visited.
+        closures = {}
+        n_unvisited_parents = dict(refinements_graph.in_degree())
+        for node in reversed(list(
+                networkx.topological_sort(refinements_graph))):
+            own_factors[node] = get_rand_factors(
+                _unique_evidence(refinements_graph.nodes[node]['stmt'],
+                                 negated=False))
+            # Merge the closures of the children, the largest first so that
+            # it can be extended in place if this is its last parent
+            children = sorted(refinements_graph.successors(node),
+                              key=lambda child: len(closures[child][0]),
+                              reverse=True)
+            overlap = False
+            if not children:
+                closure = set()
+            elif n_unvisited_parents[children[0]] == 1:
+                closure = closures[children[0]][0]
+            else:
+                closure = set(closures[children[0]][0])
+            for child in children[1:]:
+                for refiner in closures[child][0]:
+                    if refiner in closure:
+                        overlap = True
+                    else:
+                        closure.add(refiner)
+            if overlap:
+                factors = _multiply_factors(
+                    own_factors[refiner] for refiner in closure)
+            else:
+                factors = _multiply_factors(
+                    closures[child][1] for child in children)
+            for child in children:
+                n_unvisited_parents[child] -= 1
+                if not n_unvisited_parents[child]:
+                    closures.pop(child)
+            if node in stmt_hashes:
+                refinement_factors[node] = factors
+            if n_unvisited_parents[node]:
+                closure.add(node)
+                closures[node] = \
+                    (closure, _multiply_factors([factors, own_factors[node]]))
+
+        beliefs = []
+        for stmt, stmt_hash in zip(statements, hashes):
+            pos_factors = _multiply_factors(
+                [get_rand_factors(_unique_evidence(stmt, negated=False)),
+                 refinement_factors[stmt_hash]])
+            neg_factors = get_rand_factors(_unique_evidence(stmt,
+                                                            negated=True))
+            pp = self._prob_from_factors(pos_factors)
+            np = self._prob_from_factors(neg_factors)
+            beliefs.append(pp * (1 - np))
+        return beliefs
+
+    def _prob_from_factors(
+        self,
+        rand_factors: Dict[str, float],
+    ) -> float:
+        """Return the probability of correctness given the products of
+        random error priors per source."""
+        if not rand_factors:
+            return 0
+        neg_prob_prior = 1
+        for source in sorted(rand_factors):
+            neg_prob_prior *= (self.prior_probs['syst'][source] +
+                               rand_factors[source])
+        return 1 - neg_prob_prior
+
     def score_statements(
         self,
         statements: Sequence[Statement],
@@ -224,12 +472,10 @@ class SimpleScorer(BeliefScorer):
         """
         # Check our list of extra evidences
         check_extra_evidence(extra_evidence, len(statements))
-        # Get beliefs for each statement
-        beliefs = []
-        for ix, stmt in enumerate(statements):
-            all_evidence = get_stmt_evidence(stmt, ix, extra_evidence)
-            beliefs.append(self.score_evidence_list(all_evidence))
-        return beliefs
+        # Get beliefs for all statements in one batch
+        evidence_lists = [get_stmt_evidence(stmt, ix, extra_evidence)
+                          for ix, stmt in enumerate(statements)]
+        return self.score_evidence_lists(evidence_lists)
 
     def check_prior_probs(
         self,
@@ -468,6 +714,16 @@ class BeliefEngine(object):
             # Build the graph for the given set of statements
             self.refinements_graph = build_refinements_graph(statements,
                                                    matches_fun=self.matches_fun)
+        # Scorers based on the SimpleScorer propagate evidence statistics
+        # through the graph rather than collecting all the evidences of
+        # each statement's refinements
+        if isinstance(self.scorer, SimpleScorer):
+            beliefs = self.scorer.score_hierarchy(statements,
+                                                  self.refinements_graph,
+                                                  self.matches_fun)
+            hashes = [s.get_hash(matches_fun=self.matches_fun)
+                      for s in statements]
+            return dict(zip(hashes, beliefs))
         # Get the evidences from the more specific (supports) statements
         all_extra_evs = get_ev_for_stmts_from_supports(statements,
                                                    self.refinements_graph)
@@ -649,6 +905,47 @@ def get_ev_for_stmts_from_hashes(
     return all_extra_evs
 
 
+def _has_shared_evidence(
+    statements: Sequence[Statement],
+    refinements_graph: networkx.DiGraph,
+    matches_fun: Optional[Callable[[Statement], str]] = None,
+) -> bool:
+    """Return True if an Evidence object belongs to more than one node."""
+    owners = {}
+    node_stmts = [(node, stmt) for node, stmt
+                  in refinements_graph.nodes(data='stmt')] + \
+        [(stmt.get_hash(matches_fun=matches_fun), stmt)
+         for stmt in statements]
+    for node, stmt in node_stmts:
+        for ev in stmt.evidence:
+            if owners.setdefault(id(ev), node) != node:
+                return True
+    return False
+
+
+def _unique_evidence(
+    stmt: Statement,
+    negated: bool,
+) -> List[Evidence]:
+    """Return a statement's unique non-negated or negated evidences."""
+    evidences = {}
+    for ev in stmt.evidence:
+        if bool(ev.epistemics.get('negated')) == negated:
+            evidences.setdefault(id(ev), ev)
+    return list(evidences.values())
+
+
+def _multiply_factors(
+    factors_list: Iterable[Dict[str, float]],
+) -> Dict[str, float]:
+    """Return the per-source product of random error factors."""
+    product = {}
+    for factors in factors_list:
+        for source, factor in factors.items():
+            product[source] = product.get(source, 1) * factor
+    return product
+
+
 def sample_statements(
     stmts: Sequence[Statement],
     seed: Optional[int] = None,
@@ -696,7 +993,16 @@ def evidence_random_noise_prior(
     """
     # Get the subtype, if available
     (stype, subtype) = tag_evidence_subtype(evidence)
+    return _random_noise_prior(stype, subtype, type_probs, subtype_probs)
+
 
+def _random_noise_prior(
+    stype: str,
+    subtype: Optional[str],
+    type_probs: Dict[str, float],
+    subtype_probs: Optional[Dict[str, Dict[str, float]]],
+) -> float:
+    """Return the random-noise prior for a given evidence type and subtype."""
     # Return the subtype random noise prior, if available
     if subtype_probs is not None:
         if stype in subtype_probs:
@@ -689,8 +689,9 @@ class HybridScorer(BeliefScorer):
         skl_beliefs = self.counts_scorer.predict_proba(statements,
                                                        extra_evidence)[:, 1]
         skl_sources = self.counts_scorer.source_list
-        hybrid_beliefs = []
         # Iterate over the statements...
+        filt_evidence_lists = []
+        has_skl_sources = []
         for ix, stmt in enumerate(statements):
             # ...get both the statement's own evidence and the more-specific
             # (extra) evidences
@@ -705,14 +706,19 @@ class HybridScorer(BeliefScorer):
                     has_skl_source = True
                 else:
                     filt_evidence.append(ev)
-            # Get the simple belief
-            simple_bel = self.simple_scorer.score_evidence_list(filt_evidence)
+            filt_evidence_lists.append(filt_evidence)
+            has_skl_sources.append(has_skl_source)
+        # Get the simple beliefs for all statements in one batch
+        simple_beliefs = \
+            self.simple_scorer.score_evidence_lists(filt_evidence_lists)
+        hybrid_beliefs = []
+        for ix, simple_bel in enumerate(simple_beliefs):
             # Calculate hybrid belief: the probability that all sources, both
             # those evaluated by the sklearn model and the simplescorer, are
             # not jointly incorrect. If there are no sources from the skl
             # model list, we set the skl belief to 0 so the probability comes
             # only from the simple scorer
-            skl_bel = skl_beliefs[ix] if has_skl_source else 0
+            skl_bel = skl_beliefs[ix] if has_skl_sources[ix] else 0
             hybrid_bel = 1 - (1 - skl_bel) * (1 - simple_bel)
             hybrid_beliefs.append(hybrid_bel)
         return hybrid_beliefs
@@ -0,0 +1,315 @@
+"""Benchmarks for preassembly on synthetic statement corpora.
+
+The corpora are generated deterministically from a random seed using the
+FamPlex families and their HGNC members in an ontology, so that statements
+about families and their members refine each other the way they do in
+real corpora. Each stage of preassembly (duplicate combination, refinement
+finding and belief calculation) is timed, and the peak memory allocated
+during the stage is recorded. The results are JSON-serializable so that
+they can be saved and compared between versions of INDRA.
+"""
+import os
+import json
+import time
+import random
+import logging
+import platform
+import tracemalloc
+from contextlib import contextmanager
+from indra import __version__
+from indra.util import read_unicode_csv
+from indra.resources import get_resource_path
+from indra.statements import Phosphorylation, Dephosphorylation, \
+    Activation, Inhibition, IncreaseAmount, DecreaseAmount, Complex, \
+    Agent, Evidence
+from indra.preassembler import Preassembler
+from indra.preassembler.refinement import OntologyRefinementFilter
+from indra.belief import BeliefEngine
+
+
+logger = logging.getLogger(__name__)
+
+
+default_sizes = [10000, 100000, 1000000]
+sources = ['reach', 'sparser', 'medscan', 'trips', 'rlimsp']
+residues = ['S', 'T', 'Y']
+
+
+def get_families(ontology):
+    """Return FamPlex families and their HGNC members from an ontology.
+
+    The families are those listed in the FamPlex resource files, and their
+    members are queried from the ontology, so that any ontology
+    implementation can be used.
+
+    Parameters
+    ----------
+    ontology : indra.ontology.IndraOntology
+        The ontology whose FamPlex families are used.
+
+    Returns
+    -------
+    list[tuple]
+        A list of tuples, each consisting of a family Agent and the list
+        of Agents for its HGNC members, sorted by family ID.
+    """
+    if not getattr(ontology, '_initialized', True):
+        ontology.initialize()
+    families = []
+    fplx_ids = sorted(row[0] for row in read_unicode_csv(get_resource_path(
+        os.path.join('famplex', 'entities.csv')), delimiter=','))
+    for id in fplx_ids:
+        members = sorted(ontology.get_children('FPLX', id,
+                                               ns_filter={'HGNC'}))
+        if not members:
+            continue
+        families.append((_make_agent(ontology, 'FPLX', id),
+                         [_make_agent(ontology, mns, mid)
+                          for mns, mid in members]))
+    return families
+
+
+def make_corpus(ontology, size, seed=0, duplication=3, family_prob=0.3,
+                site_prob=0.5):
+    """Return a synthetic corpus of statements.
+
+    Parameters
+    ----------
+    ontology : indra.ontology.IndraOntology
+        The ontology whose FamPlex families and HGNC members are used
+        as the agents of statements.
+    size : int
+        The number of statements in the corpus.
+    seed : Optional[int]
+        The random seed used to generate the corpus. Default: 0
+    duplication : Optional[float]
+        The average number of duplicates of each unique statement.
+        Default: 3
+    family_prob : Optional[float]
+        The probability of an agent being a family rather than one of
+        its members. Default: 0.3
+    site_prob : Optional[float]
+        The probability of a modification statement having a residue,
+        and of a statement with a residue also having a position.
+        Default: 0.5
+
+    Returns
+    -------
+    list[indra.statements.Statement]
+        The statements of the corpus.
+    """
+    rng = random.Random(seed)
+    families = get_families(ontology)
+    if not families:
+        raise ValueError('The ontology has no FamPlex families with '
+                         'HGNC members.')
+
+    def choose_agent():
+        family, members = rng.choice(families)
+        return family if rng.random() < family_prob else rng.choice(members)
+
+    stmt_types = [Phosphorylation, Dephosphorylation, Activation,
+                  Inhibition, IncreaseAmount, DecreaseAmount, Complex]
+    # Statements are described by specs from which a new statement object
+    # is made for each duplicate
+    specs = []
+    for _ in range(max(1, int(size / duplication))):
+        stmt_type = rng.choice(stmt_types)
+        agents = (choose_agent(), choose_agent())
+        site = ()
+        if stmt_type in (Phosphorylation, Dephosphorylation) and \
+                rng.random() < site_prob:
+            site = (rng.choice(residues),)
+            if rng.random() < site_prob:
+                site += (str(rng.randint(1, 1000)),)
+        specs.append((stmt_type, agents, site))
+
+    stmts = []
+    for _ in range(size):
+        stmt_type, agents, site = rng.choice(specs)
+        ev = Evidence(source_api=rng.choice(sources),
+                      pmid=str(rng.randint(1, size)),
+                      text='Sentence %d' % rng.randint(1, 10 * size))
+        agents = [Agent(ag.name, db_refs=dict(ag.db_refs)) for ag in agents]
+        if stmt_type is Complex:
+            stmt = Complex(agents, evidence=[ev])
+        else:
+            stmt = stmt_type(*agents, *site, evidence=[ev])
+        stmts.append(stmt)
+    return stmts
+
+
+def run_benchmark(size, seed=0, ontology=None, trace_memory=True):
+    """Run the preassembly benchmark on a synthetic corpus of a given size.
+
+    Parameters
+    ----------
+    size : int
+        The number of statements in the synthetic corpus.
+    seed : Optional[int]
+        The random seed used to generate the corpus. Default: 0
+    ontology : Optional[indra.ontology.IndraOntology]
+        The ontology used for generating the corpus and for preassembly.
+        By default, the INDRA BioOntology is used.
+    trace_memory : Optional[bool]
+        If True, the peak memory allocated during each stage is recorded.
+        Tracing memory allocations slows down all stages. Default: True
+
+    Returns
+    -------
+    dict
+        The results of the benchmark including, for each stage, the time
+        it took in seconds and, if traced, the peak memory in MB allocated
+        during the stage, along with statistics of the assembled
+        statements. The time spent initializing the ontology filter is
+        also given for the combine_related stage, of which it is part.
+    """
+    if ontology is None:
+        from indra.ontology.bio import bio_ontology
+        ontology = bio_ontology
+    results = {'indra_version': __version__,
+               'python_version': platform.python_version(),
+               'platform': platform.platform(),
+               'size': size,
+               'seed': seed,
+               'stages': {}}
+
+    with _stage(results, 'initialize_ontology', trace_memory):
+        if not getattr(ontology, '_initialized', True):
+            ontology.initialize()
+
+    with _stage(results, 'make_corpus', trace_memory):
+        stmts = make_corpus(ontology, size, seed=seed)
+
+    pa = Preassembler(ontology, stmts)
+    with _stage(results, 'combine_duplicates', trace_memory):
+        unique_stmts = pa.combine_duplicates()
+    results['num_unique'] = len(unique_stmts)
+
+    # The initialization of the ontology filter is a large part of the cost
+    # of combine_related so its time is also recorded as part of the stage
+    ontology_filter = _TimedOntologyRefinementFilter(ontology)
+    with _stage(results, 'combine_related', trace_memory):
+        pa.combine_related(return_toplevel=False, filters=[ontology_filter])
+    results['stages']['combine_related']['ontology_filter_initialize'] = \
+        ontology_filter.initialize_time
+    results['num_toplevel'] = len(pa.related_stmts)
+    results['num_refinements'] = sum(len(stmt.supported_by)
+                                     for stmt in unique_stmts)
+    results['comparisons'] = pa._comparison_counter
+
+    be = BeliefEngine()
+    with _stage(results, 'belief_prior', trace_memory):
+        be.set_prior_probs(unique_stmts)
+    with _stage(results, 'belief_hierarchy', trace_memory):
+        be.set_hierarchy_probs(unique_stmts)
+    results['mean_belief'] = \
+        sum(stmt.belief for stmt in unique_stmts) / len(unique_stmts)
+    return results
+
+
+def run_benchmarks(sizes=None, seed=0, ontology=None, trace_memory=True,
+                   fname=None):
+    """Run the preassembly benchmark for a list of corpus sizes.
+
+    Parameters
+    ----------
+    sizes : Optional[list[int]]
+        The corpus sizes to run the benchmark for. Default: 10k, 100k and
+        1M statements.
+    seed : Optional[int]
+        The random seed used to generate the corpora. Default: 0
+    ontology : Optional[indra.ontology.IndraOntology]
+        The ontology used for generating the corpora and for preassembly.
+        By default, the INDRA BioOntology is used.
+    trace_memory : Optional[bool]
+        If True, the peak memory allocated during each stage is recorded.
+        Default: True
+    fname : Optional[str]
+        If given, the results are saved into this JSON file after each
+        corpus size is done.
+
+    Returns
+    -------
+    list[dict]
+        The results of :py:func:`run_benchmark` for each size.
+    """
+    sizes = sizes if sizes else default_sizes
+    all_results = []
+    for size in sizes:
+        logger.info('Running preassembly benchmark for %d statements' % size)
+        all_results.append(run_benchmark(size, seed=seed, ontology=ontology,
+                                         trace_memory=trace_memory))
+        if fname:
+            with open(fname, 'w') as fh:
+                json.dump(all_results, fh, indent=1, sort_keys=True)
+    return all_results
+
+
+def compare_results(old_results, new_results):
+    """Return the relative change in time and memory of each stage.
+
+    Parameters
+    ----------
+    old_results : list[dict]
+        Results returned by :py:func:`run_benchmarks`, e.g., for an earlier
+        version.
+    new_results : list[dict]
+        Results returned by :py:func:`run_benchmarks` to compare to the
+        old results.
+
+    Returns
+    -------
+    dict
+        A dict keyed by corpus size whose values are dicts keyed by stage
+        name with the ratio of the new and old time and peak memory of the
+        stage. Only sizes and stages present in both results are compared.
+    """
+    old_by_size = {res['size']: res for res in old_results}
+    ratios = {}
+    for new in new_results:
+        old = old_by_size.get(new['size'])
+        if old is None:
+            continue
+        ratios[new['size']] = {}
+        for stage, new_stage in new['stages'].items():
+            old_stage = old['stages'].get(stage)
+            if old_stage is None:
+                continue
+            ratios[new['size']][stage] = \
+                {key: (new_stage[key] / old_stage[key]
+                       if old_stage[key] else None)
+                 for key in ('time', 'peak_memory')
+                 if new_stage.get(key) is not None and
+                 old_stage.get(key) is not None}
+    return ratios
+
+
+@contextmanager
+def _stage(results, name, trace_memory):
+    # Time a stage and record the peak memory allocated during it
+    if trace_memory:
+        tracemalloc.start()
+    ts = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage = {'time': time.perf_counter() - ts}
+        if trace_memory:
+            stage['peak_memory'] = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+        results['stages'][name] = stage
+        logger.info('%s: %s' % (name, stage))
+
+
+class _TimedOntologyRefinementFilter(OntologyRefinementFilter):
+    # An ontology filter recording the time it took to initialize
+    def initialize(self, stmts_by_hash):
+        ts = time.perf_counter()
+        super().initialize(stmts_by_hash)
+        self.initialize_time = time.perf_counter() - ts
+
+
+def _make_agent(ontology, ns, id):
+    name = ontology.get_name(ns, id)
+    return Agent(name if name else id, db_refs={ns: id})
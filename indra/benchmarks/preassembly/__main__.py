@@ -0,0 +1,31 @@
+import json
+import argparse
+from indra.benchmarks.preassembly import run_benchmarks, compare_results, \
+    default_sizes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark preassembly on synthetic statement corpora.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=default_sizes,
+                        help='The numbers of statements in the corpora.')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='The random seed used to generate the corpora.')
+    parser.add_argument('--output', '-o', type=str,
+                        help='A JSON file to save the results into.')
+    parser.add_argument('--compare', type=str,
+                        help='A JSON file with earlier results to compare '
+                             'the new results to.')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Don\'t trace memory allocations.')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, seed=args.seed,
+                             trace_memory=not args.no_memory,
+                             fname=args.output)
+    print(json.dumps(results, indent=1, sort_keys=True))
+    if args.compare:
+        with open(args.compare, 'r') as fh:
+            old_results = json.load(fh)
+        print(json.dumps(compare_results(old_results, results), indent=1,
+                         sort_keys=True))
@@ -6,8 +6,6 @@ from functools import lru_cache, cmp_to_key
 from indra.util import read_unicode_csv
 from indra.databases.obo_client import OboClient
 
-_obo_client = OboClient(prefix='chebi')
-
 logger = logging.getLogger(__name__)
 
 # Namespaces used in the XML
@@ -36,6 +34,7 @@ def get_pubchem_id(chebi_id):
         PubChem ID corresponding to the given ChEBI ID. If the lookup fails,
         None is returned.
     """
+    _load_pubchem_tables()
     pubchem_id = chebi_pubchem.get(_add_prefix(chebi_id))
     return pubchem_id
 
@@ -54,6 +53,7 @@ def get_chebi_id_from_pubchem(pubchem_id):
         ChEBI ID corresponding to the given Pubchem ID. If the lookup fails,
         None is returned.
     """
+    _load_pubchem_tables()
     chebi_id = pubchem_chebi.get(pubchem_id)
     return chebi_id
 
@@ -72,6 +72,7 @@ def get_chembl_id(chebi_id):
         ChEMBL ID corresponding to the given ChEBI ID. If the lookup fails,
         None is returned.
     """
+    _load_chembl_tables()
     return chebi_chembl.get(_add_prefix(chebi_id))
 
 
@@ -89,6 +90,7 @@ def get_chebi_id_from_chembl(chembl_id):
         ChEBI ID corresponding to the given ChEBML ID. If the lookup fails,
         None is returned.
     """
+    _load_chembl_tables()
     return chembl_chebi.get(chembl_id)
 
 
@@ -106,6 +108,7 @@ def get_chebi_id_from_cas(cas_id):
         The ChEBI ID corresponding to the given CAS ID. If the lookup
         fails, None is returned.
     """
+    _load_cas_table()
     return cas_chebi.get(cas_id)
 
 
@@ -127,6 +130,7 @@ def get_chebi_name_from_id(chebi_id, offline=True):
         fails, None is returned.
     """
     chebi_id = _add_prefix(chebi_id)
+    _load_obo_client()
     name = _obo_client.get_name_from_id(chebi_id)
     if name is None and not offline:
         return get_chebi_name_from_id_web(chebi_id)
@@ -148,6 +152,7 @@ def get_chebi_id_from_name(chebi_name):
         The ID corresponding to the given ChEBI name. If the lookup
         fails, None is returned.
     """
+    _load_obo_client()
     return _obo_client.get_id_from_name(chebi_name)
 
 
@@ -241,6 +246,7 @@ def get_primary_id(chebi_id):
         primary nor a secondary ID with a primary mapping.
     """
     chebi_id = _add_prefix(chebi_id)
+    _load_obo_client()
     if chebi_id in _obo_client.entries:
         return chebi_id
     prim_id = _obo_client.get_id_from_alt_id(chebi_id)
@@ -297,10 +303,62 @@ def get_chebi_id_from_hmdb(hmdb_id):
         The ChEBI ID that the given HMDB ID maps to or None if no mapping
         was found.
     """
+    _load_hmdb_table()
     return hmdb_chebi.get(hmdb_id)
 
 
-# Read resource files into module-level variables
+# Read resource files into module-level variables upon first use rather
+# than when this module is imported
+
+def __getattr__(name):
+    # Load the lazily loaded tables when accessed as module attributes
+    if name not in _table_loaders:
+        raise AttributeError('module %r has no attribute %r'
+                             % (__name__, name))
+    _table_loaders[name]()
+    return globals()[name]
+
+
+def _load_obo_client():
+    global _obo_client
+    if '_obo_client' not in globals():
+        _obo_client = OboClient(prefix='chebi')
+
+
+def _load_pubchem_tables():
+    global chebi_pubchem, pubchem_chebi
+    if 'pubchem_chebi' not in globals():
+        chebi_pubchem, pubchem_chebi = _read_chebi_to_pubchem()
+
+
+def _load_chembl_tables():
+    global chebi_chembl, chembl_chebi
+    if 'chembl_chebi' not in globals():
+        chebi_chembl, chembl_chebi = _read_chebi_to_chembl()
+
+
+def _load_cas_table():
+    global cas_chebi
+    if 'cas_chebi' not in globals():
+        cas_chebi = _read_cas_to_chebi()
+
+
+def _load_hmdb_table():
+    global hmdb_chebi
+    if 'hmdb_chebi' not in globals():
+        hmdb_chebi = _read_hmdb_to_chebi()
+
+
+_table_loaders = {
+    '_obo_client': _load_obo_client,
+    'chebi_pubchem': _load_pubchem_tables,
+    'pubchem_chebi': _load_pubchem_tables,
+    'chebi_chembl': _load_chembl_tables,
+    'chembl_chebi': _load_chembl_tables,
+    'cas_chebi': _load_cas_table,
+    'hmdb_chebi': _load_hmdb_table,
+}
+
 
 def _read_chebi_to_pubchem():
     csv_reader = _read_resource_csv('chebi_to_pubchem.tsv')
@@ -370,9 +428,3 @@ def _read_resource_csv(fname):
                              os.pardir, 'resources', fname)
     csv_reader = read_unicode_csv(file_path, delimiter='\t')
     return csv_reader
-
-
-chebi_pubchem, pubchem_chebi = _read_chebi_to_pubchem()
-chebi_chembl, chembl_chebi = _read_chebi_to_chembl()
-cas_chebi = _read_cas_to_chebi()
-hmdb_chebi = _read_hmdb_to_chebi()
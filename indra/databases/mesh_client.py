@@ -17,14 +17,61 @@ DB_MAPPINGS = join(RESOURCES, 'mesh_mappings.tsv')
 CAS_MAPPINGS = join(RESOURCES, 'mesh_cas_mappings.tsv')
 
 
-mesh_id_to_name = {}
-mesh_name_to_id = {}
-mesh_name_to_id_name = {}
-mesh_id_to_tree_numbers = {}
-mesh_supp_to_primary = {}
-
-
-def _load_mesh_file(path, supplementary):
+# The MeSH tables are read from the resource files upon first use rather
+# than when this module is imported
+
+def __getattr__(name):
+    # Load the lazily loaded tables when accessed as module attributes
+    if name not in _table_loaders:
+        raise AttributeError('module %r has no attribute %r'
+                             % (__name__, name))
+    _table_loaders[name]()
+    return globals()[name]
+
+
+def _load_mesh_tables():
+    global mesh_id_to_name, mesh_name_to_id, mesh_name_to_id_name, \
+        mesh_id_to_tree_numbers, mesh_supp_to_primary
+    if 'mesh_supp_to_primary' in globals():
+        return
+    tables = {'mesh_id_to_name': {}, 'mesh_name_to_id': {},
+              'mesh_name_to_id_name': {}, 'mesh_id_to_tree_numbers': {},
+              'mesh_supp_to_primary': {}}
+    _load_mesh_file(MESH_FILE, tables, supplementary=False)
+    if os.path.exists(MESH_SUPP_FILE):
+        _load_mesh_file(MESH_SUPP_FILE, tables, supplementary=True)
+    mesh_id_to_name = tables['mesh_id_to_name']
+    mesh_name_to_id = tables['mesh_name_to_id']
+    mesh_name_to_id_name = tables['mesh_name_to_id_name']
+    mesh_id_to_tree_numbers = tables['mesh_id_to_tree_numbers']
+    # This is set last since it marks the tables as loaded
+    mesh_supp_to_primary = tables['mesh_supp_to_primary']
+
+
+def _load_db_mapping_tables():
+    global mesh_to_db, db_to_mesh
+    if 'db_to_mesh' in globals():
+        return
+    mesh_to_db, db_to_mesh = _load_db_mappings(DB_MAPPINGS, CAS_MAPPINGS)
+
+
+_table_loaders = {
+    'mesh_id_to_name': _load_mesh_tables,
+    'mesh_name_to_id': _load_mesh_tables,
+    'mesh_name_to_id_name': _load_mesh_tables,
+    'mesh_id_to_tree_numbers': _load_mesh_tables,
+    'mesh_supp_to_primary': _load_mesh_tables,
+    'mesh_to_db': _load_db_mapping_tables,
+    'db_to_mesh': _load_db_mapping_tables,
+}
+
+
+def _load_mesh_file(path, tables, supplementary):
+    mesh_id_to_name = tables['mesh_id_to_name']
+    mesh_name_to_id = tables['mesh_name_to_id']
+    mesh_name_to_id_name = tables['mesh_name_to_id_name']
+    mesh_id_to_tree_numbers = tables['mesh_id_to_tree_numbers']
+    mesh_supp_to_primary = tables['mesh_supp_to_primary']
     it = read_unicode_csv(path, delimiter='\t')
     for terms in it:
         if supplementary:
@@ -44,11 +91,6 @@ def _load_mesh_file(path, supplementary):
             mesh_name_to_id_name[term] = [mesh_id, mesh_label]
 
 
-_load_mesh_file(MESH_FILE, supplementary=False)
-if os.path.exists(MESH_SUPP_FILE):
-    _load_mesh_file(MESH_SUPP_FILE, supplementary=True)
-
-
 def _load_db_mappings(db_mappings_path, cas_mappings_path):
     def db_iter():
         for _, mesh_id, _, db_ns, db_id, _ in \
@@ -80,9 +122,6 @@ def _load_db_mappings(db_mappings_path, cas_mappings_path):
     return mesh_to_db, db_to_mesh
 
 
-mesh_to_db, db_to_mesh = _load_db_mappings(DB_MAPPINGS, CAS_MAPPINGS)
-
-
 @lru_cache(maxsize=1000)
 def get_mesh_name_from_web(mesh_id):
     """Get the MESH label for the given MESH ID using the NLM REST API.
@@ -131,6 +170,7 @@ def get_mesh_name(mesh_id, offline=False):
         Label for the MESH ID, or None if the query failed or no label was
         found.
     """
+    _load_mesh_tables()
     indra_mesh_mapping = mesh_id_to_name.get(mesh_id)
     if offline or indra_mesh_mapping is not None:
         return indra_mesh_mapping
@@ -165,6 +205,7 @@ def get_mesh_id_name(mesh_term, offline=False):
     if not mesh_term:
         return None, None
 
+    _load_mesh_tables()
     indra_mesh_id = mesh_name_to_id.get(mesh_term)
     if indra_mesh_id is not None:
         return indra_mesh_id, mesh_term
@@ -295,6 +336,7 @@ def get_mesh_tree_numbers(mesh_id):
     list[str]
         A list of MeSH tree IDs.
     """
+    _load_mesh_tables()
     # Handle supplementary concepts
     if mesh_id and mesh_id.startswith('C'):
         primary_ids = get_primary_mappings(mesh_id)
@@ -419,6 +461,7 @@ def get_db_mapping(mesh_id):
         A tuple consisting of a DB namespace and ID for the mapping or None
         if not available.
     """
+    _load_db_mapping_tables()
     return mesh_to_db.get(mesh_id)
 
 
@@ -438,6 +481,7 @@ def get_mesh_id_from_db_id(db_ns, db_id):
         The MeSH ID corresponding to the given namespace and ID if available,
         otherwise None.
     """
+    _load_db_mapping_tables()
     return db_to_mesh.get((db_ns, db_id))
 
 
@@ -457,6 +501,7 @@ def get_primary_mappings(db_id: str) -> List[str]:
         The list of primary MeSH terms that the supplementary concept
         is heading-mapped to.
     """
+    _load_mesh_tables()
     return mesh_supp_to_primary.get(db_id, [])
 
 
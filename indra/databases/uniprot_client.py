@@ -23,4 +23,16 @@ def _build_uniprot_subcell_loc():
     return up_to_go
 
 
-uniprot_subcell_loc = _build_uniprot_subcell_loc()
+def _load_uniprot_subcell_loc():
+    global uniprot_subcell_loc
+    if 'uniprot_subcell_loc' not in globals():
+        uniprot_subcell_loc = _build_uniprot_subcell_loc()
+
+
+def __getattr__(name):
+    # The subcellular location table is read upon first use rather than
+    # when this module is imported
+    if name == 'uniprot_subcell_loc':
+        _load_uniprot_subcell_loc()
+        return uniprot_subcell_loc
+    raise AttributeError('module %r has no attribute %r' % (__name__, name))
@@ -1,5 +1,7 @@
+import time
 import logging
 import textwrap
+import multiprocessing
 from copy import deepcopy
 
 import numpy as np
@@ -75,6 +77,9 @@ class PathResult(object):
         tuples (which are edges in the path), with the first element of the
         tuple the name of a rule, and the second element its polarity in the
         path.
+    time : float or None
+        The time in seconds it took to check the Statement when checked with
+        :py:meth:`ModelChecker.check_model`, None otherwise.
     """
     def __init__(self, path_found, result_code, max_paths, max_path_length):
         self.path_found = path_found
@@ -83,6 +88,7 @@ class PathResult(object):
         self.max_path_length = max_path_length
         self.path_metrics = []
         self.paths = []
+        self.time = None
 
     def add_path(self, path):
         self.paths.append(path)
@@ -231,7 +237,7 @@ class ModelChecker(object):
 
     def check_model(self, max_paths=1, max_path_length=5,
                     agent_filter_func=None, edge_filter_func=None,
-                    allow_direct=True):
+                    allow_direct=True, poolsize=None):
         """Check all the statements added to the ModelChecker.
 
         Parameters
@@ -253,28 +259,70 @@ class ModelChecker(object):
         allow_direct : Optional[bool]
             Whether to allow direct path of length 1 (edge between source and
             target) to be returned as a result. Default: True.
+        poolsize : Optional[int]
+            The number of worker processes to check statements in. If None
+            (default) or 1, statements are checked in this process. The graph
+            is built once before the workers are started and is shared with
+            them, without copying where processes can be forked. Otherwise,
+            the model checker and the filter functions have to be picklable.
 
         Returns
         -------
         list of (Statement, PathResult)
             Each tuple contains the Statement checked against the model and
-            a PathResult object describing the results of model checking.
+            a PathResult object describing the results of model checking,
+            in the order of the statements. The time it took to check each
+            statement is set as the time attribute of its PathResult.
         """
-        results = []
         # Convert agent filter function to node filter function once here
         node_filter_func = self.update_filter_func(agent_filter_func)
+        check_kwargs = {'max_paths': max_paths,
+                        'max_path_length': max_path_length,
+                        'node_filter_func': node_filter_func,
+                        'edge_filter_func': edge_filter_func,
+                        'allow_direct': allow_direct}
+        if poolsize and poolsize > 1 and len(self.statements) > 1:
+            return self._check_model_parallel(check_kwargs, poolsize)
+        results = []
         for idx, stmt in enumerate(self.statements):
             logger.info('---')
             logger.info('Checking statement (%d/%d): %s' %
                         (idx + 1, len(self.statements), stmt))
-            result = self.check_statement(
-                stmt, max_paths, max_path_length,
-                node_filter_func=node_filter_func,
-                edge_filter_func=edge_filter_func,
-                allow_direct=allow_direct)
-            results.append((stmt, result))
+            results.append((stmt, _timed_check(self, stmt, check_kwargs)))
         return results
 
+    def _check_model_parallel(self, check_kwargs, poolsize):
+        global _worker_checker, _worker_check_kwargs
+        # The graph is built here once so that workers don't each build it
+        self.get_graph(edge_filter_func=check_kwargs['edge_filter_func'])
+        # Statements are sent to workers in chunks, several per worker to
+        # balance statements that take longer to check
+        chunksize = max(1, len(self.statements) // (poolsize * 4))
+        # If possible, we fork workers after setting the model checker at
+        # the module level so that it is shared with the workers without
+        # pickling. Otherwise, it is sent to each worker once upon start-up.
+        if 'fork' in multiprocessing.get_all_start_methods():
+            ctx = multiprocessing.get_context('fork')
+            _worker_checker = self
+            _worker_check_kwargs = check_kwargs
+            pool_kwargs = {}
+        else:
+            ctx = multiprocessing.get_context()
+            pool_kwargs = {'initializer': _init_check_worker,
+                           'initargs': (self, check_kwargs)}
+        logger.info('Checking %d statements using %d processes'
+                    % (len(self.statements), poolsize))
+        try:
+            with ctx.Pool(poolsize, **pool_kwargs) as pool:
+                # Only the results are sent back so that the statements in
+                # the results are the ones checked
+                path_results = pool.map(_check_statement_worker,
+                                        self.statements, chunksize=chunksize)
+        finally:
+            _worker_checker = None
+            _worker_check_kwargs = None
+        return list(zip(self.statements, path_results))
+
     def check_statement(self, stmt, max_paths=1, max_path_length=5,
                         agent_filter_func=None, node_filter_func=None,
                         edge_filter_func=None, allow_direct=True):
@@ -577,6 +625,28 @@ class ModelChecker(object):
         raise NotImplementedError("Method must be implemented in child class.")
 
 
+# The model checker and arguments used by worker processes checking statements
+_worker_checker = None
+_worker_check_kwargs = None
+
+
+def _init_check_worker(model_checker, check_kwargs):
+    global _worker_checker, _worker_check_kwargs
+    _worker_checker = model_checker
+    _worker_check_kwargs = check_kwargs
+
+
+def _check_statement_worker(stmt):
+    return _timed_check(_worker_checker, stmt, _worker_check_kwargs)
+
+
+def _timed_check(model_checker, stmt, check_kwargs):
+    ts = time.perf_counter()
+    result = model_checker.check_statement(stmt, **check_kwargs)
+    result.time = time.perf_counter() - ts
+    return result
+
+
 def signed_edges_to_signed_nodes(graph, prune_nodes=True,
                                  edge_signs={'pos': 0, 'neg': 1},
                                  copy_edge_data=False):
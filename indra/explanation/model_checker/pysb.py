@@ -1,5 +1,8 @@
+import os
+import pickle
 import numbers
 import logging
+from hashlib import md5
 from copy import deepcopy
 from collections import Counter
 
@@ -8,7 +11,8 @@ import kappy
 import itertools
 import numpy as np
 import networkx as nx
-from pysb import WILD, export, Observable, ComponentSet, Annotation
+from pysb import WILD, export, Model, Rule, Observable, ComponentSet, \
+    Annotation
 from pysb.core import as_complex_pattern, ComponentDuplicateNameError
 from pysb.pattern import RulePatternMatcher
 from indra.explanation.reporting import stmt_from_rule, agent_from_obs
@@ -17,6 +21,7 @@ from indra.assemblers.pysb import assembler as pa
 from indra.assemblers.pysb.kappa_util import im_json_to_graph
 from indra.statements.agent import default_ns_order
 from indra.ontology.bio import bio_ontology
+from indra.config import get_config
 
 from . import ModelChecker, PathResult, NodesContainer
 from .model_checker import signed_edges_to_signed_nodes
@@ -53,6 +58,23 @@ class PysbModelChecker(ModelChecker):
     nodes_to_agents : dict
         A dictionary mapping nodes of intermediate signed edges graph to INDRA
         agents.
+    im_cache_dir : Optional[str]
+        A folder in which influence maps and the signed graphs derived from
+        them are cached, keyed by a fingerprint of the model, so that they
+        are reused for the same model instead of being generated again. By
+        default, the INDRA_IM_CACHE_DIR configuration is used, and if it is
+        not set either, nothing is cached.
+    update_im_incrementally : Optional[bool]
+        If True and the influence map of the model isn't cached, the most
+        recently cached influence map is updated if it was generated for
+        a model with the same monomers and initial conditions. Only the
+        influences of rules and observables that were added or changed are
+        then generated, from a model consisting of these rules and the rules
+        sharing monomers with them. Since Kappa's static analysis of these
+        influences takes the reachability of states into account, the
+        updated influence map can differ from one generated for the whole
+        model, and is therefore only reused from the cache by model checkers
+        updating influence maps incrementally. Default: False
 
     Attributes
     ----------
@@ -62,7 +84,8 @@ class PysbModelChecker(ModelChecker):
 
     def __init__(self, model, statements=None, agent_obs=None,
                  do_sampling=False, seed=None, model_stmts=None,
-                 nodes_to_agents=None):
+                 nodes_to_agents=None, im_cache_dir=None,
+                 update_im_incrementally=False):
         super().__init__(model, statements, do_sampling, seed, nodes_to_agents)
         if agent_obs:
             self.agent_obs = agent_obs
@@ -75,6 +98,15 @@ class PysbModelChecker(ModelChecker):
         self.model_stmts = model_stmts if model_stmts else []
         # Influence map
         self._im = None
+        self.im_cache_dir = im_cache_dir if im_cache_dir else \
+            get_config('INDRA_IM_CACHE_DIR')
+        self.update_im_incrementally = update_im_incrementally
+        # The fingerprint of the model for which the influence map was
+        # generated, used as a key to cache it
+        self._im_fingerprint = None
+        # Whether the influence map was updated incrementally rather than
+        # generated for the whole model
+        self._im_incremental = False
         # Map from statements to associated observables
         self.stmt_to_obs = {}
         # Map from agents to associated observables
@@ -242,8 +274,7 @@ class PysbModelChecker(ModelChecker):
             obs_nodes = add_obs_for_agents(ag)
             self.agent_to_obs[ag] = obs_nodes
 
-        logger.info("Generating influence map")
-        self._im = self.generate_im(self.model)
+        self._im = self._get_cached_im()
         # self._im.is_multigraph = lambda: False
         # Now, for every rule in the model, check if there are any observables
         # downstream; alternatively, for every observable in the model, get a
@@ -271,6 +302,24 @@ class PysbModelChecker(ModelChecker):
             return self.graph
         # NOTE edge_filter_func is not currently used in PySB
         im = self.get_im(force_update=True)
+        # The pruned influence map and the graph derived from it are cached
+        # for the given pruning options
+        fname = None
+        if self.im_cache_dir:
+            key = [self._im_fingerprint, self._im_incremental, prune_im,
+                   prune_im_degrade, prune_im_subj_obj, add_namespaces]
+            if prune_im_degrade:
+                key.append(sorted(stmt.get_hash()
+                                  for stmt in self.model_stmts))
+            fname = os.path.join(self.im_cache_dir,
+                                 'graph_%s.pkl' % _get_fingerprint(key))
+            cached = _load_pickle(fname)
+            if cached is not None:
+                logger.info('Loaded graph from %s' % fname)
+                self._im = cached['im']
+                self.get_nodes_to_agents(add_namespaces=add_namespaces)
+                self.graph = cached['graph']
+                return self.graph
         if prune_im:
             self.prune_influence_map()
         if prune_im_degrade:
@@ -280,8 +329,98 @@ class PysbModelChecker(ModelChecker):
         self.get_nodes_to_agents(add_namespaces=add_namespaces)
         self.graph = signed_edges_to_signed_nodes(
             im, prune_nodes=False, edge_signs={'pos': 1, 'neg': -1})
+        if fname:
+            _dump_pickle({'im': im, 'graph': self.graph}, fname)
         return self.graph
 
+    def _get_cached_im(self):
+        # Return the influence map of the model from the cache or, if it
+        # isn't cached, generate it or update the last cached influence map
+        if not self.im_cache_dir:
+            logger.info("Generating influence map")
+            return self.generate_im(self.model)
+        self._im_fingerprint = \
+            _get_fingerprint(export.export(self.model, 'kappa'))
+        fname = self._get_im_cache_fname(self._im_fingerprint)
+        cached = _load_pickle(fname)
+        # Influence maps that were updated incrementally can differ from
+        # generated ones so they are only reused if incremental updates are
+        # enabled
+        if cached is not None and (self.update_im_incrementally or
+                                   not cached.get('incremental')):
+            logger.info('Loaded influence map from %s' % fname)
+            self._im_incremental = cached.get('incremental', False)
+            return cached['im']
+        rule_fps = {rule.name: _get_fingerprint(
+            [str(rule.rule_expression), rule.delete_molecules,
+             rule.move_connected]) for rule in self.model.rules}
+        obs_fps = {obs.name: _get_fingerprint(str(obs.reaction_pattern))
+                   for obs in self.model.observables}
+        context_fp = _get_model_context_fingerprint(self.model)
+        # The fingerprint of the most recently cached influence map is kept
+        # to update it for the next model
+        latest_fname = os.path.join(self.im_cache_dir, 'im_latest.txt')
+        latest = None
+        if self.update_im_incrementally and os.path.exists(latest_fname):
+            with open(latest_fname, 'r') as fh:
+                latest = _load_pickle(self._get_im_cache_fname(fh.read()))
+        self._im_incremental = \
+            latest is not None and latest['context'] == context_fp
+        if self._im_incremental:
+            logger.info("Updating influence map")
+            im = self._update_im(latest, rule_fps, obs_fps)
+        else:
+            logger.info("Generating influence map")
+            im = self.generate_im(self.model)
+        _dump_pickle({'context': context_fp, 'rules': rule_fps,
+                      'observables': obs_fps, 'im': im,
+                      'incremental': self._im_incremental}, fname)
+        with open(latest_fname, 'w') as fh:
+            fh.write(self._im_fingerprint)
+        return im
+
+    def _get_im_cache_fname(self, fingerprint):
+        return os.path.join(self.im_cache_dir, 'im_%s.pkl' % fingerprint)
+
+    def _update_im(self, cached, rule_fps, obs_fps):
+        # Update a cached influence map for the rules and observables of the
+        # model, generating the influences of only those that were added or
+        # changed
+        im = cached['im']
+        added = {name for name, fp in rule_fps.items()
+                 if cached['rules'].get(name) != fp} | \
+            {name for name, fp in obs_fps.items()
+             if cached['observables'].get(name) != fp}
+        removed = (set(cached['rules']) - set(rule_fps)) | \
+            (set(cached['observables']) - set(obs_fps))
+        im.remove_nodes_from(removed | added)
+        if not added:
+            return im
+        logger.info('Generating influences of %d added rules and observables'
+                    % len(added))
+        # Rules can only influence rules and observables that share monomers
+        # with them so that only these rules are included in the model from
+        # which influences are generated
+        added_rules = [rule for rule in self.model.rules
+                       if rule.name in added]
+        added_obs = [obs for obs in self.model.observables
+                     if obs.name in added]
+        monomers = set()
+        for rule in added_rules:
+            monomers |= _get_rule_monomers(rule)
+        for obs in added_obs:
+            monomers |= _get_pattern_monomers(obs.reaction_pattern)
+        rules = [rule for rule in self.model.rules
+                 if rule.name in added or _get_rule_monomers(rule) & monomers]
+        sub_im = self.generate_im(_get_sub_model(self.model, rules))
+        for node in added:
+            if node in sub_im:
+                im.add_node(node, **sub_im.nodes[node])
+        for u, v, data in sub_im.edges(data=True):
+            if u in added or v in added:
+                im.add_edge(u, v, **data)
+        return im
+
     def get_nodes_to_agents(self, add_namespaces=False):
         """Return a dictionary mapping influence map nodes to INDRA agents.
 
@@ -773,6 +912,62 @@ class PysbModelChecker(ModelChecker):
         return dg
 
 
+def _get_fingerprint(obj):
+    return md5(repr(obj).encode('utf-8')).hexdigest()
+
+
+def _get_model_context_fingerprint(model):
+    # The fingerprint of the parts of the model other than rules and
+    # observables which influences depend on
+    monomers = [(mon.name, mon.sites, sorted(mon.site_states.items()))
+                for mon in model.monomers]
+    initials = [(str(init.pattern), getattr(init.value, 'value', None))
+                for init in model.initials]
+    return _get_fingerprint([monomers, initials])
+
+
+def _get_pattern_monomers(reaction_pattern):
+    # Synthesis and degradation rules have None as a complex pattern
+    return {mp.monomer.name for cp in reaction_pattern.complex_patterns
+            if cp is not None for mp in cp.monomer_patterns}
+
+
+def _get_rule_monomers(rule):
+    return _get_pattern_monomers(rule.rule_expression.reactant_pattern) | \
+        _get_pattern_monomers(rule.rule_expression.product_pattern)
+
+
+def _get_sub_model(model, rules):
+    # Return a model with the given rules and all other components and
+    # initial conditions of the model
+    sub_model = Model(_export=False)
+    for component in model.all_components():
+        if not isinstance(component, Rule):
+            sub_model.add_component(component)
+    for rule in rules:
+        sub_model.add_component(rule)
+    for initial in model.initials:
+        sub_model.add_initial(initial)
+    return sub_model
+
+
+def _load_pickle(fname):
+    if not os.path.exists(fname):
+        return None
+    with open(fname, 'rb') as fh:
+        return pickle.load(fh)
+
+
+def _dump_pickle(obj, fname):
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    # Write to a temporary file first so that concurrent readers never see a
+    # partially written file
+    tmp_fname = '%s.%d.tmp' % (fname, os.getpid())
+    with open(tmp_fname, 'wb') as fh:
+        pickle.dump(obj, fh)
+    os.replace(tmp_fname, fname)
+
+
 def _find_sources_sample(im, target, sources, polarity, rule_obs_dict,
                          agent_to_obs, agents_values):
     # Build up dict mapping observables to values
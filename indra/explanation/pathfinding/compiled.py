@@ -0,0 +1,589 @@
+__all__ = ['CompiledGraph']
+import logging
+from heapq import heappush, heappop
+from itertools import count, islice
+
+import numpy as np
+import networkx as nx
+
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledGraph(object):
+    """An immutable representation of a DiGraph compiled for path finding.
+
+    Nodes are numbered by integer IDs in the order of the graph's nodes and
+    the adjacency of the graph is stored in compressed sparse row (CSR)
+    arrays in both directions, with edges numbered in the order of
+    `graph.edges`. Edge beliefs and signs, node namespaces and node signs
+    are stored in NumPy arrays so that namespace and statement hash filters
+    can be applied to whole rows of neighbors as array masks.
+
+    The search functions of :py:mod:`indra.explanation.pathfinding` accept
+    a CompiledGraph in place of the graph it was compiled from and yield
+    the same paths in the same order. Filter functions that take the graph
+    as an argument are passed the original graph.
+
+    Parameters
+    ----------
+    graph : nx.DiGraph
+        The graph to compile. It can be a signed node graph, in which case
+        nodes are (name, sign) tuples. The graph should not be modified
+        after it has been compiled.
+
+    Attributes
+    ----------
+    graph : nx.DiGraph
+        The graph the CompiledGraph was compiled from.
+    nodes : list
+        The nodes of the graph, indexed by node ID.
+    node_ids : dict
+        A dict mapping each node of the graph to its node ID.
+    succ_indptr, succ_indices, succ_edges : np.ndarray
+        The successors of each node in CSR format, in the order of the
+        graph's adjacency, and the IDs of the corresponding edges.
+    pred_indptr, pred_indices, pred_edges : np.ndarray
+        The predecessors of each node in CSR format, in the order of the
+        graph's predecessor adjacency, and the IDs of the corresponding
+        edges.
+    belief : np.ndarray
+        The belief of each edge, 0 if not set.
+    sign : np.ndarray
+        The sign of each edge, -1 if not set.
+    node_ns : np.ndarray
+        The index of the namespace of each node in `ns_names`, -1 if the
+        node has no namespace.
+    ns_names : list[str]
+        The lower case namespaces of the nodes.
+    node_sign : np.ndarray
+        The sign of each signed node, -1 for unsigned nodes.
+    node_base : np.ndarray
+        An ID shared by the signed nodes of the same name.
+    """
+    def __init__(self, graph):
+        if graph.is_multigraph() or not graph.is_directed():
+            raise nx.NetworkXNotImplemented('Only DiGraphs can be compiled.')
+        self.graph = graph
+        self.nodes = list(graph.nodes)
+        self.node_ids = {node: ix for ix, node in enumerate(self.nodes)}
+        n_nodes = len(self.nodes)
+
+        # Number the edges in the order of the graph's adjacency so that the
+        # successor arrays are in CSR format without sorting
+        targets = []
+        degrees = []
+        beliefs = []
+        signs = []
+        hash_counts = []
+        hashes = []
+        for u, nbrs in graph.adjacency():
+            degrees.append(len(nbrs))
+            for v, data in nbrs.items():
+                targets.append(self.node_ids[v])
+                beliefs.append(data.get('belief', 0))
+                signs.append(data.get('sign', -1))
+                stmt_hashes = [stmt['stmt_hash'] for stmt
+                               in data.get('statements', [])
+                               if 'stmt_hash' in stmt]
+                hash_counts.append(len(stmt_hashes))
+                hashes += stmt_hashes
+        self.succ_indptr = _get_indptr(degrees)
+        self.succ_indices = np.array(targets, dtype=np.int64)
+        self.succ_edges = np.arange(len(targets), dtype=np.int64)
+        self.belief = np.array(beliefs, dtype=float)
+        self.sign = np.array(signs, dtype=np.int64)
+        self.hash_indptr = _get_indptr(hash_counts)
+        self.stmt_hashes = np.array(hashes, dtype=np.int64)
+
+        # The predecessors are kept in the order of the graph's predecessor
+        # adjacency, which can differ from the order of the edges
+        edge_ids = {}
+        sources = self._edge_sources()
+        for eid, (u, v) in enumerate(zip(sources.tolist(),
+                                         self.succ_indices.tolist())):
+            edge_ids[(u, v)] = eid
+        degrees = []
+        pred_indices = []
+        pred_edges = []
+        for v, nbrs in graph.pred.items():
+            v_id = self.node_ids[v]
+            degrees.append(len(nbrs))
+            for u in nbrs:
+                u_id = self.node_ids[u]
+                pred_indices.append(u_id)
+                pred_edges.append(edge_ids[(u_id, v_id)])
+        del edge_ids
+        self.pred_indptr = _get_indptr(degrees)
+        self.pred_indices = np.array(pred_indices, dtype=np.int64)
+        self.pred_edges = np.array(pred_edges, dtype=np.int64)
+
+        # Node attributes
+        ns_codes = {}
+        node_ns = []
+        for node, data in graph.nodes(data=True):
+            ns = data.get('ns')
+            if ns is None:
+                node_ns.append(-1)
+            else:
+                node_ns.append(ns_codes.setdefault(ns.lower(), len(ns_codes)))
+        self.node_ns = np.array(node_ns, dtype=np.int64)
+        self.ns_names = list(ns_codes)
+        base_ids = {}
+        node_base = []
+        node_sign = []
+        for node in self.nodes:
+            if isinstance(node, tuple):
+                name, sign = node
+                node_sign.append(sign)
+            else:
+                name = node
+                node_sign.append(-1)
+            node_base.append(base_ids.setdefault(name, len(base_ids)))
+        self.node_base = np.array(node_base, dtype=np.int64)
+        self.node_sign = np.array(node_sign, dtype=np.int64)
+        # Lists are kept as well for fast lookups of single nodes in searches
+        self._node_base_list = node_base
+        self._node_sign_list = node_sign
+
+        # Neighbors sorted by descending edge belief, with ties in the
+        # order of the graph's adjacency, as used in breadth first searches
+        self._sorted_adjacency = {
+            False: self._sort_by_belief(self.succ_indptr, self.succ_indices,
+                                        self.succ_edges),
+            True: self._sort_by_belief(self.pred_indptr, self.pred_indices,
+                                       self.pred_edges)}
+        self._edge_weights = {}
+        self._weight_list_cache = (None, None)
+        logger.debug('Compiled graph with %d nodes and %d edges'
+                     % (n_nodes, len(self.belief)))
+
+    def __contains__(self, node):
+        return node in self.node_ids
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def get_node_id(self, node):
+        """Return the ID of a node.
+
+        Raises
+        ------
+        networkx.NodeNotFound
+            If the node is not in the graph.
+        """
+        try:
+            return self.node_ids[node]
+        except (KeyError, TypeError):
+            raise nx.NodeNotFound('Node %s not in graph' % str(node))
+
+    def get_node_id_set(self, nodes):
+        """Return the set of IDs of the given nodes that are in the graph."""
+        if not nodes:
+            return set()
+        return {self.node_ids[node] for node in nodes
+                if node in self.node_ids}
+
+    def get_edge_id_set(self, edges):
+        """Return the set of (u, v) ID pairs of the given (u, v) edges."""
+        if not edges:
+            return set()
+        return {(self.node_ids[u], self.node_ids[v]) for u, v in edges
+                if u in self.node_ids and v in self.node_ids}
+
+    def get_path(self, path):
+        """Return a path of node IDs as a path of nodes of the same type."""
+        return type(path)(self.nodes[ix] for ix in path)
+
+    def get_edge_id(self, u, v):
+        """Return the ID of the edge between the nodes with IDs u and v."""
+        start, end = self.succ_indptr[u], self.succ_indptr[u + 1]
+        pos = np.flatnonzero(self.succ_indices[start:end] == v)
+        if not len(pos):
+            raise KeyError((self.nodes[u], self.nodes[v]))
+        return int(self.succ_edges[start + pos[0]])
+
+    def get_neighbors(self, node, reverse=False, edge_mask=None,
+                      sort_by_belief=False):
+        """Return the neighbors of a node and the IDs of the edges to them.
+
+        Parameters
+        ----------
+        node : int
+            The ID of the node.
+        reverse : Optional[bool]
+            If True, return the predecessors of the node, otherwise its
+            successors. Default: False
+        edge_mask : Optional[np.ndarray]
+            A boolean array over edges. If given, only neighbors connected
+            by edges set in the mask are returned.
+        sort_by_belief : Optional[bool]
+            If True, the neighbors are sorted by descending edge belief,
+            otherwise they are in the order of the graph's adjacency.
+            Default: False
+
+        Returns
+        -------
+        neighbors : np.ndarray
+            The IDs of the neighbors.
+        edges : np.ndarray
+            The IDs of the edges connecting the node to each neighbor.
+        """
+        if sort_by_belief:
+            indptr, indices, edges = self._sorted_adjacency[reverse]
+        elif reverse:
+            indptr, indices, edges = \
+                self.pred_indptr, self.pred_indices, self.pred_edges
+        else:
+            indptr, indices, edges = \
+                self.succ_indptr, self.succ_indices, self.succ_edges
+        start, end = indptr[node], indptr[node + 1]
+        neighbors = indices[start:end]
+        edges = edges[start:end]
+        if edge_mask is not None:
+            keep = edge_mask[edges]
+            neighbors = neighbors[keep]
+            edges = edges[keep]
+        return neighbors, edges
+
+    def ns_mask(self, namespaces):
+        """Return a boolean array over nodes with the given namespaces set.
+
+        Parameters
+        ----------
+        namespaces : list[str]
+            A list of lower case namespaces.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean array indexed by node ID that is True for nodes whose
+            lower case namespace is in the list.
+        """
+        ns_set = set(namespaces)
+        allowed = np.array([ns in ns_set for ns in self.ns_names] + [False],
+                           dtype=bool)
+        # Nodes without a namespace index the last element
+        return allowed[self.node_ns]
+
+    def hash_mask(self, hashes):
+        """Return a boolean array over edges supported by the given hashes.
+
+        Parameters
+        ----------
+        hashes : list[int]
+            A list of statement hashes.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean array indexed by edge ID that is True for edges that
+            have a statement with one of the hashes in their 'statements'
+            data.
+        """
+        found = np.isin(self.stmt_hashes,
+                        np.array(list(hashes), dtype=np.int64))
+        counts = np.add.reduceat(np.append(found, False).astype(np.int64),
+                                 self.hash_indptr[:-1]) \
+            if len(found) else np.zeros(len(self.belief), dtype=np.int64)
+        # Edges without statements get the count of the next edge's first
+        # hash from reduceat, so they are masked out explicitly
+        return (counts > 0) & (np.diff(self.hash_indptr) > 0)
+
+    def edge_mask(self, func, mask=None):
+        """Return a boolean array over edges allowed by a function.
+
+        Parameters
+        ----------
+        func : function
+            A function taking the nodes u and v of an edge and returning
+            True if the edge is allowed.
+        mask : Optional[np.ndarray]
+            If given, the function is only evaluated on edges set in this
+            boolean array, and other edges are not allowed.
+
+        Returns
+        -------
+        np.ndarray
+            A boolean array indexed by edge ID.
+        """
+        sources = self._edge_sources()
+        allowed = np.zeros(len(self.belief), dtype=bool)
+        eids = range(len(allowed)) if mask is None else \
+            np.flatnonzero(mask).tolist()
+        nodes = self.nodes
+        src = sources.tolist()
+        tgt = self.succ_indices.tolist()
+        for eid in eids:
+            if func(nodes[src[eid]], nodes[tgt[eid]]):
+                allowed[eid] = True
+        return allowed
+
+    def edge_weights(self, weight):
+        """Return an array of the weights of the edges.
+
+        Parameters
+        ----------
+        weight : str or None
+            The edge attribute holding the weight. Edges without the
+            attribute have a weight of 1, as in networkx. If None, all
+            edges have a weight of 1.
+
+        Returns
+        -------
+        np.ndarray
+            The weight of each edge, indexed by edge ID. The dtype is
+            inferred from the weights so that their precision is kept.
+        """
+        if weight not in self._edge_weights:
+            if weight is None:
+                weights = np.ones(len(self.belief))
+            else:
+                weights = np.array([data.get(weight, 1) for _, _, data
+                                    in self.graph.edges(data=True)])
+            self._edge_weights[weight] = weights
+        return self._edge_weights[weight]
+
+    def ref_count_weights(self, ref_counts_function, const_c=1, const_tk=10):
+        """Return edge weights based on the references of each edge.
+
+        The weight of an edge is -const_c * ln(ref_counts / (total +
+        const_tk)) where ref_counts and total are returned by
+        ref_counts_function for the edge.
+
+        Parameters
+        ----------
+        ref_counts_function : function
+            A function taking the graph and the nodes u and v of an edge and
+            returning the count of references of the edge and their total.
+        const_c : int
+            Constant used in the weight calculation
+        const_tk : int
+            Constant used in the weight calculation
+
+        Returns
+        -------
+        np.ndarray
+            The weight of each edge, indexed by edge ID.
+        """
+        weights = []
+        for u, v in self.graph.edges():
+            ref_counts, total = ref_counts_function(self.graph, u, v)
+            if not ref_counts:
+                ref_counts = 1e-15
+            weights.append(-const_c * np.log(ref_counts / (total + const_tk)))
+        return np.array(weights)
+
+    def bidirectional_pred_succ(self, source, target, ignore_nodes=None,
+                                ignore_edges=None, edge_mask=None):
+        """Return the meeting point of a bidirectional breadth first search.
+
+        This is the counterpart of
+        :py:func:`indra.explanation.pathfinding._bidirectional_pred_succ`
+        on node IDs, with allowed edges given as a boolean array over edges.
+
+        Returns
+        -------
+        pred : dict
+            The predecessors of the nodes from the meeting point to the
+            source.
+        succ : dict
+            The successors of the nodes from the meeting point to the target.
+        w : int
+            The node at which the searches met.
+        """
+        if ignore_nodes and (source in ignore_nodes or target in ignore_nodes):
+            raise nx.NetworkXNoPath('No path between %s and %s.'
+                                    % (self.nodes[source],
+                                       self.nodes[target]))
+        if target == source:
+            return {target: None}, {source: None}, source
+
+        pred = {source: None}
+        succ = {target: None}
+        forward_fringe = [source]
+        reverse_fringe = [target]
+        while forward_fringe and reverse_fringe:
+            if len(forward_fringe) <= len(reverse_fringe):
+                this_level = forward_fringe
+                forward_fringe = []
+                for v in this_level:
+                    for w in self._filtered_neighbors(v, False, ignore_nodes,
+                                                      ignore_edges,
+                                                      edge_mask)[0]:
+                        if w not in pred:
+                            forward_fringe.append(w)
+                            pred[w] = v
+                        if w in succ:
+                            return pred, succ, w
+            else:
+                this_level = reverse_fringe
+                reverse_fringe = []
+                for v in this_level:
+                    for w in self._filtered_neighbors(v, True, ignore_nodes,
+                                                      ignore_edges,
+                                                      edge_mask)[0]:
+                        if w not in succ:
+                            succ[w] = v
+                            reverse_fringe.append(w)
+                        if w in pred:
+                            return pred, succ, w
+        raise nx.NetworkXNoPath('No path between %s and %s.'
+                                % (self.nodes[source], self.nodes[target]))
+
+    def bidirectional_dijkstra(self, source, target, weights,
+                               ignore_nodes=None, ignore_edges=None):
+        """Return the length and path of the shortest weighted path.
+
+        This is the counterpart of networkx's
+        `simple_paths._bidirectional_dijkstra` on node IDs, with the edge
+        weights given as an array over edges.
+
+        Returns
+        -------
+        length : float
+            The length of the path.
+        path : list[int]
+            The node IDs of the path.
+        """
+        if ignore_nodes and (source in ignore_nodes or target in ignore_nodes):
+            raise nx.NetworkXNoPath('No path between %s and %s.'
+                                    % (self.nodes[source],
+                                       self.nodes[target]))
+        if source == target:
+            return 0, [source]
+        weights = self._weight_list(weights)
+        dists = [{}, {}]
+        paths = [{source: [source]}, {target: [target]}]
+        fringe = [[], []]
+        seen = [{source: 0}, {target: 0}]
+        c = count()
+        heappush(fringe[0], (0, next(c), source))
+        heappush(fringe[1], (0, next(c), target))
+        finalpath = []
+        finaldist = None
+        dir = 1
+        while fringe[0] and fringe[1]:
+            dir = 1 - dir
+            (dist, _, v) = heappop(fringe[dir])
+            if v in dists[dir]:
+                continue
+            dists[dir][v] = dist
+            if v in dists[1 - dir]:
+                return finaldist, finalpath
+            neighbors, edges = self._filtered_neighbors(
+                v, dir == 1, ignore_nodes, ignore_edges)
+            for w, eid in zip(neighbors, edges):
+                vw_length = dists[dir][v] + weights[eid]
+                if w in dists[dir]:
+                    if vw_length < dists[dir][w]:
+                        raise ValueError('Contradictory paths found: '
+                                         'negative weights?')
+                elif w not in seen[dir] or vw_length < seen[dir][w]:
+                    seen[dir][w] = vw_length
+                    heappush(fringe[dir], (vw_length, next(c), w))
+                    paths[dir][w] = paths[dir][v] + [w]
+                    if w in seen[0] and w in seen[1]:
+                        totaldist = seen[0][w] + seen[1][w]
+                        if finalpath == [] or finaldist > totaldist:
+                            finaldist = totaldist
+                            revpath = paths[1][w][:]
+                            revpath.reverse()
+                            finalpath = paths[0][w] + revpath[1:]
+        raise nx.NetworkXNoPath('No path between %s and %s.'
+                                % (self.nodes[source], self.nodes[target]))
+
+    def dijkstra_paths(self, source, weights, reverse=False):
+        """Return the shortest weighted paths from a node to all others.
+
+        This is the counterpart of networkx's `single_source_dijkstra_path`
+        on node IDs, with the edge weights given as an array over edges.
+
+        Parameters
+        ----------
+        source : int
+            The ID of the node to start from.
+        weights : np.ndarray
+            The weight of each edge.
+        reverse : Optional[bool]
+            If True, search upstream of the source. Default: False
+
+        Returns
+        -------
+        list[tuple]
+            A list of (path, length) tuples of the shortest path to each
+            node reachable from the source, including the source itself,
+            in the order in which the nodes were reached.
+        """
+        weights = self._weight_list(weights)
+        dist = {}
+        seen = {source: 0}
+        pred = {}
+        c = count()
+        fringe = []
+        heappush(fringe, (0, next(c), source))
+        while fringe:
+            (dist_v, _, v) = heappop(fringe)
+            if v in dist:
+                continue
+            dist[v] = dist_v
+            neighbors, edges = self.get_neighbors(v, reverse)
+            for u, eid in zip(neighbors.tolist(), edges.tolist()):
+                vu_dist = dist_v + weights[eid]
+                if u in dist:
+                    if vu_dist < dist[u]:
+                        raise ValueError('Contradictory paths found:',
+                                         'negative weights?')
+                elif u not in seen or vu_dist < seen[u]:
+                    seen[u] = vu_dist
+                    heappush(fringe, (vu_dist, next(c), u))
+                    pred[u] = v
+        paths = {source: [source]}
+        for v in islice(dist, 1, None):
+            paths[v] = paths[pred[v]] + [v]
+        return [(paths[v], d) for v, d in dist.items()]
+
+    def _filtered_neighbors(self, v, reverse, ignore_nodes=None,
+                            ignore_edges=None, edge_mask=None):
+        neighbors, edges = self.get_neighbors(v, reverse, edge_mask)
+        neighbors = neighbors.tolist()
+        edges = edges.tolist()
+        if ignore_nodes or ignore_edges:
+            keep = [(w, eid) for w, eid in zip(neighbors, edges)
+                    if not (ignore_nodes and w in ignore_nodes) and
+                    not (ignore_edges and
+                         ((w, v) if reverse else (v, w)) in ignore_edges)]
+            neighbors = [w for w, _ in keep]
+            edges = [eid for _, eid in keep]
+        return neighbors, edges
+
+    def _weight_list(self, weights):
+        # Searches look up the weights of single edges which is faster in a
+        # list than in an array. The list of the last weights is kept since
+        # the same weights are typically used for many searches in a row.
+        if self._weight_list_cache[0] is not weights:
+            self._weight_list_cache = (weights, _as_list(weights))
+        return self._weight_list_cache[1]
+
+    def _edge_sources(self):
+        return np.repeat(np.arange(len(self.nodes), dtype=np.int64),
+                         np.diff(self.succ_indptr))
+
+    def _sort_by_belief(self, indptr, indices, edges):
+        rows = np.repeat(np.arange(len(self.nodes), dtype=np.int64),
+                         np.diff(indptr))
+        order = np.lexsort((np.arange(len(indices)), -self.belief[edges],
+                            rows))
+        return indptr, indices[order], edges[order]
+
+
+def _get_indptr(counts):
+    indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    return indptr
+
+
+def _as_list(weights):
+    # Python floats are faster to add up one by one than NumPy floats and
+    # have the same precision, but other types are kept to not lose precision
+    return weights.tolist() if weights.dtype == np.float64 else list(weights)
@@ -14,6 +14,7 @@ import networkx.algorithms.simple_paths as simple_paths
 from numpy import log as ln
 
 from .util import get_sorted_neighbors, Node, Edge, EdgeFilter, SendType
+from .compiled import CompiledGraph
 
 
 logger = logging.getLogger(__name__)
@@ -36,7 +37,7 @@ def shortest_simple_paths(G, source, target, weight=None, ignore_nodes=None,
 
     Parameters
     ----------
-    G : NetworkX graph
+    G : NetworkX graph or CompiledGraph
     source : node
        Starting node for path
     target : node
@@ -121,6 +122,15 @@ def shortest_simple_paths(G, source, target, weight=None, ignore_nodes=None,
         t = target[0] if isinstance(target, tuple) else target
         raise nx.NodeNotFound('target node %s not in graph' % t)
 
+    if isinstance(G, CompiledGraph):
+        yield from _shortest_simple_paths_compiled(
+            G, source, target, weight=weight, ignore_nodes=ignore_nodes,
+            ignore_edges=ignore_edges, hashes=hashes,
+            ref_counts_function=ref_counts_function,
+            strict_mesh_id_filtering=strict_mesh_id_filtering,
+            const_c=const_c, const_tk=const_tk)
+        return
+
     allowed_edges = []
     if hashes:
         if strict_mesh_id_filtering:
@@ -164,6 +174,71 @@ def shortest_simple_paths(G, source, target, weight=None, ignore_nodes=None,
                                                             ignore_nodes,
                                                             ignore_edges)
 
+    yield from _shortest_simple_paths(G, source, target, weight, length_func,
+                                      shortest_path_func, allowed_edges,
+                                      ignore_nodes, ignore_edges)
+
+
+def _shortest_simple_paths_compiled(G, source, target, weight=None,
+                                    ignore_nodes=None, ignore_edges=None,
+                                    hashes=None, ref_counts_function=None,
+                                    strict_mesh_id_filtering=False,
+                                    const_c=1, const_tk=10):
+    # The counterpart of shortest_simple_paths for a CompiledGraph, in which
+    # the search is done on node IDs with allowed edges and edge weights
+    # given as arrays over edges
+    allowed_edges = None
+    weights = None
+    if hashes:
+        if strict_mesh_id_filtering:
+            allowed_edges = G.edge_mask(
+                lambda u, v: ref_counts_function(G.graph, u, v)[0])
+            # As with the list of allowed edges for networkx graphs, no
+            # allowed edges means that the search isn't restricted
+            if not allowed_edges.any():
+                allowed_edges = None
+        else:
+            weights = G.ref_count_weights(ref_counts_function, const_c,
+                                          const_tk)
+    else:
+        if strict_mesh_id_filtering:
+            return
+        if weight is not None:
+            weights = G.edge_weights(weight)
+
+    if weights is None:
+        length_func = len
+
+        def shortest_path_func(G, source, target, weight, ignore_nodes,
+                               ignore_edges, force_edges):
+            pred, succ, w = G.bidirectional_pred_succ(
+                source, target, ignore_nodes, ignore_edges, force_edges)
+            path = _get_path_from_pred_succ(pred, succ, w)
+            return len(path), path
+    else:
+        weight_list = G._weight_list(weights)
+
+        def length_func(path):
+            return sum(weight_list[G.get_edge_id(u, v)]
+                       for (u, v) in zip(path, path[1:]))
+
+        def shortest_path_func(G, source, target, weight, ignore_nodes,
+                               ignore_edges, force_edges):
+            return G.bidirectional_dijkstra(source, target, weights,
+                                            ignore_nodes, ignore_edges)
+
+    paths = _shortest_simple_paths(
+        G, G.get_node_id(source), G.get_node_id(target), weight,
+        length_func, shortest_path_func, allowed_edges,
+        G.get_node_id_set(ignore_nodes), G.get_edge_id_set(ignore_edges))
+    yield from _translate_paths(G, paths)
+
+
+def _shortest_simple_paths(G, source, target, weight, length_func,
+                           shortest_path_func, allowed_edges, ignore_nodes,
+                           ignore_edges):
+    # Yen's algorithm as used by shortest_simple_paths once the functions
+    # finding the shortest path and the length of a path are set up
     culled_ignored_nodes = set() \
         if ignore_nodes is None else set(ignore_nodes)
     culled_ignored_edges = set() \
@@ -236,7 +311,7 @@ def bfs_search(g: nx.DiGraph,
     g
         An nx.DiGraph to search in. Can also be a signed node graph. It is
         required that node data contains 'ns' (namespace) and edge data
-        contains 'belief'.
+        contains 'belief'. Can also be a CompiledGraph of such a graph.
     source_node
         Node in the graph to start from.
     reverse
@@ -267,7 +342,9 @@ def bfs_search(g: nx.DiGraph,
     hashes
         List of hashes used (if not empty) to select edges for path finding
     allow_edge
-        Function telling the edge must be omitted
+        Function telling the edge must be omitted. If g is a CompiledGraph
+        and no function is given, the edges are selected by the hashes of
+        the statements in their data.
     strict_mesh_id_filtering
         If true, exclude all edges not relevant to provided hashes
     edge_filter
@@ -294,6 +371,17 @@ def bfs_search(g: nx.DiGraph,
         Raises StopIteration when no more paths are available or when the
         memory limit is reached
     """
+    if isinstance(g, CompiledGraph):
+        yield from _translate_paths(g, _bfs_search_compiled(
+            g, source_node, reverse=reverse, depth_limit=depth_limit,
+            path_limit=path_limit, max_per_node=max_per_node,
+            node_filter=node_filter, node_blacklist=node_blacklist,
+            terminal_ns=terminal_ns, sign=sign, max_memory=max_memory,
+            hashes=hashes, allow_edge=allow_edge,
+            strict_mesh_id_filtering=strict_mesh_id_filtering,
+            edge_filter=edge_filter))
+        return
+
     int_plus = 0
     int_minus = 1
 
@@ -452,6 +540,141 @@ def bfs_search(g: nx.DiGraph,
             break
 
 
+def _bfs_search_compiled(g, source_node, reverse=False, depth_limit=2,
+                         path_limit=None, max_per_node=5, node_filter=None,
+                         node_blacklist=None, terminal_ns=None, sign=None,
+                         max_memory=int(2**29), hashes=None, allow_edge=None,
+                         strict_mesh_id_filtering=False, edge_filter=None):
+    # The counterpart of bfs_search for a CompiledGraph, yielding paths of
+    # node IDs. Namespace and hash filters are applied as array masks to
+    # each row of neighbors, which are sorted by belief when compiled.
+    int_plus = 0
+    int_minus = 1
+
+    allowed_edges = None
+    if strict_mesh_id_filtering:
+        if hashes:
+            allowed_edges = g.edge_mask(allow_edge) if allow_edge \
+                else g.hash_mask(hashes)
+
+            if edge_filter:
+                logger.info('Applying edge filter on list of allowed edges')
+                allowed_edges = g.edge_mask(
+                    lambda u, v: edge_filter(g.graph, u, v), allowed_edges)
+
+                # We can now set edge_filter to None, as we already have
+                # filtered all edges
+                edge_filter = None
+
+            if not allowed_edges.any():
+                logger.warning('No edges were allowed in strict mesh id '
+                               'filtering')
+                return
+        else:
+            logger.warning('No hashes provided for context search')
+            return
+
+    terminal_mask = g.ns_mask(terminal_ns) if terminal_ns else None
+    filter_mask = g.ns_mask(node_filter) \
+        if node_filter and len(node_filter) > 0 else None
+    nodes = g.nodes
+    node_sign = g._node_sign_list
+    node_base = g._node_base_list
+
+    source = g.get_node_id(source_node)
+    queue = deque([(source,)])
+    visited = {source}.union(g.get_node_id_set(node_blacklist)) \
+        if node_blacklist else {source}
+    yielded_paths = 0
+    while queue:
+        cur_path = queue.popleft()
+        last_node = cur_path[-1]
+
+        # if last node is in terminal_ns, continue to next path
+        if terminal_mask is not None and terminal_mask[last_node] \
+                and source != last_node:
+            continue
+
+        neighbors, edges = g.get_neighbors(last_node, reverse=reverse,
+                                           edge_mask=allowed_edges,
+                                           sort_by_belief=True)
+        # Check namespace
+        if filter_mask is not None:
+            neighbors = neighbors[filter_mask[neighbors]]
+        neighbors = neighbors.tolist()
+        if edge_filter:
+            if reverse:
+                neighbors = [n for n in neighbors
+                             if edge_filter(g.graph, nodes[n],
+                                            nodes[last_node])]
+            else:
+                neighbors = [n for n in neighbors
+                             if edge_filter(g.graph, nodes[last_node],
+                                            nodes[n])]
+        yielded_neighbors = 0
+        for neighb in neighbors:
+            # Check cycles
+            if sign is not None:
+                # Avoid signed paths ending up on the opposite sign of the
+                # same node
+                if any(node_base[n] == node_base[neighb] and
+                       node_sign[n] in (int_plus, int_minus)
+                       for n in cur_path):
+                    continue
+            elif neighb in visited:
+                continue
+
+            # Add to visited nodes and create new path
+            visited.add(neighb)
+            new_path = cur_path + (neighb,)
+
+            # Check yield and break conditions
+            if len(new_path) > depth_limit + 1:
+                continue
+            # Signed searches don't yield paths ending upstream in a negative
+            # node or downstream in a node without the requested sign, and
+            # with terminal_ns, only paths ending in terminal_ns are yielded
+            ign_vals = None
+            if terminal_mask is not None and not terminal_mask[neighb]:
+                pass
+            elif sign is not None and reverse and \
+                    node_sign[neighb] == int_minus:
+                pass
+            elif sign is not None and not reverse and \
+                    node_sign[neighb] != sign:
+                pass
+            else:
+                ign_vals = yield new_path
+                yielded_paths += 1
+                yielded_neighbors += 1
+
+            # If new ignore nodes are received, update set
+            if ign_vals is not None:
+                ign_nodes, ign_edges = ign_vals
+                visited.update(ign_nodes)
+
+            # Check max paths reached, no need to add to queue
+            if path_limit and yielded_paths >= path_limit:
+                break
+
+            # Append yielded path
+            queue.append(new_path)
+
+            # Check for memory
+            if sys.getsizeof(queue) + sys.getsizeof(visited) > max_memory:
+                logger.warning('Memory overflow reached: %d' %
+                               (sys.getsizeof(queue) + sys.getsizeof(visited)))
+                raise StopIteration('Reached maximum allowed memory usage')
+
+            # Check if we've visited enough neighbors
+            if max_per_node and yielded_neighbors >= max_per_node:
+                break
+
+        # Check path limit again to catch the inner break for path_limit
+        if path_limit and yielded_paths >= path_limit:
+            break
+
+
 def bfs_search_multiple_nodes(g, source_nodes, path_limit=None, **kwargs):
     """Do breadth first search from each of given nodes and yield paths
     until path limit is met.
@@ -544,7 +767,7 @@ def find_sources(graph, target, sources, filter_func=None):
 
     Parameters
     ----------
-    graph : nx.DiGraph
+    graph : nx.DiGraph or CompiledGraph
         A DiGraph with signed nodes to find paths in.
     target : node
         The signed node (usually common target node) in the graph to start
@@ -566,6 +789,9 @@ def find_sources(graph, target, sources, filter_func=None):
     # Update filter function to not filter the sources
     if sources is not None:
         filter_func = filter_except(filter_func, sources)
+    if isinstance(graph, CompiledGraph):
+        yield from _find_sources_compiled(graph, target, sources, filter_func)
+        return
     # First, create a list of visited nodes
     # Adapted from
     # networkx.algorithms.traversal.breadth_first_search.bfs_edges
@@ -610,6 +836,61 @@ def find_sources(graph, target, sources, filter_func=None):
     return
 
 
+def _translate_paths(G, paths):
+    """Yield the paths of node IDs of a search in a CompiledGraph as paths
+    of nodes, and send the nodes and edges to ignore received by the
+    generator to the search as node IDs."""
+    try:
+        path = next(paths)
+        while True:
+            ignore_values = yield G.get_path(path)
+            if ignore_values is not None:
+                ignore_nodes, ignore_edges = ignore_values
+                ignore_values = (G.get_node_id_set(ignore_nodes),
+                                 G.get_edge_id_set(ignore_edges))
+            path = paths.send(ignore_values)
+    except StopIteration:
+        return
+
+
+def _find_sources_compiled(graph, target, sources, filter_func):
+    # The counterpart of find_sources for a CompiledGraph, in which the
+    # filter function is only applied once to each node
+    nodes = graph.nodes
+    node_sign = graph.node_sign
+    allowed = {}
+
+    def get_predecessors(node):
+        preds = graph.get_neighbors(node, reverse=True)[0].tolist()
+        if filter_func:
+            for pred in preds:
+                if pred not in allowed:
+                    allowed[pred] = filter_func(nodes[pred])
+            preds = [pred for pred in preds if allowed[pred]]
+        return iter(preds)
+
+    target = graph.get_node_id(target)
+    source_ids = graph.get_node_id_set(sources) \
+        if sources is not None else None
+    visited = {target}
+    queue = deque([(target, get_predecessors(target), 0)])
+    while queue:
+        parent, children, path_length = queue[0]
+        try:
+            child = next(children)
+            if (source_ids is None or child in source_ids) and \
+                    node_sign[child] == 0:
+                logger.debug("Found path to %s from %s with length %d"
+                             % (nodes[target], nodes[child], path_length+1))
+                yield (nodes[child], path_length+1)
+            if child not in visited:
+                visited.add(child)
+                queue.append(
+                    (child, get_predecessors(child), path_length + 1))
+        except StopIteration:
+            queue.popleft()
+
+
 def _bidirectional_shortest_path(G, source, target,
                                  ignore_nodes=None,
                                  ignore_edges=None,
@@ -658,7 +939,11 @@ def _bidirectional_shortest_path(G, source, target,
     results = _bidirectional_pred_succ(G, source, target, ignore_nodes,
                                        ignore_edges, force_edges=force_edges)
     pred, succ, w = results
+    path = _get_path_from_pred_succ(pred, succ, w)
+    return len(path), path
 
+
+def _get_path_from_pred_succ(pred, succ, w):
     # build path from pred+w+succ
     path = []
     # from w to target
@@ -670,8 +955,7 @@ def _bidirectional_shortest_path(G, source, target,
     while w is not None:
         path.insert(0, w)
         w = pred[w]
-
-    return len(path), path
+    return path
 
 
 def _bidirectional_pred_succ(G, source, target, ignore_nodes=None,
@@ -805,7 +1089,7 @@ def open_dijkstra_search(g, start, reverse=False, path_limit=None,
 
     Parameters
     ----------
-    g : nx.Digraph
+    g : nx.Digraph or CompiledGraph
         An nx.DiGraph to search in.
     start : node
         Node in the graph to start from.
@@ -843,6 +1127,15 @@ def open_dijkstra_search(g, start, reverse=False, path_limit=None,
     path : tuple(node)
         Paths in the bfs search starting from `source`.
     """
+    if isinstance(g, CompiledGraph):
+        yield from _open_dijkstra_search_compiled(
+            g, start, reverse=reverse, path_limit=path_limit,
+            hashes=hashes, ignore_nodes=ignore_nodes,
+            ignore_edges=ignore_edges, terminal_ns=terminal_ns,
+            weight=weight, ref_counts_function=ref_counts_function,
+            const_c=const_c, const_tk=const_tk)
+        return
+
     def weights_sum(path):
         return sum(g[u][v][weight]
                    for u, v in zip(path[:-1], path[1:]))
@@ -895,6 +1188,47 @@ def open_dijkstra_search(g, start, reverse=False, path_limit=None,
                 yield p
 
 
+def _open_dijkstra_search_compiled(g, start, reverse=False, path_limit=None,
+                                   hashes=None, ignore_nodes=None,
+                                   ignore_edges=None, terminal_ns=None,
+                                   weight=None, ref_counts_function=None,
+                                   const_c=1, const_tk=10):
+    # The counterpart of open_dijkstra_search for a CompiledGraph
+    if hashes:
+        weights = g.ref_count_weights(ref_counts_function, const_c, const_tk)
+    else:
+        weights = g.edge_weights(weight)
+    ignore_nodes = g.get_node_id_set(ignore_nodes)
+    ignore_edges = g.get_edge_id_set(ignore_edges)
+    terminal_mask = g.ns_mask(terminal_ns) if terminal_ns else None
+
+    def proper_path(path):
+        if ignore_nodes and not ignore_nodes.isdisjoint(path):
+            return False
+        if ignore_edges and any((u, v) in ignore_edges
+                                for u, v in zip(path[:-1], path[1:])):
+            return False
+        if terminal_mask is not None:
+            if not terminal_mask[path[-1]]:
+                return False
+            if terminal_mask[path[:-1]].any():
+                return False
+        return True
+
+    # The paths are sorted by their length, which is the distance at which
+    # the last node of the path was reached
+    paths = g.dijkstra_paths(g.get_node_id(start), weights,
+                             reverse=reverse)[1:]
+    paths.sort(key=lambda x: x[1])
+    for p, _ in paths:
+        if proper_path(p):
+            yield g.get_path(p)
+        if path_limit is not None:
+            path_limit -= 1
+            if not path_limit:
+                break
+
+
 # This code is adapted from nx.algorithms.simple_paths._all_simple_paths_graph
 def simple_paths_with_constraints(G, source, target, cutoff=None,
                                   allow_shorter=False, filter_func=None):
@@ -13,6 +13,12 @@ To start the server, run
 or use a WSGI application server such as gunicorn (the service uses port 8002
 by default, this can be changed using the `--port` argument).
 
+If the clients of the service run on the same machine, e.g., many
+preassembly worker processes sharing a single ontology, the service can
+instead listen on a Unix socket, which avoids the overhead of TCP,
+using the `--socket <path>` argument (or `--bind unix:<path>` with gunicorn).
+Clients then connect to it using the URL `unix://<path>`.
+
 Once the service is
 started, one option is to create an instance of
 `VirtualOntology(url=<service url>)` and use it as an argument in various
@@ -50,6 +50,28 @@ def get_id_from_name():
         **{k: v for k, v in request.json.items() if k in kwargs}))
 
 
+@app.route('/descendants_rel', methods=['GET', 'POST'])
+def descendants_rel():
+    return jsonify(_get_transitive_rels('descendants_rel'))
+
+
+@app.route('/ancestors_rel', methods=['GET', 'POST'])
+def ancestors_rel():
+    return jsonify(_get_transitive_rels('ancestors_rel'))
+
+
+def _get_transitive_rels(method):
+    # Return the full transitive closure with respect to the given relation
+    # types of each of a list of nodes so that clients can get the parents
+    # or children of many nodes in a single request.
+    ont = request.json.get('ontology')
+    ontology = ontologies.get(ont)
+    rel_fun = getattr(ontology, method)
+    rel_types = set(request.json.get('rel_types'))
+    return [rel_fun(ns, id, rel_types)
+            for ns, id in request.json.get('nodes')]
+
+
 @app.route('/get_xrefs', methods=['GET'])
 def get_xrefs():
     ont = request.json.get('ontology')
@@ -64,5 +86,12 @@ if __name__ == '__main__':
         description='Run the INDRA Ontology service.')
     parser.add_argument('--port', help='The port to run the server on.',
                         default=8082)
+    parser.add_argument('--socket',
+                        help='The path of a Unix socket to run the server on '
+                             'instead of a port. Clients on the same machine '
+                             'can then connect to unix://<socket path>.')
     args = parser.parse_args()
-    app.run(host='0.0.0.0', port=args.port)
+    if args.socket:
+        app.run(host='unix://%s' % args.socket, threaded=True)
+    else:
+        app.run(host='0.0.0.0', port=args.port)
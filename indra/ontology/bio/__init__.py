@@ -3,9 +3,14 @@
 __all__ = ['bio_ontology', 'BioOntology']
 
 from indra.config import get_config
-from .ontology import BioOntology
+from .ontology import BioOntology, COMPILED_CACHE_DIR, get_config_flag
 from ..virtual import VirtualOntology
+from ..compiled import CompiledOntology
 
 indra_ontology_url = get_config('INDRA_ONTOLOGY_URL')
-bio_ontology = BioOntology() if not indra_ontology_url else \
-    VirtualOntology(url=indra_ontology_url)
\ No newline at end of file
+if indra_ontology_url:
+    bio_ontology = VirtualOntology(url=indra_ontology_url)
+elif get_config_flag('INDRA_ONTOLOGY_COMPILED'):
+    bio_ontology = CompiledOntology(COMPILED_CACHE_DIR, source=BioOntology)
+else:
+    bio_ontology = BioOntology()
@@ -12,6 +12,9 @@ to build or clean up the INDRA bio ontology. The script takes
 a single operation argument which can be as follows:
 
 * `build`: build the ontology and cache it
+* `build-index`: build the compiled index of isa/partof relations for the
+  ontology and cache it
+* `compile`: compile the ontology into a memory-mapped format and cache it
 * `clean`: delete the current version of the ontology from the cache
 * `clean-old`: delete all versions of the ontology except the current one
 * `clean-all`: delete all versions of the bio ontology from the cache
@@ -21,18 +24,27 @@ import sys
 import glob
 import shutil
 import logging
-from .ontology import BioOntology, CACHE_DIR
+from .ontology import BioOntology, CACHE_DIR, COMPILED_CACHE_DIR
+from ..compiled import CompiledOntology
 
 logger = logging.getLogger('indra.ontology.bio')
 
 if __name__ == '__main__':
     if len(sys.argv) < 2:
         logger.info('Operation missing. Supported operations: '
-                    'build, clean, clean-old, clean-all.')
+                    'build, build-index, compile, clean, clean-old, '
+                    'clean-all.')
         sys.exit(1)
     operation = sys.argv[1]
     if operation == 'build':
         BioOntology().initialize(rebuild=True)
+    elif operation == 'build-index':
+        ontology = BioOntology()
+        ontology.initialize()
+        ontology.load_index(rebuild=True)
+    elif operation == 'compile':
+        CompiledOntology(COMPILED_CACHE_DIR,
+                         source=BioOntology).initialize(rebuild=True)
     elif operation == 'version':
         print(BioOntology.version)
     elif operation.startswith('clean'):
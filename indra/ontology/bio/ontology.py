@@ -3,6 +3,7 @@ import pickle
 import logging
 from indra.config import get_config
 from ..ontology_graph import IndraOntology
+from ..ontology_index import OntologyIndex
 from indra.util import read_unicode_csv
 from indra.statements import modtype_conditions
 from indra.resources import get_resource_path
@@ -50,6 +51,43 @@ class BioOntology(IndraOntology):
                 'Loading INDRA bio ontology from cache at %s' % CACHE_FILE)
             with open(CACHE_FILE, 'rb') as fh:
                 self.__dict__.update(pickle.load(fh).__dict__)
+        if get_config_flag('INDRA_ONTOLOGY_INDEX'):
+            self.load_index(rebuild=rebuild)
+
+    def load_index(self, rebuild=False):
+        """Load a compiled index of isa/partof relations for this ontology.
+
+        The index is loaded from the cache if it exists there and was built
+        for the current version of the ontology, otherwise, it is built
+        and cached. This function is called automatically upon initialization
+        if the INDRA_ONTOLOGY_INDEX configuration is set.
+
+        Parameters
+        ----------
+        rebuild : Optional[bool]
+            If True, the index is rebuilt even if it is available in the
+            cache. Default: False
+
+        Returns
+        -------
+        indra.ontology.ontology_index.OntologyIndex
+            The index that is now used by the ontology.
+        """
+        index = None if rebuild else OntologyIndex.load(INDEX_CACHE_DIR)
+        if index is not None and index.is_compatible(self):
+            logger.info('Loaded INDRA bio ontology index from cache at %s' %
+                        INDEX_CACHE_DIR)
+            self.set_index(index)
+            return index
+        index = self.build_index()
+        try:
+            logger.info('Caching INDRA bio ontology index at %s' %
+                        INDEX_CACHE_DIR)
+            index.dump(INDEX_CACHE_DIR)
+        except Exception:
+            logger.warning('Failed to cache ontology index at %s.' %
+                           INDEX_CACHE_DIR)
+        return index
 
     def _build(self):
         # Add all nodes with annotations
@@ -692,3 +730,11 @@ CACHE_DIR = os.path.join((get_config('INDRA_RESOURCES') or
                          '%s_ontology' % BioOntology.name,
                          BioOntology.version)
 CACHE_FILE = os.path.join(CACHE_DIR, 'bio_ontology.pkl')
+INDEX_CACHE_DIR = os.path.join(CACHE_DIR, 'bio_ontology_index')
+COMPILED_CACHE_DIR = os.path.join(CACHE_DIR, 'bio_ontology_compiled')
+
+
+def get_config_flag(key):
+    """Return True if a given configuration is set to a true value."""
+    value = get_config(key)
+    return bool(value) and value.lower() not in {'false', '0', 'no'}
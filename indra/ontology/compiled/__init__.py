@@ -0,0 +1,4 @@
+"""This module implements an ontology backed by a compiled, memory-mapped
+representation of another ontology, which can be attached to quickly and
+shared across processes."""
+from .ontology import CompiledOntology
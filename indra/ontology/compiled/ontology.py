@@ -0,0 +1,367 @@
+import os
+import json
+import uuid
+import shutil
+import hashlib
+import logging
+import numpy
+from ..ontology_graph import IndraOntology, with_initialize
+from ..ontology_index import OntologyIndex
+
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledOntology(IndraOntology):
+    """An ontology backed by memory-mapped arrays compiled from another
+    IndraOntology.
+
+    The compiled ontology consists of a node table (node labels
+    and node properties stored column-wise), the edges of the ontology
+    graph stored as CSR arrays in both directions along with their types,
+    a hashed lookup table for standard names, and an
+    :py:class:`indra.ontology.ontology_index.OntologyIndex` of transitive
+    isa/partof relations. All of these are saved as .npy files in a folder
+    and are memory-mapped when the ontology is initialized, so attaching
+    to a compiled ontology is fast, and processes using the same compiled
+    ontology share its pages through the OS cache.
+
+    The compiled ontology implements the query API of the IndraOntology
+    (child_rel, parent_rel, get_node_property, get_id_from_name, and all
+    the methods built on these), however, similar to the
+    :py:class:`indra.ontology.virtual.VirtualOntology`, it doesn't expose the
+    ontology as a networkx graph. Of edge attributes, only edge types
+    are retained.
+
+    Parameters
+    ----------
+    path : str
+        The path to the folder containing the compiled ontology.
+    source : Optional[indra.ontology.IndraOntology or type]
+        An IndraOntology instance or class from which the ontology is compiled
+        upon initialization if there is no compiled ontology at the given
+        path or if it was compiled from a different version of the source
+        ontology. If None, the compiled ontology has to exist at the given
+        path.
+    """
+    format_version = 1
+
+    def __init__(self, path, source=None):
+        super().__init__()
+        self.path = path
+        self.source = source
+        self.meta = {}
+        self._arrays = {}
+        self._edge_type_codes = {}
+
+    def initialize(self, rebuild=False):
+        meta = _load_meta(self.path)
+        if self.source is not None:
+            if rebuild or meta is None or \
+                    meta.get('name') != self.source.name or \
+                    meta.get('version') != self.source.version:
+                source = self.source() if isinstance(self.source, type) \
+                    else self.source
+                logger.info('Compiling %s ontology into %s' %
+                            (source.name, self.path))
+                self.compile(source, self.path)
+                meta = _load_meta(self.path)
+        if meta is None:
+            raise ValueError('There is no compiled ontology at %s' %
+                             self.path)
+        logger.info('Loading compiled ontology from %s' % self.path)
+        self.meta = meta
+        self._edge_type_codes = {}
+        self.name = meta['name']
+        self.version = meta['version']
+        self._arrays = {
+            key: numpy.load(os.path.join(self.path, '%s.npy' % key),
+                            mmap_mode='r')
+            for key in meta['arrays']
+        }
+        self.set_index(OntologyIndex.load(self.path))
+        self._initialized = True
+
+    @classmethod
+    def compile(cls, ontology, path):
+        """Compile a given ontology into a given folder.
+
+        Parameters
+        ----------
+        ontology : indra.ontology.IndraOntology
+            The ontology to compile.
+        path : str
+            The path to a folder into which the ontology is compiled. Any
+            previously compiled ontology in this folder is replaced.
+        """
+        # We need to make sure the ontology is fully loaded before
+        # accessing the graph directly.
+        if not ontology._initialized:
+            ontology.initialize()
+        # The ontology is compiled into a new folder next to the given one
+        # which then replaces it so that other processes never see a
+        # partially compiled ontology, and the ones that have the previous
+        # one memory-mapped can keep using it.
+        path = os.path.abspath(path)
+        tmp_path = '%s.%s.tmp' % (path, uuid.uuid4().hex)
+        os.makedirs(tmp_path)
+        try:
+            cls._compile(ontology, tmp_path)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+        _replace_folder(tmp_path, path)
+
+    @classmethod
+    def _compile(cls, ontology, path):
+        index = OntologyIndex.from_ontology(ontology)
+        index.dump(path)
+        labels = [label.decode('utf-8') for label in index.labels.tolist()]
+        node_ids = {label: idx for idx, label in enumerate(labels)}
+
+        arrays = {}
+        # Edges in both directions, preserving the order of neighbors
+        # in the graph
+        edge_types = sorted({edge_type for _, _, edge_type
+                             in ontology.edges(data='type')},
+                            key=lambda x: str(x))
+        edge_type_codes = {edge_type: idx
+                           for idx, edge_type in enumerate(edge_types)}
+        for direction, adjacency in (('succ', ontology.succ),
+                                     ('pred', ontology.pred)):
+            indptr = numpy.zeros(len(labels) + 1, dtype=numpy.int64)
+            indices = []
+            types = []
+            for idx, label in enumerate(labels):
+                neighbors = adjacency[label]
+                indptr[idx + 1] = indptr[idx] + len(neighbors)
+                for neighbor, data in neighbors.items():
+                    indices.append(node_ids[neighbor])
+                    types.append(edge_type_codes[data.get('type')])
+            arrays['%s_indptr' % direction] = indptr
+            arrays['%s_indices' % direction] = \
+                numpy.array(indices, dtype=numpy.int32)
+            arrays['%s_types' % direction] = \
+                numpy.array(types, dtype=numpy.uint8)
+
+        # Node properties, stored column-wise
+        properties = {}
+        node_data = [ontology.nodes[label] for label in labels]
+        prop_keys = sorted({key for data in node_data for key in data})
+        for prop_idx, key in enumerate(prop_keys):
+            mask = numpy.array([key in data for data in node_data],
+                               dtype=bool)
+            values = [data[key] for data in node_data if key in data]
+            kind, prop_arrays, categories = _encode_property(values, mask)
+            properties[key] = {'kind': kind, 'column': prop_idx,
+                               'categories': categories}
+            arrays['prop%d_mask' % prop_idx] = mask
+            for suffix, arr in prop_arrays.items():
+                arrays['prop%d_%s' % (prop_idx, suffix)] = arr
+
+        # The standard name lookup
+        if not ontology.name_to_grounding:
+            ontology._build_name_lookup()
+        name_entries = sorted(
+            (_name_key_hash(ns, name), node_ids[ontology.label(*grounding)])
+            for (ns, name), grounding in ontology.name_to_grounding.items())
+        arrays['name_hashes'] = numpy.array([h for h, _ in name_entries],
+                                            dtype=numpy.uint64)
+        arrays['name_nodes'] = numpy.array([n for _, n in name_entries],
+                                           dtype=numpy.int32)
+
+        for key, arr in arrays.items():
+            numpy.save(os.path.join(path, '%s.npy' % key), arr)
+        meta = {'name': ontology.name,
+                'version': ontology.version,
+                'format_version': cls.format_version,
+                'edge_types': edge_types,
+                'properties': properties,
+                'arrays': sorted(arrays)}
+        # The metadata is written last so that its presence indicates
+        # a complete compiled ontology.
+        with open(os.path.join(path, 'ontology.json'), 'w') as fh:
+            json.dump(meta, fh, indent=1)
+
+    def __getstate__(self):
+        # The memory-mapped arrays are not pickled, rather, the compiled
+        # ontology is attached to again after unpickling.
+        return {'path': self.path,
+                'source': self.source if isinstance(self.source, type)
+                else None}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], source=state['source'])
+
+    def _get_node_id(self, ns, id):
+        return self._index.get_node_id(self.label(ns, id))
+
+    def _neighbors(self, ns, id, rel_types, direction):
+        node_id = self._get_node_id(ns, id)
+        if node_id is None:
+            return
+        edge_type_codes = self._get_edge_type_codes(rel_types)
+        indptr = self._arrays['%s_indptr' % direction]
+        start, end = indptr[node_id], indptr[node_id + 1]
+        neighbors = self._arrays['%s_indices' % direction][start:end]
+        types = self._arrays['%s_types' % direction][start:end]
+        for neighbor, edge_type in zip(neighbors.tolist(), types.tolist()):
+            if edge_type in edge_type_codes:
+                yield self.get_ns_id(self._index.get_label(neighbor))
+
+    def _get_edge_type_codes(self, rel_types):
+        key = frozenset(rel_types)
+        codes = self._edge_type_codes.get(key)
+        if codes is None:
+            codes = {idx for idx, edge_type
+                     in enumerate(self.meta['edge_types'])
+                     if edge_type in key}
+            self._edge_type_codes[key] = codes
+        return codes
+
+    @with_initialize
+    def child_rel(self, ns, id, rel_types):
+        yield from self._neighbors(ns, id, rel_types, 'succ')
+
+    @with_initialize
+    def parent_rel(self, ns, id, rel_types):
+        yield from self._neighbors(ns, id, rel_types, 'pred')
+
+    @with_initialize
+    def get_node_property(self, ns, id, property):
+        node_id = self._get_node_id(ns, id)
+        if node_id is None:
+            return None
+        return self._get_property(node_id, property)
+
+    def _get_property(self, node_id, property):
+        prop = self.meta['properties'].get(property)
+        if prop is None:
+            return None
+        prefix = 'prop%d' % prop['column']
+        if not self._arrays['%s_mask' % prefix][node_id]:
+            return None
+        kind = prop['kind']
+        if kind in {'bool', 'int', 'float'}:
+            return self._arrays['%s_values' % prefix][node_id].item()
+        elif kind == 'category':
+            code = self._arrays['%s_values' % prefix][node_id]
+            return prop['categories'][code]
+        offsets = self._arrays['%s_offsets' % prefix]
+        value = bytes(self._arrays['%s_data' % prefix][
+            offsets[node_id]:offsets[node_id + 1]]).decode('utf-8')
+        return value if kind == 'string' else json.loads(value)
+
+    @with_initialize
+    def get_id_from_name(self, ns, name):
+        hashes = self._arrays['name_hashes']
+        key_hash = numpy.uint64(_name_key_hash(ns, name))
+        start = numpy.searchsorted(hashes, key_hash, side='left')
+        end = numpy.searchsorted(hashes, key_hash, side='right')
+        # We check the actual name space and name of each candidate
+        # in case of hash collisions
+        for node_id in self._arrays['name_nodes'][start:end].tolist():
+            node_ns, node_id_str = \
+                self.get_ns_id(self._index.get_label(node_id))
+            if node_ns == ns and self._get_property(node_id, 'name') == name:
+                return node_ns, node_id_str
+        return None
+
+    @with_initialize
+    def _build_name_lookup(self):
+        # The name lookup is part of the compiled ontology
+        pass
+
+    @with_initialize
+    def nodes_from_suffix(self, suffix):
+        return [label.decode('utf-8')
+                for label in self._index.labels.tolist()
+                if label.decode('utf-8').endswith(suffix)]
+
+    @with_initialize
+    def print_stats(self):
+        logger.info('Number of nodes: %d' % len(self._index.labels))
+        logger.info('Number of edges: %d' %
+                    len(self._arrays['succ_indices']))
+
+
+def _load_meta(path):
+    meta_path = os.path.join(path, 'ontology.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, 'r') as fh:
+        meta = json.load(fh)
+    if meta.get('format_version') != CompiledOntology.format_version:
+        return None
+    return meta
+
+
+def _replace_folder(src, dst):
+    # Replace the folder dst with the folder src. A folder can't be renamed
+    # onto one that isn't empty so the previous one is moved out of the way
+    # first and removed afterwards.
+    old_path = None
+    if os.path.exists(dst):
+        old_path = '%s.%s.old' % (dst, uuid.uuid4().hex)
+        try:
+            os.rename(dst, old_path)
+        except FileNotFoundError:
+            old_path = None
+    try:
+        os.rename(src, dst)
+    except OSError:
+        # Another process put its compiled ontology in place in the meantime
+        if not os.path.exists(dst):
+            raise
+        logger.info('Keeping the ontology compiled into %s by another '
+                    'process' % dst)
+        shutil.rmtree(src, ignore_errors=True)
+    if old_path is not None:
+        shutil.rmtree(old_path, ignore_errors=True)
+
+
+def _name_key_hash(ns, name):
+    key = ('%s\t%s' % (ns, name)).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(),
+                          'little')
+
+
+def _encode_property(values, mask):
+    """Return the kind and the arrays representing a node property column.
+
+    Properties whose values are all booleans, integers or floats are stored
+    as arrays of the corresponding type, strings with few distinct values are
+    stored as categories, other strings are stored as a UTF-8 encoded blob
+    with offsets, and any other values are stored as JSON strings.
+    """
+    n_nodes = len(mask)
+    value_types = {type(value) for value in values}
+    if value_types == {bool}:
+        kind, dtype = 'bool', bool
+    elif value_types == {int}:
+        kind, dtype = 'int', numpy.int64
+    elif value_types in ({float}, {int, float}):
+        kind, dtype = 'float', numpy.float64
+    else:
+        kind, dtype = None, None
+    if kind:
+        column = numpy.zeros(n_nodes, dtype=dtype)
+        column[mask] = values
+        return kind, {'values': column}, None
+    if value_types == {str}:
+        categories = sorted(set(values))
+        if len(categories) <= 256:
+            codes = {category: idx for idx, category in enumerate(categories)}
+            column = numpy.zeros(n_nodes, dtype=numpy.uint8)
+            column[mask] = [codes[value] for value in values]
+            return 'category', {'values': column}, categories
+        kind, encoded = 'string', [value.encode('utf-8') for value in values]
+    else:
+        kind, encoded = 'json', [json.dumps(value).encode('utf-8')
+                                 for value in values]
+    lengths = numpy.zeros(n_nodes, dtype=numpy.int64)
+    lengths[mask] = [len(value) for value in encoded]
+    offsets = numpy.zeros(n_nodes + 1, dtype=numpy.int64)
+    numpy.cumsum(lengths, out=offsets[1:])
+    data = numpy.frombuffer(b''.join(encoded), dtype=numpy.uint8)
+    return kind, {'data': data, 'offsets': offsets}, None
@@ -3,6 +3,7 @@ import networkx
 import functools
 from collections import deque
 from typing import Optional, Tuple
+from .ontology_index import OntologyIndex
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +37,7 @@ class IndraOntology(networkx.DiGraph):
         self._initialized = False
         self.name_to_grounding = {}
         self.transitive_closure = set()
+        self._index = None
         self._isa_counter = 0
         self._isrel_counter = 0
 
@@ -54,6 +56,10 @@ class IndraOntology(networkx.DiGraph):
 
     @with_initialize
     def _check_path(self, ns1, id1, ns2, id2, edge_types):
+        index_group = self._get_index_group(edge_types)
+        if index_group:
+            return self._index.has_path(self.label(ns1, id1),
+                                        self.label(ns2, id2), index_group)
         try:
             target = (ns2, id2)
             if target in self._transitive_rel(ns1, id1, self.child_rel,
@@ -303,12 +309,62 @@ class IndraOntology(networkx.DiGraph):
 
     @with_initialize
     def descendants_rel(self, ns, id, rel_types):
+        index_group = self._get_index_group(rel_types)
+        if index_group:
+            return [self.get_ns_id(label) for label in
+                    self._index.get_reachable(self.label(ns, id),
+                                              index_group)]
         return self._transitive_rel(ns, id, self.child_rel, rel_types)
 
     @with_initialize
     def ancestors_rel(self, ns, id, rel_types):
+        index_group = self._get_index_group(rel_types, reverse=True)
+        if index_group:
+            return [self.get_ns_id(label) for label in
+                    self._index.get_reachable(self.label(ns, id),
+                                              index_group, reverse=True)]
         return self._transitive_rel(ns, id, self.parent_rel, rel_types)
 
+    def _get_index_group(self, rel_types, reverse=False):
+        # Ontologies unpickled from older caches may not have an index
+        # attribute at all.
+        if getattr(self, '_index', None) is None:
+            return None
+        group = OntologyIndex.get_group(rel_types)
+        if reverse and group not in OntologyIndex.reverse_groups:
+            return None
+        return group
+
+    @with_initialize
+    def build_index(self):
+        """Build and use a compiled index of isa/partof relations.
+
+        Once the index is built, :py:meth:`get_parents`,
+        :py:meth:`get_children`, :py:meth:`isa`, :py:meth:`partof` and
+        :py:meth:`isa_or_partof` are answered using array lookups in the
+        index rather than by traversing the graph. Note that the index
+        reflects the state of the graph at the time it was built and
+        isn't updated if the graph is changed later.
+
+        Returns
+        -------
+        indra.ontology.ontology_index.OntologyIndex
+            The index that was built.
+        """
+        self._index = OntologyIndex.from_ontology(self)
+        return self._index
+
+    def set_index(self, index):
+        """Set a compiled index to be used for isa/partof lookups.
+
+        Parameters
+        ----------
+        index : indra.ontology.ontology_index.OntologyIndex or None
+            A compiled index for this ontology or None to stop using
+            an index.
+        """
+        self._index = index
+
     @with_initialize
     def child_rel(self, ns, id, rel_types):
         source = self.label(ns, id)
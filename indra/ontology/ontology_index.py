@@ -0,0 +1,295 @@
+"""This module implements a compiled index of the transitive isa/partof
+relations of an IndraOntology. Nodes are interned as integers (their rank in
+the sorted list of node labels) and the transitive closures of the relations
+are stored as CSR (compressed sparse row) arrays so that looking up all the
+parents or children of an entity, or checking whether two entities are
+related, become array lookups rather than graph traversals.
+
+The index can be dumped into a folder of .npy files which are memory-mapped
+when loaded, allowing processes to share the same pages through the OS cache.
+"""
+__all__ = ['OntologyIndex']
+
+import os
+import json
+import logging
+import networkx
+import numpy
+
+
+logger = logging.getLogger(__name__)
+
+
+class OntologyIndex:
+    """A compiled index of transitive isa/partof relations in an ontology.
+
+    Parameters
+    ----------
+    labels : numpy.ndarray
+        A sorted byte string array of node labels. The position of each
+        label in this array is the integer ID of the corresponding node.
+    closures : dict
+        A dict of CSR arrays keyed by the name of the closure. Each value is
+        a tuple of two arrays (indptr, indices) such that the nodes reachable
+        from the node with ID i are indices[indptr[i]:indptr[i+1]], sorted.
+    meta : Optional[dict]
+        Metadata about the ontology the index was built from, including
+        its name and version.
+    """
+    # The edge types in each relation group whose closure is indexed
+    rel_groups = {
+        'isa': {'isa'},
+        'partof': {'partof'},
+        'isa_partof': {'isa', 'partof'},
+    }
+    # Closures for which the reverse direction (i.e., graph ancestors) is
+    # also indexed
+    reverse_groups = {'isa_partof'}
+    format_version = 1
+
+    def __init__(self, labels, closures, meta=None):
+        self.labels = labels
+        self.closures = closures
+        self.meta = meta if meta else {}
+
+    @classmethod
+    def from_ontology(cls, ontology):
+        """Return an index built from a given ontology graph.
+
+        Parameters
+        ----------
+        ontology : indra.ontology.IndraOntology
+            An initialized IndraOntology.
+
+        Returns
+        -------
+        OntologyIndex
+            The index of the given ontology.
+        """
+        logger.info('Building ontology index...')
+        labels = numpy.array(sorted(node.encode('utf-8')
+                                    for node in ontology.nodes),
+                             dtype=bytes)
+        node_ids = {label.decode('utf-8'): idx
+                    for idx, label in enumerate(labels)}
+        edges_by_type = {}
+        for source, target, edge_type in ontology.edges(data='type'):
+            edges_by_type.setdefault(edge_type, []).append(
+                (node_ids[source], node_ids[target]))
+        closures = {}
+        for group, edge_types in cls.rel_groups.items():
+            edges = [edge for edge_type in edge_types
+                     for edge in edges_by_type.get(edge_type, [])]
+            indptr, indices = _get_closure_csr(len(labels), edges)
+            closures[group] = (indptr, indices)
+            if group in cls.reverse_groups:
+                closures[group + '_reverse'] = \
+                    _transpose_csr(len(labels), indptr, indices)
+        meta = {'name': ontology.name,
+                'version': ontology.version,
+                'format_version': cls.format_version,
+                'number_of_nodes': len(labels)}
+        logger.info('Finished building ontology index with %d nodes' %
+                    len(labels))
+        return cls(labels, closures, meta)
+
+    def dump(self, path):
+        """Dump the index into a given folder.
+
+        Parameters
+        ----------
+        path : str
+            The path to a folder in which the index is saved. The folder
+            is created if it doesn't exist.
+        """
+        os.makedirs(path, exist_ok=True)
+        numpy.save(os.path.join(path, 'labels.npy'), self.labels)
+        for name, (indptr, indices) in self.closures.items():
+            numpy.save(os.path.join(path, '%s_indptr.npy' % name), indptr)
+            numpy.save(os.path.join(path, '%s_indices.npy' % name), indices)
+        # The metadata is written last so that its presence indicates
+        # a complete index.
+        with open(os.path.join(path, 'meta.json'), 'w') as fh:
+            json.dump(dict(self.meta, closures=sorted(self.closures)), fh)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Return an index loaded from a given folder.
+
+        Parameters
+        ----------
+        path : str
+            The path to a folder in which the index was saved.
+        mmap : Optional[bool]
+            If True, the arrays are memory-mapped rather than read into
+            memory. Default: True
+
+        Returns
+        -------
+        OntologyIndex or None
+            The loaded index or None if there is no complete index with
+            a compatible format in the given folder.
+        """
+        meta_path = os.path.join(path, 'meta.json')
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, 'r') as fh:
+            meta = json.load(fh)
+        if meta.get('format_version') != cls.format_version:
+            return None
+        mmap_mode = 'r' if mmap else None
+        labels = numpy.load(os.path.join(path, 'labels.npy'),
+                            mmap_mode=mmap_mode)
+        closures = {}
+        for name in meta.pop('closures'):
+            closures[name] = (
+                numpy.load(os.path.join(path, '%s_indptr.npy' % name),
+                           mmap_mode=mmap_mode),
+                numpy.load(os.path.join(path, '%s_indices.npy' % name),
+                           mmap_mode=mmap_mode)
+            )
+        return cls(labels, closures, meta)
+
+    def is_compatible(self, ontology):
+        """Return True if the index was built for the given ontology."""
+        return self.meta.get('name') == ontology.name and \
+            self.meta.get('version') == ontology.version
+
+    @classmethod
+    def get_group(cls, rel_types):
+        """Return the name of the indexed group of given relation types.
+
+        Parameters
+        ----------
+        rel_types : iterable of str
+            A set of edge types.
+
+        Returns
+        -------
+        str or None
+            The name of the relation group or None if the given
+            set of relation types isn't indexed.
+        """
+        rel_types = set(rel_types)
+        for group, group_types in cls.rel_groups.items():
+            if rel_types == group_types:
+                return group
+        return None
+
+    def get_node_id(self, label):
+        """Return the integer ID of a node with a given label or None."""
+        key = label.encode('utf-8')
+        idx = int(numpy.searchsorted(self.labels, key))
+        if idx < len(self.labels) and self.labels[idx] == key:
+            return idx
+        return None
+
+    def get_label(self, node_id):
+        """Return the label of a node with a given integer ID."""
+        return self.labels[node_id].decode('utf-8')
+
+    def _get_row(self, closure, node_id):
+        indptr, indices = self.closures[closure]
+        return indices[indptr[node_id]:indptr[node_id + 1]]
+
+    def get_reachable(self, label, group, reverse=False):
+        """Return labels of nodes reachable from a node via a relation group.
+
+        Parameters
+        ----------
+        label : str
+            The label of the source node.
+        group : str
+            The name of the relation group, one of the keys of `rel_groups`.
+        reverse : Optional[bool]
+            If True, edges are traversed in the reverse direction, i.e.,
+            the ancestors rather than descendants of the node in the
+            graph are returned. Default: False
+
+        Returns
+        -------
+        list of str
+            The labels of reachable nodes, not including the source node.
+        """
+        node_id = self.get_node_id(label)
+        if node_id is None:
+            return []
+        closure = group + '_reverse' if reverse else group
+        row = self._get_row(closure, node_id)
+        return [label.decode('utf-8')
+                for label in self.labels[row[row != node_id]].tolist()]
+
+    def has_path(self, label1, label2, group):
+        """Return True if there is a path between two nodes in a relation
+        group.
+
+        Parameters
+        ----------
+        label1 : str
+            The label of the source node.
+        label2 : str
+            The label of the target node.
+        group : str
+            The name of the relation group, one of the keys of `rel_groups`.
+
+        Returns
+        -------
+        bool
+            True if the target node can be reached from the source node
+            via one or more edges in the given relation group.
+        """
+        id1 = self.get_node_id(label1)
+        if id1 is None:
+            return False
+        id2 = self.get_node_id(label2)
+        if id2 is None:
+            return False
+        row = self._get_row(group, id1)
+        idx = numpy.searchsorted(row, id2)
+        return bool(idx < len(row) and row[idx] == id2)
+
+
+def _get_closure_csr(n_nodes, edges):
+    """Return the transitive closure of a set of edges as CSR arrays.
+
+    The closure is computed over the condensation of the graph so that
+    cycles are handled, and each strongly connected component's closure
+    is calculated once from the closures of its successors. A node is
+    part of its own closure only if it is on a cycle.
+    """
+    graph = networkx.DiGraph()
+    graph.add_edges_from(edges)
+    self_loops = {source for source, target in edges if source == target}
+    condensed = networkx.condensation(graph)
+    closures = {}
+    for comp in reversed(list(networkx.topological_sort(condensed))):
+        members = condensed.nodes[comp]['members']
+        reachable = set()
+        for succ in condensed.successors(comp):
+            reachable |= condensed.nodes[succ]['members']
+            reachable |= closures[succ]
+        if len(members) > 1 or (members & self_loops):
+            reachable |= members
+        closures[comp] = reachable
+    counts = numpy.zeros(n_nodes, dtype=numpy.int64)
+    for node, comp in condensed.graph['mapping'].items():
+        counts[node] = len(closures[comp])
+    indptr = numpy.zeros(n_nodes + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=indptr[1:])
+    indices = numpy.empty(indptr[-1], dtype=numpy.int32)
+    for node, comp in condensed.graph['mapping'].items():
+        indices[indptr[node]:indptr[node + 1]] = sorted(closures[comp])
+    return indptr, indices
+
+
+def _transpose_csr(n_nodes, indptr, indices):
+    """Return the transpose of a graph given as CSR arrays."""
+    rows = numpy.repeat(numpy.arange(n_nodes, dtype=numpy.int32),
+                        numpy.diff(indptr))
+    # Sorting by column then row gives sorted rows in the transpose
+    order = numpy.lexsort((rows, indices))
+    rev_indices = rows[order]
+    rev_indptr = numpy.zeros(n_nodes + 1, dtype=numpy.int64)
+    numpy.cumsum(numpy.bincount(indices, minlength=n_nodes),
+                 out=rev_indptr[1:])
+    return rev_indptr, rev_indices
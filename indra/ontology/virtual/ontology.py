@@ -1,3 +1,9 @@
+import os
+import json
+import socket
+import threading
+import http.client
+from collections import OrderedDict
 import requests
 from ..ontology_graph import IndraOntology
 
@@ -7,45 +13,197 @@ class VirtualOntology(IndraOntology):
     all operations. It is particularly useful if the host machine has limited
     resources and keeping the ontology graph in memory is not desirable.
 
+    Responses of the service are cached in a least-recently-used cache, and
+    the transitive closures that :py:meth:`get_parents`,
+    :py:meth:`get_children`, :py:meth:`isa` etc. rely on are requested from
+    the service in a single request rather than by traversing the graph one
+    request per node. The closures of many entities can also be requested in
+    batches using :py:meth:`prefetch`.
+
     Parameters
     ----------
     url : str
-        The base URL of the ontology graph web service.
+        The base URL of the ontology graph web service. If the service
+        listens on a Unix socket on the same machine, the URL is of the form
+        unix:///path/to/socket.
     ontology : Optional[str]
         The identifier of the ontology recognized by the web service.
         Default: bio
+    cache_size : Optional[int]
+        The maximum number of responses of the web service kept in the
+        cache. Default: 100000
+    batch_size : Optional[int]
+        The maximum number of entities whose transitive closures are
+        requested in a single request by :py:meth:`prefetch`. Default: 1000
     """
-    def __init__(self, url, ontology='bio'):
+    def __init__(self, url, ontology='bio', cache_size=100000,
+                 batch_size=1000):
         super().__init__()
         self.url = url
         self.ontology = ontology
+        self.cache_size = cache_size
+        self.batch_size = batch_size
+        self._cache = OrderedDict()
+        self._connections = {}
 
     def initialize(self):
         self._initialized = True
 
     def child_rel(self, ns, id, rel_types):
-        res = _send_request(self.url, 'child_rel',
-                            ns=ns, id=id, rel_types=list(rel_types),
-                            ontology=self.ontology)
+        res = self._send_cached_request('child_rel',
+                                        ns=ns, id=id,
+                                        rel_types=sorted(rel_types))
         yield from (tuple(r) for r in res)
 
     def parent_rel(self, ns, id, rel_types):
-        res = _send_request(self.url, 'parent_rel',
-                            ns=ns, id=id, rel_types=list(rel_types),
-                            ontology=self.ontology)
+        res = self._send_cached_request('parent_rel',
+                                        ns=ns, id=id,
+                                        rel_types=sorted(rel_types))
         yield from (tuple(r) for r in res)
 
+    def descendants_rel(self, ns, id, rel_types):
+        return self._get_transitive_rels('descendants_rel', [(ns, id)],
+                                         rel_types)[0]
+
+    def ancestors_rel(self, ns, id, rel_types):
+        return self._get_transitive_rels('ancestors_rel', [(ns, id)],
+                                         rel_types)[0]
+
+    def _check_path(self, ns1, id1, ns2, id2, edge_types):
+        return (ns2, id2) in self.descendants_rel(ns1, id1, edge_types)
+
     def get_node_property(self, ns, id, property):
-        return _send_request(self.url, 'get_node_property',
-                             ns=ns, id=id, property=property,
-                             ontology=self.ontology)
+        return self._send_cached_request('get_node_property',
+                                         ns=ns, id=id, property=property)
 
     def get_id_from_name(self, ns, name):
-        return _send_request(self.url, 'get_id_from_name',
-                             ns=ns, name=name, ontology=self.ontology)
+        res = self._send_cached_request('get_id_from_name',
+                                        ns=ns, name=name)
+        return tuple(res) if res else None
+
+    def prefetch(self, entities, rel_types=None):
+        """Request and cache the transitive closures of a list of entities.
+
+        This can be used to populate the cache before calling
+        :py:meth:`get_parents` or :py:meth:`get_children` on many entities,
+        e.g., by the preassembler, so that the closures are requested in a
+        few batched requests.
+
+        Parameters
+        ----------
+        entities : iterable of tuple
+            The name space and ID of each entity whose closures are
+            requested.
+        rel_types : Optional[set]
+            The relation types with respect to which the closures are
+            requested. Default: isa and partof
+        """
+        rel_types = rel_types if rel_types else {'isa', 'partof'}
+        entities = list(entities)
+        for method in ('descendants_rel', 'ancestors_rel'):
+            self._get_transitive_rels(method, entities, rel_types)
+
+    def _get_transitive_rels(self, method, entities, rel_types):
+        # Return the transitive closure of each entity, requesting the
+        # closures that aren't cached in batches
+        rel_types = sorted(rel_types)
+        keys = [(method, self.ontology, ns, id, tuple(rel_types))
+                for ns, id in entities]
+        results = [self._cache_get(key) for key in keys]
+        missing = [idx for idx, res in enumerate(results)
+                   if res is _not_cached]
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            res = self._send_request(method, post=True,
+                                     nodes=[entities[idx] for idx in batch],
+                                     rel_types=rel_types,
+                                     ontology=self.ontology)
+            for idx, rels in zip(batch, res):
+                results[idx] = [tuple(r) for r in rels]
+                self._cache_set(keys[idx], results[idx])
+        return [list(res) for res in results]
+
+    def _send_cached_request(self, endpoint, **kwargs):
+        key = (endpoint, self.ontology) + \
+            tuple(tuple(v) if isinstance(v, list) else v
+                  for _, v in sorted(kwargs.items()))
+        res = self._cache_get(key)
+        if res is _not_cached:
+            res = self._send_request(endpoint, ontology=self.ontology,
+                                     **kwargs)
+            self._cache_set(key, res)
+        return res
+
+    def _cache_get(self, key):
+        res = self._cache.get(key, _not_cached)
+        if res is not _not_cached:
+            try:
+                self._cache.move_to_end(key)
+            # The entry may have been evicted by another thread
+            except KeyError:
+                pass
+        return res
+
+    def _cache_set(self, key, res):
+        if not self.cache_size:
+            return
+        self._cache[key] = res
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _send_request(self, endpoint, post=False, **kwargs):
+        if not self.url.startswith('unix://'):
+            url = '%s/%s' % (self.url, endpoint)
+            method = requests.post if post else requests.get
+            res = method(url, json=kwargs)
+            return res.json()
+        # Connections can't be shared by processes, e.g., forked workers,
+        # or threads, so each of these opens its own connection which is
+        # then kept alive
+        conn_key = (os.getpid(), threading.get_ident())
+        connection = self._connections.get(conn_key)
+        if connection is None:
+            connection = _UnixHTTPConnection(self.url[len('unix://'):])
+            self._connections[conn_key] = connection
+        try:
+            res = _send_http_request(connection, endpoint, post, kwargs)
+        except (http.client.CannotSendRequest, ConnectionError):
+            # The service may have closed the connection kept alive so we
+            # try again on a new connection
+            connection.close()
+            res = _send_http_request(connection, endpoint, post, kwargs)
+        if res.status != 200:
+            raise http.client.HTTPException(
+                'The ontology service returned status %d for %s: %s' %
+                (res.status, endpoint, res.content[:200]))
+        return json.loads(res.content)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_connections'] = {}
+        return state
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    # An HTTP connection to a service listening on a Unix socket
+    def __init__(self, path):
+        super().__init__('localhost')
+        self.path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.path)
+
+
+def _send_http_request(connection, endpoint, post, kwargs):
+    connection.request('POST' if post else 'GET', '/%s' % endpoint,
+                       body=json.dumps(kwargs),
+                       headers={'Content-Type': 'application/json'})
+    res = connection.getresponse()
+    # The response has to be read fully before the connection can be reused
+    res.content = res.read()
+    return res
 
 
-def _send_request(base_url, endpoint, **kwargs):
-    url = '%s/%s' % (base_url, endpoint)
-    res = requests.get(url, json=kwargs)
-    return res.json()
+# Marks that a response isn't cached, as opposed to a cached None response
+_not_cached = object()
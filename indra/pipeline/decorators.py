@@ -1,15 +1,176 @@
-pipeline_functions = {}
+import os
+import ast
+import importlib
+
+
+# The modules defining the functions registered for the assembly pipeline
+# within INDRA. They are imported upon the first lookup of a function that
+# they define rather than when the pipeline is imported or instantiated, see
+# _PipelineFunctions.
+pipeline_modules = [
+    'indra.tools.assemble_corpus',
+    'indra.preassembler.custom_preassembly',
+    'indra.preassembler.grounding_mapper.gilda',
+]
+
+
+class _PipelineFunctions(dict):
+    # A dict of registered functions keyed by name which imports the modules
+    # in pipeline_modules that may define a function when it is looked up
+    # but isn't registered yet, and all of them when the registry is iterated
+    # over. Which functions a module defines is found from its source so
+    # that looking up other names doesn't import any modules.
+    def __init__(self):
+        super().__init__()
+        self._modules_to_load = list(pipeline_modules)
+        self._module_functions = {}
+
+    def _load_next_module(self):
+        if not self._modules_to_load:
+            return False
+        importlib.import_module(self._modules_to_load.pop(0))
+        return True
+
+    def _load_all_modules(self):
+        while self._load_next_module():
+            pass
+
+    def _may_define(self, module_name, key):
+        if module_name not in self._module_functions:
+            self._module_functions[module_name] = \
+                _get_decorated_functions(module_name)
+        names = self._module_functions[module_name]
+        return names is None or key in names
+
+    def _find_registration(self, key, module_name=None):
+        # Return the module with which a function is or will be registered,
+        # or None if it isn't registered. Only the modules that may define
+        # the function are imported, and the one being registered from is
+        # skipped since it is being imported.
+        if dict.__contains__(self, key):
+            return dict.__getitem__(self, key).__module__
+        for lazy_module in list(self._modules_to_load):
+            if lazy_module == module_name or \
+                    not self._may_define(lazy_module, key):
+                continue
+            if self._module_functions[lazy_module] is not None:
+                return lazy_module
+            self._modules_to_load.remove(lazy_module)
+            importlib.import_module(lazy_module)
+            if dict.__contains__(self, key):
+                return dict.__getitem__(self, key).__module__
+        return None
+
+    def __missing__(self, key):
+        for module_name in list(self._modules_to_load):
+            if not self._may_define(module_name, key):
+                continue
+            self._modules_to_load.remove(module_name)
+            importlib.import_module(module_name)
+            if dict.__contains__(self, key):
+                return dict.__getitem__(self, key)
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def __iter__(self):
+        self._load_all_modules()
+        return super().__iter__()
+
+    def __len__(self):
+        self._load_all_modules()
+        return super().__len__()
+
+    def keys(self):
+        self._load_all_modules()
+        return super().keys()
+
+    def values(self):
+        self._load_all_modules()
+        return super().values()
+
+    def items(self):
+        self._load_all_modules()
+        return super().items()
+
+
+pipeline_functions = _PipelineFunctions()
 
 
 def register_pipeline(function):
-    """Decorator to register a function for the assembly pipeline."""
-    if function.__name__ in pipeline_functions:
+    """Decorator to register a function for the assembly pipeline.
+
+    Functions are checked against the ones registered so far as well as the
+    ones that the modules in pipeline_modules register once they are
+    imported. The latter are found from the source of the modules, where
+    they have to be registered by decorating functions defined at the top
+    level of the module with register_pipeline, possibly imported under
+    another name or used as an attribute of a module (e.g.,
+    @pipeline.register_pipeline). Modules registering functions in any
+    other way are imported to check for a name collision.
+    """
+    module_name = pipeline_functions._find_registration(
+        function.__name__, function.__module__)
+    if module_name is not None:
         raise ExistingFunctionError(
             '%s is already registered with %s.%s' % (
-                function.__name__, function.__module__, function.__name__))
+                function.__name__, module_name, function.__name__))
     pipeline_functions[function.__name__] = function
     return function
 
 
 class ExistingFunctionError(Exception):
     pass
+
+
+def _get_decorated_functions(module_name):
+    # Return the names of the functions decorated with register_pipeline in
+    # a module of INDRA, or None if its source isn't available
+    parts = module_name.split('.')
+    fname = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                         *parts[1:]) + '.py'
+    if parts[0] != 'indra' or not os.path.exists(fname):
+        return None
+    with open(fname, 'r') as fh:
+        return _find_decorated_functions(fh.read())
+
+
+def _find_decorated_functions(source):
+    # Return the names of the top-level functions decorated with
+    # register_pipeline in the source of a module, or None if it may
+    # register functions in other ways
+    tree = ast.parse(source)
+    aliases = {'register_pipeline'}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ImportFrom):
+            aliases |= {alias.asname for alias in node.names
+                        if alias.name == 'register_pipeline' and alias.asname}
+    names = set()
+    decorators = set()
+    for node in tree.body:
+        if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        for dec in node.decorator_list:
+            if (isinstance(dec, ast.Name) and dec.id in aliases) or \
+                    (isinstance(dec, ast.Attribute) and
+                     dec.attr == 'register_pipeline'):
+                names.add(node.name)
+                decorators.add(dec)
+    # Any other use, e.g., calling it directly or assigning it to another
+    # name, could register functions that aren't found here
+    for node in ast.walk(tree):
+        if node in decorators:
+            continue
+        if (isinstance(node, ast.Name) and node.id in aliases) or \
+                (isinstance(node, ast.Attribute) and
+                 node.attr == 'register_pipeline'):
+            return None
+    return names
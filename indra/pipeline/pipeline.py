@@ -84,12 +84,8 @@ class AssemblyPipeline():
         <name of a statement type>}.
     """
     def __init__(self, steps=None):
-        # This import is here to avoid circular imports
-        # It is enough to import one function to get all registered functions
-        from indra.tools.assemble_corpus import filter_grounded_only
-        from indra.ontology.bio import bio_ontology
-        from indra.preassembler.grounding_mapper.gilda import ground_statements
-        from indra.preassembler.custom_preassembly import agent_grounding_matches
+        # The modules defining the registered functions are imported upon
+        # the first lookup of a function, see pipeline_functions
         self.steps = steps if steps else []
 
     @classmethod
@@ -424,7 +420,11 @@ def jsonify_arg_input(arg):
         if func_name not in pipeline_functions:
             register_pipeline(arg)
         return {'function': func_name, 'no_run': True}
-    if isinstance(arg, str) and arg in pipeline_functions:
+    # Registered names are checked first so that the lookup, which may
+    # import the modules defining pipeline functions, is only done for
+    # strings that aren't registered
+    if isinstance(arg, str) and (dict.__contains__(pipeline_functions, arg)
+                                 or arg in pipeline_functions):
         return {'function': arg, 'no_run': True}
     # For some functions Statement type has to be argument
     if inspect.isclass(arg) and issubclass(arg, Statement):
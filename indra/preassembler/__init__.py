@@ -1,9 +1,14 @@
+import os
 import time
 import tqdm
+import pickle
+import shutil
 import logging
+import tempfile
 import itertools
 import functools
 import collections
+import multiprocessing
 import networkx as nx
 from indra.util import fast_deepcopy
 from indra.statements import *
@@ -79,6 +84,86 @@ class Preassembler(object):
             self.unique_stmts = self.combine_duplicate_stmts(self.stmts)
         return self.unique_stmts
 
+    def combine_duplicates_streaming(self, stmts, n_partitions=None,
+                                     tmp_dir=None, buffer_size=None):
+        """Combine duplicates in a stream of statements out of core.
+
+        Rather than keeping all the statements in memory, statements are
+        partitioned by their matches hash into spill files in a temporary
+        folder. Since duplicates always end up in the same partition,
+        each partition can then be loaded and deduplicated separately using
+        :py:meth:`combine_duplicate_stmts`, so at most one partition is kept
+        in memory at a time. The unique statements are the same as the ones
+        obtained by combining duplicates in memory, however, they are
+        yielded partition by partition and :py:attr:`unique_stmts` isn't set.
+
+        Parameters
+        ----------
+        stmts : iterable[indra.statements.Statement]
+            An iterable (e.g., a generator reading statements from files)
+            of statements to combine duplicates among. The statements
+            aren't modified.
+        n_partitions : Optional[int]
+            The number of partitions to split statements into. This should
+            be set such that each partition fits in memory. Default: 64
+        tmp_dir : Optional[str]
+            A folder in which a temporary folder is created for the spill
+            files. If None, the system's default temporary folder is used.
+            The temporary folder is removed once all unique statements were
+            yielded. Default: None
+        buffer_size : Optional[int]
+            The number of statements per partition that are kept in memory
+            before they are written to the partition's spill file.
+            Default: 100
+
+        Returns
+        -------
+        generator[indra.statements.Statement]
+            A generator of unique statements with accumulated evidence
+            across duplicates.
+        """
+        n_partitions = n_partitions if n_partitions else 64
+        buffer_size = buffer_size if buffer_size else 100
+        spill_dir = tempfile.mkdtemp(prefix='indra_dedup_', dir=tmp_dir)
+        try:
+            spill_fnames = [os.path.join(spill_dir, 'partition_%d.pkl' % idx)
+                            for idx in range(n_partitions)]
+            buffers = [[] for _ in range(n_partitions)]
+
+            def _spill(idx):
+                with open(spill_fnames[idx], 'ab') as fh:
+                    pickle.dump(buffers[idx], fh, protocol=4)
+                buffers[idx] = []
+
+            n_stmts = 0
+            for stmt in stmts:
+                idx = stmt.get_hash(matches_fun=self.matches_fun) % \
+                    n_partitions
+                buffers[idx].append(stmt)
+                n_stmts += 1
+                if len(buffers[idx]) >= buffer_size:
+                    _spill(idx)
+            for idx in range(n_partitions):
+                if buffers[idx]:
+                    _spill(idx)
+            logger.info('Partitioned %d statements into %d spill files' %
+                        (n_stmts, n_partitions))
+
+            for fname in spill_fnames:
+                if not os.path.exists(fname):
+                    continue
+                partition_stmts = []
+                with open(fname, 'rb') as fh:
+                    while True:
+                        try:
+                            partition_stmts += pickle.load(fh)
+                        except EOFError:
+                            break
+                os.remove(fname)
+                yield from self.combine_duplicate_stmts(partition_stmts)
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
     def _get_stmt_matching_groups(self, stmts):
         """Use the matches_fun method to get sets of matching statements."""
         # Remove exact duplicates using a set() call, then make copies:
@@ -155,30 +240,7 @@ class Preassembler(object):
                     new_stmt = stmt.make_generic_copy()
                 if len(duplicates) == 1:
                     new_stmt.uuid = stmt.uuid
-                raw_text = [None if ag is None else ag.db_refs.get('TEXT')
-                            for ag in stmt.agent_list(deep_sorted=True)]
-                raw_grounding = [None if ag is None else ag.db_refs
-                                 for ag in stmt.agent_list(deep_sorted=True)]
-                for ev in stmt.evidence:
-                    ev_key = ev.matches_key() + str(raw_text) + \
-                        str(raw_grounding)
-                    if ev_key not in ev_keys:
-                        # In case there are already agents annotations, we
-                        # just add a new key for raw_text, otherwise create
-                        # a new key
-                        if 'agents' in ev.annotations:
-                            ev.annotations['agents']['raw_text'] = raw_text
-                            ev.annotations['agents']['raw_grounding'] = \
-                                raw_grounding
-                        else:
-                            ev.annotations['agents'] = \
-                                {'raw_text': raw_text,
-                                 'raw_grounding': raw_grounding}
-                        if 'prior_uuids' not in ev.annotations:
-                            ev.annotations['prior_uuids'] = []
-                        ev.annotations['prior_uuids'].append(stmt.uuid)
-                        new_stmt.evidence.append(ev)
-                        ev_keys.add(ev_key)
+                merge_duplicate_evidence(new_stmt, stmt, ev_keys)
             end_ev_keys = _ev_keys([new_stmt])
             if len(end_ev_keys) != len(start_ev_keys):
                 logger.debug('%d redundant evidences eliminated.' %
@@ -194,9 +256,8 @@ class Preassembler(object):
                               matches_fun=self.matches_fun)
         return unique_stmts
 
-    # Note that the kwargs here are just there for backwards compatibility
-    # with old code that uses arguments related to multiprocessing.
-    def combine_related(self, return_toplevel=True, filters=None, **kwargs):
+    def combine_related(self, return_toplevel=True, filters=None,
+                        poolsize=None, size_cutoff=None, **kwargs):
         """Connect related statements based on their refinement relationships.
 
         This function takes as a starting point the unique statements (with
@@ -259,6 +320,14 @@ class Preassembler(object):
             :py:class:`indra.preassembler.refinement.OntologyRefinementFilter`
             isn't appended by default, and should be added by the user, if
             necessary. Default: None
+        poolsize : Optional[int]
+            The number of worker processes to use for finding refinements.
+            If None (default) or 1, refinements are found in the parent
+            process. See :py:meth:`_generate_relations` for details.
+        size_cutoff : Optional[int]
+            The minimum number of unique statements for which worker
+            processes are used when poolsize is set; smaller sets of
+            statements are compared in the parent process. Default: 100
 
         Returns
         -------
@@ -302,7 +371,9 @@ class Preassembler(object):
 
         # Generate the index map, linking related statements.
         idx_map = self._generate_id_maps(unique_stmts,
-                                         filters=filters)
+                                         filters=filters,
+                                         poolsize=poolsize,
+                                         size_cutoff=size_cutoff)
 
         # Now iterate over all indices and set supports/supported by
         for ix1, ix2 in idx_map:
@@ -317,19 +388,32 @@ class Preassembler(object):
             return unique_stmts
 
     def _generate_relation_tuples(self, unique_stmts, split_idx=None,
-                                  filters=None):
+                                  filters=None, poolsize=None,
+                                  size_cutoff=None):
         """Return refinement relations as a set of statement hash tuples."""
         relations = self._generate_relations(unique_stmts=unique_stmts,
                                              split_idx=split_idx,
-                                             filters=filters)
+                                             filters=filters,
+                                             poolsize=poolsize,
+                                             size_cutoff=size_cutoff)
         relation_tuples = set()
         for refiner, refineds in relations.items():
             relation_tuples |= {(refiner, refined) for refined in refineds}
         return relation_tuples
 
     def _generate_relations(self, unique_stmts, split_idx=None,
-                            filters=None):
-        """Return refinement relations as a dict using statement hashes."""
+                            filters=None, poolsize=None, size_cutoff=None):
+        """Return refinement relations as a dict using statement hashes.
+
+        If poolsize is larger than 1 and there are at least size_cutoff
+        unique statements, the statements are sharded and refinements
+        are found for each shard in a pool of worker processes. The
+        filters are initialized once in the parent process and are
+        inherited by the workers when they are forked (or sent once to
+        each worker where forking is not available) so that only statement
+        hashes and relations are transferred per task. The relations found
+        this way are identical to the ones found in the parent process.
+        """
         ts = time.time()
         # Statements keyed by their hashes
         stmts_by_hash = {stmt.get_hash(matches_fun=self.matches_fun):
@@ -357,8 +441,10 @@ class Preassembler(object):
                                          refinement_fun=self.refinement_fun)
         filters.append(confirm_filter)
 
-        # Initialize all filters
+        # Initialize all filters, making sure that they hash statements
+        # the same way as the statements are keyed here
         for filt in filters:
+            filt.matches_fun = self.matches_fun
             filt.initialize(stmts_by_hash=stmts_by_hash)
 
         # This is the core of refinement finding. Here we apply filter functions
@@ -366,12 +452,23 @@ class Preassembler(object):
         # Since the actual comparison which evaluates the refinement_fun on
         # potentially related statements is the last filter, we don't need to
         # do any further operations after this loop.
-        relations = {}
-        for stmt_hash, stmt in tqdm.tqdm(stmts_by_hash.items(),
-                                         desc='Finding refinement relations'):
-            rels = find_refinements_for_statement(stmt, filters)
-            if rels:
-                relations[stmt_hash] = rels
+        size_cutoff = size_cutoff if size_cutoff else 100
+        if poolsize and poolsize > 1 and len(stmts_by_hash) >= size_cutoff:
+            # Workers only see the ontology through the filters so we make
+            # sure it is fully loaded before it is shared with them.
+            if not getattr(self.ontology, '_initialized', True):
+                self.ontology.initialize()
+            relations, comparisons = \
+                _find_refinements_parallel(stmts_by_hash, filters, poolsize)
+            confirm_filter.comparison_counter += comparisons
+        else:
+            relations = {}
+            for stmt_hash, stmt in tqdm.tqdm(
+                    stmts_by_hash.items(),
+                    desc='Finding refinement relations'):
+                rels = find_refinements_for_statement(stmt, filters)
+                if rels:
+                    relations[stmt_hash] = rels
 
         te = time.time()
         logger.info('Found %d refinements in %.2fs' %
@@ -383,7 +480,8 @@ class Preassembler(object):
     # Note that the kwargs here are just there for backwards compatibility
     # with old code that uses arguments related to multiprocessing.
     def _generate_id_maps(self, unique_stmts, split_idx=None,
-                          filters=None, **kwargs):
+                          filters=None, poolsize=None, size_cutoff=None,
+                          **kwargs):
         """Return pairs of statement indices representing refinement relations.
 
         Parameters
@@ -405,6 +503,13 @@ class Preassembler(object):
             :py:class:`indra.preassembler.refinement.OntologyRefinementFilter`
             isn't appended by default, and should be added by the user, if
             necessary. Default: None
+        poolsize : Optional[int]
+            The number of worker processes to use for finding refinements.
+            If None (default) or 1, refinements are found in the parent
+            process.
+        size_cutoff : Optional[int]
+            The minimum number of unique statements for which worker
+            processes are used when poolsize is set. Default: 100
 
         Returns
         -------
@@ -427,7 +532,9 @@ class Preassembler(object):
         relation_tuples = \
             self._generate_relation_tuples(unique_stmts,
                                            split_idx=split_idx,
-                                           filters=filters)
+                                           filters=filters,
+                                           poolsize=poolsize,
+                                           size_cutoff=size_cutoff)
         idx_maps = [(stmt_to_idx[refiner], stmt_to_idx[refined])
                     for refiner, refined in relation_tuples]
         return idx_maps
@@ -570,6 +677,47 @@ class Preassembler(object):
         self._normalize_relations(ns, rank_key, rel_fun, True)
 
 
+def merge_duplicate_evidence(new_stmt, stmt, ev_keys):
+    """Add the evidences of a duplicate statement to a unique statement.
+
+    Evidences are annotated with the raw text and grounding of the agents
+    of the statement they came from, and with the statement's UUID. An
+    evidence is only added if its key isn't already in the given set of
+    evidence keys.
+
+    Parameters
+    ----------
+    new_stmt : indra.statements.Statement
+        The unique statement to which evidences are added.
+    stmt : indra.statements.Statement
+        A statement which is a duplicate of new_stmt.
+    ev_keys : set of str
+        The keys of the evidences already added to new_stmt. This set is
+        updated with the keys of the added evidences.
+    """
+    raw_text = [None if ag is None else ag.db_refs.get('TEXT')
+                for ag in stmt.agent_list(deep_sorted=True)]
+    raw_grounding = [None if ag is None else ag.db_refs
+                     for ag in stmt.agent_list(deep_sorted=True)]
+    for ev in stmt.evidence:
+        ev_key = ev.matches_key() + str(raw_text) + str(raw_grounding)
+        if ev_key not in ev_keys:
+            # In case there are already agents annotations, we
+            # just add a new key for raw_text, otherwise create
+            # a new key
+            if 'agents' in ev.annotations:
+                ev.annotations['agents']['raw_text'] = raw_text
+                ev.annotations['agents']['raw_grounding'] = raw_grounding
+            else:
+                ev.annotations['agents'] = {'raw_text': raw_text,
+                                            'raw_grounding': raw_grounding}
+            if 'prior_uuids' not in ev.annotations:
+                ev.annotations['prior_uuids'] = []
+            ev.annotations['prior_uuids'].append(stmt.uuid)
+            new_stmt.evidence.append(ev)
+            ev_keys.add(ev_key)
+
+
 def find_refinements_for_statement(stmt, filters):
     """Return refinements for a single statement given initialized filters.
 
@@ -602,6 +750,90 @@ def find_refinements_for_statement(stmt, filters):
     return relations
 
 
+# Initialized refinement filters used by worker processes, set either by
+# inheritance from the parent process when forking, or by
+# _init_refinement_worker.
+_worker_filters = None
+
+
+def _init_refinement_worker(filters):
+    global _worker_filters
+    _worker_filters = filters
+
+
+def _find_refinements_for_shard(stmt_hashes):
+    """Return refinements and the number of comparisons for a shard."""
+    # The last filter is always the RefinementConfirmationFilter
+    confirm_filter = _worker_filters[-1]
+    stmts_by_hash = confirm_filter.shared_data['stmts_by_hash']
+    start_count = confirm_filter.comparison_counter
+    relations = {}
+    for stmt_hash in stmt_hashes:
+        rels = find_refinements_for_statement(stmts_by_hash[stmt_hash],
+                                              _worker_filters)
+        if rels:
+            relations[stmt_hash] = rels
+    return relations, confirm_filter.comparison_counter - start_count
+
+
+def _find_refinements_parallel(stmts_by_hash, filters, poolsize):
+    """Return refinements found in a pool of worker processes.
+
+    Parameters
+    ----------
+    stmts_by_hash : dict[int, indra.statements.Statement]
+        A dict of statements keyed by their hashes.
+    filters : list[:py:class:`indra.preassembler.refinement.RefinementFilter`]
+        A list of refinement filter instances that have been initialized
+        with stmts_by_hash.
+    poolsize : int
+        The number of worker processes to use.
+
+    Returns
+    -------
+    dict
+        A dict of refinement relations keyed by statement hash, in the same
+        order as they would be found sequentially.
+    int
+        The total number of comparisons made across all workers.
+    """
+    global _worker_filters
+    stmt_hashes = list(stmts_by_hash)
+    # We use several shards per worker and interleave statements across
+    # shards so that shards are balanced across statement types.
+    n_shards = min(len(stmt_hashes), poolsize * 4)
+    shards = [stmt_hashes[idx::n_shards] for idx in range(n_shards)]
+    # If possible, we fork workers after setting the filters at the module
+    # level so that they are shared with the workers without pickling.
+    # Otherwise, the filters are sent to each worker once upon start-up.
+    if 'fork' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('fork')
+        _worker_filters = filters
+        pool_kwargs = {}
+    else:
+        ctx = multiprocessing.get_context()
+        pool_kwargs = {'initializer': _init_refinement_worker,
+                       'initargs': (filters,)}
+    logger.info('Finding refinements for %d statements in %d shards using '
+                '%d processes' % (len(stmt_hashes), n_shards, poolsize))
+    found_relations = {}
+    comparisons = 0
+    try:
+        with ctx.Pool(poolsize, **pool_kwargs) as pool:
+            for shard_relations, shard_comparisons in tqdm.tqdm(
+                    pool.imap_unordered(_find_refinements_for_shard, shards),
+                    total=n_shards, desc='Finding refinement relations'):
+                found_relations.update(shard_relations)
+                comparisons += shard_comparisons
+    finally:
+        _worker_filters = None
+    # We restore the order in which relations would be found sequentially
+    relations = {stmt_hash: found_relations[stmt_hash]
+                 for stmt_hash in stmt_hashes
+                 if stmt_hash in found_relations}
+    return relations, comparisons
+
+
 def render_stmt_graph(statements, reduce=True, english=False, rankdir=None,
                       agent_style=None):
     """Render the statement hierarchy as a pygraphviz graph.
@@ -1,9 +1,12 @@
 """This module implements a client to the Gilda grounding web service,
 and contains functions to help apply it during the course of INDRA assembly."""
 
+import os
 import logging
 import requests
+import multiprocessing
 from copy import deepcopy
+from collections import OrderedDict
 from typing import Any, Callable, List, Mapping, Optional, Tuple
 from urllib.parse import urljoin
 from indra.ontology.standardize \
@@ -17,6 +20,14 @@ logger = logging.getLogger(__name__)
 grounding_service_url = get_config('GILDA_URL', failure_ok=True) \
     if has_config('GILDA_URL') else 'http://grounding.indra.bio/'
 
+# The maximum number of groundings, keyed by text and context, that are
+# kept in memory so that the same text isn't grounded repeatedly
+grounding_cache_size = 100000
+_grounding_cache = OrderedDict()
+# The session through which requests are sent to the web service in the
+# current process
+_session = None
+
 
 def get_grounding(
     txt: str,
@@ -44,20 +55,151 @@ def get_grounding(
     list
         The list of ScoredMatches
     """
-    grounding = {}
-    if mode == 'web':
-        resp = requests.post(urljoin(grounding_service_url, 'ground'),
-                             json={'text': txt, 'context': context})
-        results = resp.json()
-        if results:
-            grounding = {results[0]['term']['db']: results[0]['term']['id']}
+    return get_groundings([(txt, context)], mode=mode)[0]
+
+
+def get_groundings(
+    texts_contexts: List[Tuple[str, Optional[str]]],
+    mode: Optional[str] = 'web',
+    batch_size: int = 100,
+    poolsize: Optional[int] = None,
+) -> List[Tuple[Mapping[str, Any], List[Any]]]:
+    """Return the top Gilda grounding for each of a list of texts.
+
+    Each distinct text and context pair is only grounded once and the
+    groundings are cached for subsequent calls. With the web service, the
+    pairs that aren't cached are sent in batches to its ground_multi
+    endpoint.
+
+    Parameters
+    ----------
+    texts_contexts : list[tuple]
+        A list of texts to ground, each given with its context, which can
+        be None.
+    mode : Optional[str]
+        If 'web', the web service given in the GILDA_URL config setting or
+        environmental variable is used. Otherwise, the gilda package is
+        attempted to be imported and used. Default: web
+    batch_size : Optional[int]
+        The number of texts sent to the web service in a single request.
+        Default: 100
+    poolsize : Optional[int]
+        If the gilda package is used, the number of worker processes in
+        which texts are grounded. If not given or 1, texts are grounded in
+        the current process. Default: None
+
+    Returns
+    -------
+    list[tuple]
+        For each given text, a dict with the top grounding returned from
+        Gilda, or an empty dict if no grounding was found, and the list of
+        ScoredMatches.
+    """
+    groundings = _get_groundings(texts_contexts, mode=mode,
+                                 batch_size=batch_size, poolsize=poolsize)
+    # Each caller gets its own copy of the groundings since the results
+    # can end up in Statement annotations
+    return [deepcopy(grounding) for grounding in groundings]
+
+
+def _get_groundings(texts_contexts, mode='web', batch_size=100,
+                    poolsize=None):
+    # Return the groundings for each text and context pair, sharing the
+    # cached objects among repeated pairs
+    url = grounding_service_url if mode == 'web' else None
+    keys = [(mode, url, txt, context) for txt, context in texts_contexts]
+    groundings = {}
+    for key in keys:
+        if key not in groundings:
+            grounding = _grounding_cache.get(key)
+            if grounding is not None:
+                try:
+                    _grounding_cache.move_to_end(key)
+                # The entry may have been evicted by another thread
+                except KeyError:
+                    pass
+                groundings[key] = grounding
+    missing = [key for key in OrderedDict.fromkeys(keys)
+               if key not in groundings]
+    if missing:
+        pairs = [(txt, context) for _, _, txt, context in missing]
+        if mode == 'web':
+            all_results = _ground_web(pairs, batch_size)
+        else:
+            all_results = _ground_local(pairs, poolsize)
+        for key, results in zip(missing, all_results):
+            groundings[key] = (_get_top_grounding(results), results)
+            if grounding_cache_size:
+                _grounding_cache[key] = groundings[key]
+                if len(_grounding_cache) > grounding_cache_size:
+                    _grounding_cache.popitem(last=False)
+    return [groundings[key] for key in keys]
+
+
+def _get_top_grounding(results):
+    if not results:
+        return {}
+    return {results[0]['term']['db']: results[0]['term']['id']}
+
+
+def _get_session():
+    # Sessions can't be shared by processes, e.g., forked workers, so each
+    # process starts its own
+    global _session
+    if _session is None or _session[0] != os.getpid():
+        _session = (os.getpid(), requests.Session())
+    return _session[1]
+
+
+def _ground_web(pairs, batch_size):
+    # Return the Gilda results for each text and context pair using the
+    # web service
+    session = _get_session()
+    all_results = []
+    for start in range(0, len(pairs), batch_size):
+        batch = pairs[start:start + batch_size]
+        if len(batch) == 1:
+            txt, context = batch[0]
+            resp = session.post(urljoin(grounding_service_url, 'ground'),
+                                json={'text': txt, 'context': context})
+            all_results.append(resp.json())
+        else:
+            resp = session.post(
+                urljoin(grounding_service_url, 'ground_multi'),
+                json=[{'text': txt, 'context': context}
+                      for txt, context in batch])
+            resp.raise_for_status()
+            all_results += resp.json()
+    return all_results
+
+
+def _ground_local(pairs, poolsize):
+    # Return the Gilda results for each text and context pair using the
+    # gilda package
+    if not poolsize or poolsize <= 1 or len(pairs) <= 1:
+        return _ground_local_chunk(pairs)
+    # Grounding once before forking the workers loads the grounding
+    # resources so that they are shared with the workers
+    _ground_local_chunk(pairs[:1])
+    if 'fork' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('fork')
     else:
-        from gilda import ground
-        results = ground(txt, context)
-        if results:
-            grounding = {results[0].term.db: results[0].term.id}
-            results = [sm.to_json() for sm in results]
-    return grounding, results
+        ctx = multiprocessing.get_context()
+    n_chunks = min(len(pairs), poolsize * 4)
+    chunk_size = -(-len(pairs) // n_chunks)
+    chunks = [pairs[idx:idx + chunk_size]
+              for idx in range(0, len(pairs), chunk_size)]
+    all_results = []
+    with ctx.Pool(poolsize) as pool:
+        for chunk_results in pool.imap(_ground_local_chunk, chunks):
+            all_results += chunk_results
+    return all_results
+
+
+def _ground_local_chunk(pairs):
+    from gilda import ground
+    return [[sm.to_json() for sm in ground(txt, context)]
+            for txt, context in pairs]
 
 
 def get_gilda_models(mode='web'):
@@ -104,12 +246,16 @@ def ground_agent(agent, txt, context=None, mode='web'):
         attempted to be imported and used. Default: web
     """
     gr, results = get_grounding(txt, context, mode)
+    _set_agent_grounding(agent, txt, gr)
+    return results
+
+
+def _set_agent_grounding(agent, txt, gr):
     if gr:
         db_refs = {'TEXT': txt}
         db_refs.update(gr)
         agent.db_refs = db_refs
         standardize_agent_name(agent, standardize_refs=True)
-    return results
 
 
 def ground_statement(stmt, mode='web', ungrounded_only=False):
@@ -129,20 +275,33 @@ def ground_statement(stmt, mode='web', ungrounded_only=False):
         If True, only ungrounded Agents will be grounded, and ones that
         are already grounded will not be modified. Default: False
     """
+    agents_to_ground = _get_agents_to_ground(stmt, ungrounded_only)
+    groundings = _get_groundings([(txt, context) for _, txt, context
+                                  in agents_to_ground], mode=mode)
+    for (agent, txt, _), (gr, _) in zip(agents_to_ground, groundings):
+        _set_agent_grounding(agent, txt, gr)
+
+
+def _get_agents_to_ground(stmt, ungrounded_only):
+    # Return each Agent of the Statement to be grounded along with its text
+    # and context
     if stmt.evidence and stmt.evidence[0].text:
         context = stmt.evidence[0].text
     else:
         context = None
+    agents_to_ground = []
     for agent in stmt.agent_list():
         if agent is not None and 'TEXT' in agent.db_refs:
             txt = agent.db_refs['TEXT']
             gr = agent.get_grounding()
             if not ungrounded_only or gr[0] is None:
-                ground_agent(agent, txt, context, mode=mode)
+                agents_to_ground.append((agent, txt, context))
+    return agents_to_ground
 
 
 @register_pipeline
-def ground_statements(stmts, mode='web', sources=None, ungrounded_only=False):
+def ground_statements(stmts, mode='web', sources=None, ungrounded_only=False,
+                      poolsize=None):
     """Set grounding for Agents in a list of Statements using Gilda.
 
     This function modifies the original Statements/Agents in place.
@@ -163,6 +322,10 @@ def ground_statements(stmts, mode='web', sources=None, ungrounded_only=False):
     ungrounded_only : Optional[str]
         If True, only ungrounded Agents will be grounded, and ones that
         are already grounded will not be modified. Default: False
+    poolsize : Optional[int]
+        If the gilda package is used, the number of worker processes in
+        which texts are grounded. If not given or 1, texts are grounded in
+        the current process. Default: None
 
     Returns
     -------
@@ -171,8 +334,16 @@ def ground_statements(stmts, mode='web', sources=None, ungrounded_only=False):
     """
     source_filter = set(sources) if sources else set()
     grounded_stmts = deepcopy(stmts)
+    # The agents of all Statements are grounded together so that each
+    # distinct text and context is grounded once, in batches
+    agents_to_ground = []
     for stmt in grounded_stmts:
         if not source_filter or (stmt.evidence and stmt.evidence[0].source_api
                                  in source_filter):
-            ground_statement(stmt, mode=mode, ungrounded_only=ungrounded_only)
+            agents_to_ground += _get_agents_to_ground(stmt, ungrounded_only)
+    groundings = _get_groundings([(txt, context) for _, txt, context
+                                  in agents_to_ground], mode=mode,
+                                 poolsize=poolsize)
+    for (agent, txt, _), (gr, _) in zip(agents_to_ground, groundings):
+        _set_agent_grounding(agent, txt, gr)
     return grounded_stmts
@@ -5,7 +5,9 @@ import os
 import csv
 import json
 import logging
+import multiprocessing
 from copy import deepcopy
+from collections import namedtuple
 from indra.statements import Agent
 from indra.databases import hgnc_client
 from indra.util import read_unicode_csv
@@ -85,9 +87,14 @@ class GroundingMapper(object):
                 raise ValueError('HGNC:%s for key %s in the grounding map is '
                                  'not a valid ID' % (refs['HGNC'], key))
 
-    def map_stmts(self, stmts, do_rename=True):
+    def map_stmts(self, stmts, do_rename=True, poolsize=None):
         """Return a new list of statements whose agents have been mapped
 
+        Agents with the same name and db_refs are mapped the same way,
+        unless disambiguated based on the statement's evidence, so the
+        mapping of such agents is done once and reused across the given
+        statements.
+
         Parameters
         ----------
         stmts : list of :py:class:`indra.statements.Statement`
@@ -97,6 +104,10 @@ class GroundingMapper(object):
             If do_rename is True the priority for setting the name is
             FamPlex ID, HGNC symbol, then the gene name
             from Uniprot. Default: True
+        poolsize : Optional[int]
+            The number of worker processes used to map statements. If not
+            given or 1, the statements are mapped in the current process.
+            Default: None
 
         Returns
         -------
@@ -104,22 +115,38 @@ class GroundingMapper(object):
             A list of statements given by mapping the agents from each
             statement in the input list
         """
-        # Make a copy of the stmts
-        mapped_stmts = []
-        num_skipped = 0
-        # Iterate over the statements
         import tqdm
-        it = tqdm.tqdm(stmts) if len(stmts) > 1e5 else stmts
-        for stmt in it:
-            mapped_stmt = self.map_agents_for_stmt(stmt, do_rename)
-            # Check if we should skip the statement
-            if mapped_stmt is not None:
-                mapped_stmts.append(mapped_stmt)
-            else:
-                num_skipped += 1
+        if poolsize and poolsize > 1 and len(stmts) > 1:
+            mapped_stmts = _map_stmts_parallel(self, stmts, do_rename,
+                                               poolsize)
+        else:
+            it = tqdm.tqdm(stmts) if len(stmts) > 1e5 else stmts
+            mapped_stmts = self._map_stmts(it, do_rename)
+        # Statements mapped to None are skipped
+        num_skipped = len(mapped_stmts)
+        mapped_stmts = [stmt for stmt in mapped_stmts if stmt is not None]
+        num_skipped -= len(mapped_stmts)
         logger.info('%s statements filtered out' % num_skipped)
         return mapped_stmts
 
+    def _map_stmts(self, stmts, do_rename):
+        # Return the mapped version of each statement or None if the
+        # statement is to be skipped. The lookups and the mapped agents are
+        # shared across statements.
+        lookups = self._get_lookups()
+        agent_cache = {}
+        return [self._map_agents_for_stmt(stmt, do_rename, lookups,
+                                          agent_cache)
+                for stmt in stmts]
+
+    def _get_lookups(self):
+        # The sets of agent texts checked for each agent
+        gilda_texts = set(self.gilda_models) if self.gilda_mode else set()
+        return _MappingLookups(ignores=set(self.ignores),
+                               adeft_texts=set(adeft_disambiguators),
+                               grounding_map_texts=set(self.grounding_map),
+                               gilda_texts=gilda_texts)
+
     def map_agents_for_stmt(self, stmt, do_rename=True):
         """Return a new Statement whose agents have been grounding mapped.
 
@@ -138,6 +165,11 @@ class GroundingMapper(object):
         mapped_stmt : :py:class:`indra.statements.Statement`
             The mapped Statement.
         """
+        return self._map_agents_for_stmt(stmt, do_rename,
+                                         self._get_lookups())
+
+    def _map_agents_for_stmt(self, stmt, do_rename, lookups,
+                             agent_cache=None):
         mapped_stmt = deepcopy(stmt)
 
         # Iterate over the agents
@@ -151,17 +183,16 @@ class GroundingMapper(object):
             # then filter out the Statement
             agent_txts = {agent.db_refs[t] for t in {'TEXT', 'TEXT_NORM'}
                           if t in agent.db_refs}
-            if agent_txts and agent_txts & set(self.ignores):
+            if agent_txts and agent_txts & lookups.ignores:
                 return None
 
             # Check if an adeft model exists for agent text
             adeft_success = False
             if self.use_adeft and agent_txts and agent_txts & \
-                    set(adeft_disambiguators):
+                    lookups.adeft_texts:
                 try:
                     # Us the longest match for disambiguation
-                    txt_for_adeft = sorted(agent_txts &
-                                           set(adeft_disambiguators),
+                    txt_for_adeft = sorted(agent_txts & lookups.adeft_texts,
                                            key=lambda x: len(x))[-1]
                     adeft_success = self.disamb_manager.\
                         run_adeft_disambiguation(mapped_stmt, agent, idx,
@@ -174,11 +205,11 @@ class GroundingMapper(object):
             gilda_success = False
             # Gilda is not used if agent text is in the grounding map
             if not adeft_success and self.gilda_mode and \
-               not agent_txts & set(self.grounding_map) and \
-               agent_txts & set(self.gilda_models):
+               not agent_txts & lookups.grounding_map_texts and \
+               agent_txts & lookups.gilda_texts:
                 try:
                     # Us the longest match for disambiguation
-                    txt_for_gilda = sorted(agent_txts & set(self.gilda_models),
+                    txt_for_gilda = sorted(agent_txts & lookups.gilda_texts,
                                            key=lambda x: len(x))[-1]
                     gilda_success = self.disamb_manager.\
                         run_gilda_disambiguation(mapped_stmt, agent, idx,
@@ -191,7 +222,8 @@ class GroundingMapper(object):
 
             # If Adeft and Gilda were not used or didn't succeed, we do
             # grounding mapping
-            new_agent = self.map_agent(agent, do_rename) \
+            new_agent = \
+                self._map_agent_cached(agent, do_rename, agent_cache) \
                 if not (adeft_success or gilda_success) else agent
 
             # If the old agent had bound conditions, but the new agent does
@@ -207,7 +239,8 @@ class GroundingMapper(object):
         for agent in agent_list:
             if agent is not None:
                 for bc in agent.bound_conditions:
-                    bc.agent = self.map_agent(bc.agent, do_rename)
+                    bc.agent = self._map_agent_cached(bc.agent, do_rename,
+                                                      agent_cache)
                     if not bc.agent:
                         # Skip the entire statement if the agent maps to None
                         # in the grounding map
@@ -215,6 +248,39 @@ class GroundingMapper(object):
 
         return mapped_stmt
 
+    def _map_agent_cached(self, agent, do_rename, agent_cache):
+        # Mapping an agent only depends on its name and db_refs so agents
+        # with the same name and db_refs are given the mapping found for the
+        # first one
+        if agent_cache is None:
+            return self.map_agent(agent, do_rename)
+        try:
+            key = (agent.name, tuple(agent.db_refs.items()), do_rename)
+            cached = agent_cache.get(key)
+        # Agents with unhashable db_refs entries, e.g., lists, aren't cached
+        except TypeError:
+            return self.map_agent(agent, do_rename)
+        if cached is not None:
+            mapped_agent, name, db_refs = cached
+            # The agent was replaced by one from the agent map
+            if mapped_agent is not None:
+                return deepcopy(mapped_agent)
+            agent.name = name
+            agent.db_refs = dict(db_refs)
+            return agent
+        mapped_agent = self.map_agent(agent, do_rename)
+        if mapped_agent is agent:
+            # Only db_refs with immutable entries can be shared across
+            # agents
+            try:
+                hash(tuple(agent.db_refs.items()))
+                agent_cache[key] = (None, agent.name, dict(agent.db_refs))
+            except TypeError:
+                pass
+        elif mapped_agent is not None:
+            agent_cache[key] = (deepcopy(mapped_agent), None, None)
+        return mapped_agent
+
     def map_agent(self, agent, do_rename):
         """Return the given Agent with its grounding mapped.
 
@@ -394,6 +460,90 @@ class GroundingMapper(object):
         return mapped_stmts
 
 
+_MappingLookups = namedtuple('_MappingLookups', ['ignores', 'adeft_texts',
+                                                 'grounding_map_texts',
+                                                 'gilda_texts'])
+
+
+_worker_mapper = None
+_worker_stmts = None
+
+
+def _init_mapping_worker(mapper):
+    global _worker_mapper
+    _worker_mapper = mapper
+
+
+def _map_stmts_for_chunk(args):
+    start, end, stmts, do_rename = args
+    # Forked workers share the statements at the module level so only the
+    # range of statements in the chunk is sent
+    if stmts is None:
+        stmts = _worker_stmts[start:end]
+    return _worker_mapper._map_stmts(stmts, do_rename)
+
+
+def _map_stmts_parallel(mapper, stmts, do_rename, poolsize):
+    """Return the mapped version of each statement using worker processes.
+
+    Parameters
+    ----------
+    mapper : GroundingMapper
+        The grounding mapper used to map the statements.
+    stmts : list of :py:class:`indra.statements.Statement`
+        The statements whose agents need mapping.
+    do_rename : bool
+        If True, the Agent name is updated based on the mapped grounding.
+    poolsize : int
+        The number of worker processes.
+
+    Returns
+    -------
+    list
+        The mapped version of each statement, in the order of the given
+        statements, or None for statements that are to be skipped.
+    """
+    global _worker_mapper, _worker_stmts
+    # We use several chunks of consecutive statements per worker so that
+    # the workers are balanced while each of them can reuse the mapping of
+    # agents across the statements of a chunk
+    n_chunks = min(len(stmts), poolsize * 4)
+    chunk_size = -(-len(stmts) // n_chunks)
+    ranges = [(idx, min(idx + chunk_size, len(stmts)))
+              for idx in range(0, len(stmts), chunk_size)]
+    # If possible, we fork workers after setting the mapper and the
+    # statements at the module level so that they are shared with the
+    # workers without pickling. Otherwise, the mapper is sent to each worker
+    # once upon start-up and the statements with each chunk.
+    if 'fork' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('fork')
+        _worker_mapper = mapper
+        _worker_stmts = stmts
+        chunks = [(start, end, None, do_rename) for start, end in ranges]
+        pool_kwargs = {}
+    else:
+        ctx = multiprocessing.get_context()
+        chunks = [(start, end, stmts[start:end], do_rename)
+                  for start, end in ranges]
+        pool_kwargs = {'initializer': _init_mapping_worker,
+                       'initargs': (mapper,)}
+    logger.info('Mapping %d statements in %d chunks using %d processes' %
+                (len(stmts), len(chunks), poolsize))
+    import tqdm
+    mapped_stmts = []
+    try:
+        with ctx.Pool(poolsize, **pool_kwargs) as pool:
+            for mapped_chunk in tqdm.tqdm(
+                    pool.imap(_map_stmts_for_chunk, chunks),
+                    total=len(chunks), desc='Mapping grounding',
+                    disable=len(stmts) <= 1e5):
+                mapped_stmts += mapped_chunk
+    finally:
+        _worker_mapper = None
+        _worker_stmts = None
+    return mapped_stmts
+
+
 # TODO: handle the cases when there is more than one entry for the same
 # key (e.g., ROS, ER)
 def load_grounding_map(grounding_map_path, lineterminator='\r\n',
@@ -100,7 +100,13 @@ class RefinementFilter:
     which is either None (no other filter was run before) or a set,
     which is the superset of possible relations as determined by some
     other previously applied filter.
+
+    The hashes that statements are keyed by are calculated with the
+    matches_fun attribute of the filter, which is set by the assembler
+    using the filter and is None if the built-in matches keys are used.
     """
+    matches_fun = None
+
     def __init__(self):
         self.shared_data = {}
 
@@ -205,6 +211,7 @@ class OntologyRefinementFilter(RefinementFilter):
 
         # Now iterate over each statement type and build up
         # data structures for quick filtering
+        new_agent_keys = set()
         for stmt_type, stmts_this_type in stmts_by_type.items():
             # Step 1. initialize data structures
             # noinspection PyProtectedMember
@@ -218,23 +225,32 @@ class OntologyRefinementFilter(RefinementFilter):
                 self.shared_data[stmt_type]['hash_to_agent_key'] = \
                     {role: collections.defaultdict(set) for role in roles}
                 # All agent keys for a given agent role
-                self.shared_data[stmt_type]['all_keys_by_role'] = {}
+                self.shared_data[stmt_type]['all_keys_by_role'] = \
+                    {role: set() for role in roles}
 
             # Step 2. Fill up the initial data structures in preparation
-            # for identifying potential refinements
+            # for identifying potential refinements. These are updated
+            # in place so that extending them only takes time proportional
+            # to the number of new statements.
             for sh in stmts_this_type:
                 for role in roles:
                     agent_keys = self._agent_keys_for_stmt_role(
                         stmts_by_hash[sh], role)
+                    new_agent_keys |= agent_keys
                     for agent_key in agent_keys:
                         self.shared_data[stmt_type]['agent_key_to_hash'][
                             role][agent_key].add(sh)
                         self.shared_data[stmt_type]['hash_to_agent_key'][
                             role][sh].add(agent_key)
+                        self.shared_data[stmt_type]['all_keys_by_role'][
+                            role].add(agent_key)
 
-            for role in roles:
-                self.shared_data[stmt_type]['all_keys_by_role'][role] = \
-                    set(self.shared_data[stmt_type]['agent_key_to_hash'][role])
+        # Ontologies answering queries through a web service, such as the
+        # VirtualOntology, can look up the relatives of all the agents in a
+        # few batched requests rather than one request per agent later on.
+        if hasattr(self.ontology, 'prefetch'):
+            self.ontology.prefetch(key for key in new_agent_keys
+                                   if key is not None)
 
     @staticmethod
     def _agent_keys_for_stmt_role(stmt, role):
@@ -275,7 +291,7 @@ class OntologyRefinementFilter(RefinementFilter):
 
         # Step 2. We iterate over all statements and find ones that this one
         # can refine
-        stmt_hash = stmt.get_hash()
+        stmt_hash = stmt.get_hash(matches_fun=self.matches_fun)
         relevants = possibly_related
         # We now iterate over all the agent roles in the given statement
         # type
@@ -377,7 +393,7 @@ class SplitGroupFilter(RefinementFilter):
 
     def get_related(self, stmt, possibly_related=None,
                     direction='less_specific'):
-        sh = stmt.get_hash()
+        sh = stmt.get_hash(matches_fun=self.matches_fun)
         group = self.split_groups.get(sh)
         # We take all the hashes that are in a different group, and
         # return all of them if possibly_related is None (i.e., there
@@ -1,14 +1,27 @@
+import os
+import pickle
 import logging
 import textwrap
+import itertools
+import multiprocessing
 from copy import deepcopy
 from functools import lru_cache
-from protmapper.api import ProtMapper, default_site_map
+from protmapper.api import ProtMapper, MappedSite, default_site_map
 from indra.statements import *
 from indra.databases import hgnc_client
 
 logger = logging.getLogger(__name__)
 
 
+# The version of the format in which cached mappings are saved
+SITE_CACHE_FORMAT_VERSION = 1
+
+# Error codes of mappings that failed because UniProt couldn't be accessed,
+# which, as in the ProtMapper's cache, aren't kept so that they are retried
+UNIPROT_ERROR_CODES = {'UNIPROT_HTTP_NOT_FOUND', 'UNIPROT_HTTP_OTHER',
+                       'UNIPROT_OTHER'}
+
+
 class MappedStatement(object):
     """Information about a Statement found to have invalid sites.
 
@@ -67,6 +80,12 @@ class SiteMapper(ProtMapper):
         If True, the SITEMAPPER_CACHE_PATH from the config (or environment)
         is loaded and cached mappings are read and written to the given path.
         Otherwise, no cache is used. Default: False
+    cache_path : Optional[str]
+        The path to the file in which cached mappings are stored if use_cache
+        is True. Mappings are stored as plain tuples rather than MappedSite
+        objects so that caches with millions of mappings can be loaded and
+        saved quickly. Caches saved by earlier versions are also loaded.
+        Default: the cache file in the protmapper resource folder
     do_methionine_offset : boolean
         Whether to check for off-by-one errors in site position (possibly)
         attributable to site numbering from mature proteins after
@@ -118,12 +137,56 @@ class SiteMapper(ProtMapper):
     def __init__(self, site_map=None, use_cache=False, cache_path=None,
                  do_methionine_offset=True, do_orthology_mapping=True,
                  do_isoform_mapping=True):
-        super(SiteMapper, self).__init__(site_map, use_cache, cache_path)
+        # The cache is loaded here rather than by the ProtMapper since it is
+        # stored in a different format
+        super(SiteMapper, self).__init__(site_map, False, cache_path)
+        self.use_cache = use_cache
         self.do_methionine_offset = do_methionine_offset
         self.do_orthology_mapping = do_orthology_mapping
         self.do_isoform_mapping = do_isoform_mapping
+        # The mapped sites by UniProt ID, residue, position and mapping
+        # options that were looked up during the current call to map_sites,
+        # or None outside of map_sites
+        self._mapped_sites = None
+        # The cached mappings loaded from the cache file as tuples of
+        # MappedSite attributes keyed by UniProt ID, residue and position
+        self._stored_sites = {}
+        if self.use_cache:
+            self.load_cache()
+
+    def load_cache(self):
+        """Load the cached mappings from the cache file if it exists."""
+        if not os.path.exists(self._cache_path):
+            logger.info('No cache found at %s, one will be created.' %
+                        self._cache_path)
+            return
+        with open(self._cache_path, 'rb') as fh:
+            cache = pickle.load(fh)
+        if isinstance(cache, dict) and 'format_version' in cache:
+            self._stored_sites = cache['sites']
+        # Caches saved by the ProtMapper contain MappedSite objects
+        else:
+            self._cache = cache
+        logger.info('Loaded cache of length %d from %s' %
+                    (len(self._stored_sites) + len(self._cache),
+                     self._cache_path))
+
+    def save_cache(self):
+        """Save the cached mappings into the cache file."""
+        sites = dict(self._stored_sites)
+        for key, mapped_site in self._cache.items():
+            sites[key] = tuple(mapped_site.__dict__.get(attr)
+                               for attr in MappedSite.attrs)
+        with open(self._cache_path, 'wb') as fh:
+            pickle.dump({'format_version': SITE_CACHE_FORMAT_VERSION,
+                         'attrs': MappedSite.attrs, 'sites': sites}, fh,
+                        protocol=pickle.HIGHEST_PROTOCOL)
 
     def map_stmt_sites(self, stmt):
+        # Most statements don't have any invalid sites, and since these
+        # aren't mapped, we check for this first to avoid copying them
+        if not self._has_invalid_sites(stmt):
+            return None
         stmt_copy = deepcopy(stmt)
         # For all statements, replace agents with invalid modifications
         mapped_sites = []
@@ -189,7 +252,7 @@ class SiteMapper(ProtMapper):
             mapped_stmt = None
         return mapped_stmt
 
-    def map_sites(self, stmts):
+    def map_sites(self, stmts, poolsize=None):
         """Check a set of statements for invalid modification sites.
 
         Statements are checked against Uniprot reference sequences to determine
@@ -203,10 +266,19 @@ class SiteMapper(ProtMapper):
         (:py:attr:`site_map`), and an instance of :py:class:`MappedStatement`
         is added to the list of mapped statements.
 
+        Each distinct site across the statements is looked up once, before
+        the statements are checked. Mapped sites are only kept for the
+        duration of the call, and ones that couldn't be mapped since UniProt
+        couldn't be accessed are looked up again when needed.
+
         Parameters
         ----------
         stmts : list of :py:class:`indra.statement.Statement`
             The statements to check for site errors.
+        poolsize : Optional[int]
+            The number of worker processes in which the distinct sites are
+            looked up. If not given or 1, the sites are looked up in the
+            current process. Default: None
 
         Returns
         -------
@@ -222,21 +294,27 @@ class SiteMapper(ProtMapper):
         valid_statements = []
         mapped_statements = []
 
-        for stmt in stmts:
-            # Check for errors in the position str
-            # TODO: this could also be used on agent conditions, here
-            # it's only applied to statement position arguments
-            if isinstance(stmt, (Modification, SelfModification)) and \
-                    not _valid_position_str(stmt.position):
-                continue
-            mapped_stmt = self.map_stmt_sites(stmt)
-            # If we got a MappedStatement as a return value, we add that to the
-            # list of mapped statements, otherwise, the original Statement is
-            # not invalid so we add it to the other list directly.
-            if mapped_stmt is not None:
-                mapped_statements.append(mapped_stmt)
-            else:
-                valid_statements.append(stmt)
+        # Check for errors in the position str
+        # TODO: this could also be used on agent conditions, here
+        # it's only applied to statement position arguments
+        stmts = [stmt for stmt in stmts
+                 if not isinstance(stmt, (Modification, SelfModification))
+                 or _valid_position_str(stmt.position)]
+        self._mapped_sites = {}
+        try:
+            self._map_sites_bulk(stmts, poolsize)
+            for stmt in stmts:
+                mapped_stmt = self.map_stmt_sites(stmt)
+                # If we got a MappedStatement as a return value, we add that
+                # to the list of mapped statements, otherwise, the original
+                # Statement is not invalid so we add it to the other list
+                # directly.
+                if mapped_stmt is not None:
+                    mapped_statements.append(mapped_stmt)
+                else:
+                    valid_statements.append(stmt)
+        finally:
+            self._mapped_sites = None
 
         return valid_statements, mapped_statements
 
@@ -300,6 +378,16 @@ class SiteMapper(ProtMapper):
             agent, and if both the position and residue for the modification
             condition were available. Otherwise None is returned.
         """
+        site = self._get_agent_mod_site(agent, mod_condition)
+        if site is None:
+            return None
+        # Otherwise, try to map it and return the mapped site
+        return self._map_site(*site)
+
+    def _get_agent_mod_site(self, agent, mod_condition):
+        # Return the UniProt ID, residue and position to be mapped for a
+        # modification condition on an agent, or None if there is no site
+        # to map
         # Get the UniProt ID of the agent, if not found, return
         up_id = _get_uniprot_id(agent)
         if not up_id:
@@ -308,20 +396,155 @@ class SiteMapper(ProtMapper):
         # If no site information for this residue, skip
         if mod_condition.position is None or mod_condition.residue is None:
             return None
-        # Otherwise, try to map it and return the mapped site
-        mapped_site = \
-            self.map_to_human_ref(up_id, 'uniprot',
-                mod_condition.residue,
-                mod_condition.position,
-                do_methionine_offset=self.do_methionine_offset,
-                do_orthology_mapping=self.do_orthology_mapping,
-                do_isoform_mapping=self.do_isoform_mapping)
+        return up_id, mod_condition.residue, mod_condition.position
+
+    def _map_site(self, up_id, residue, position):
+        # Return the mapped site for a UniProt ID, residue and position,
+        # looking it up only once per call to map_sites
+        key = (up_id, residue, position, self.do_methionine_offset,
+               self.do_orthology_mapping, self.do_isoform_mapping)
+        mapped_site = self._mapped_sites.get(key) \
+            if self._mapped_sites is not None else None
+        if mapped_site is None:
+            stored_site = self._stored_sites.get(key[:3])
+            if stored_site is not None:
+                mapped_site = MappedSite.__new__(MappedSite)
+                mapped_site.__dict__.update(zip(MappedSite.attrs,
+                                                stored_site))
+            else:
+                mapped_site = \
+                    self.map_to_human_ref(up_id, 'uniprot', residue, position,
+                        do_methionine_offset=self.do_methionine_offset,
+                        do_orthology_mapping=self.do_orthology_mapping,
+                        do_isoform_mapping=self.do_isoform_mapping)
+            self._keep_mapped_site(key, mapped_site)
         return mapped_site
 
+    def _keep_mapped_site(self, key, mapped_site):
+        if self._mapped_sites is not None and \
+                mapped_site.error_code not in UNIPROT_ERROR_CODES:
+            self._mapped_sites[key] = mapped_site
+
+    def _get_stmt_mod_sites(self, stmt):
+        # Return each agent and modification condition whose site is checked
+        # for a statement, including the site modified by the statement
+        agent_mods = []
+        for agent in stmt.agent_list():
+            if agent is None:
+                continue
+            agents = [agent] + [bc.agent for bc in agent.bound_conditions]
+            for ag in agents:
+                if ag is not None and ag.mods:
+                    agent_mods += [(ag, mod) for mod in ag.mods]
+        if (isinstance(stmt, Modification) or
+            isinstance(stmt, SelfModification)) and \
+           stmt.residue is not None and stmt.position is not None:
+            # Make sure we didn't end up with lists by accident
+            assert isinstance(stmt.residue, str) and \
+                   isinstance(stmt.position, str)
+            agent_to_check = (stmt.sub if isinstance(stmt, Modification)
+                              else stmt.enz)
+            agent_mods.append((agent_to_check, stmt._get_mod_condition()))
+        return agent_mods
+
+    def _has_invalid_sites(self, stmt):
+        for agent, mod_condition in self._get_stmt_mod_sites(stmt):
+            mapped_site = self._map_agent_mod(agent, mod_condition)
+            if mapped_site is not None and not mapped_site.not_invalid():
+                return True
+        return False
+
+    def _map_sites_bulk(self, stmts, poolsize=None):
+        # Look up each distinct site of the statements that wasn't looked
+        # up yet, in worker processes if a poolsize is given
+        sites = {}
+        for stmt in stmts:
+            for agent, mod_condition in self._get_stmt_mod_sites(stmt):
+                site = self._get_agent_mod_site(agent, mod_condition)
+                if site is not None:
+                    sites[site] = None
+        options = (self.do_methionine_offset, self.do_orthology_mapping,
+                   self.do_isoform_mapping)
+        sites = [site for site in sites
+                 if site + options not in self._mapped_sites]
+        if not poolsize or poolsize <= 1 or len(sites) <= 1:
+            for site in sites:
+                self._map_site(*site)
+            return
+        start = 0
+        for mapped_sites, new_cache in _map_sites_parallel(self, sites,
+                                                          poolsize):
+            for site, mapped_site in zip(sites[start:], mapped_sites):
+                self._keep_mapped_site(site + options, mapped_site)
+            start += len(mapped_sites)
+            self._cache.update(new_cache)
+
 
 default_mapper = SiteMapper(default_site_map)
 
 
+_worker_mapper = None
+
+
+def _init_site_mapping_worker(mapper):
+    global _worker_mapper
+    _worker_mapper = mapper
+
+
+def _map_sites_for_chunk(sites):
+    # Return the mapped sites along with the mappings added to the
+    # ProtMapper's cache so that they can be saved by the parent process
+    cache_size = len(_worker_mapper._cache)
+    mapped_sites = [_worker_mapper._map_site(*site) for site in sites]
+    new_cache = dict(itertools.islice(_worker_mapper._cache.items(),
+                                      cache_size, None))
+    return mapped_sites, new_cache
+
+
+def _map_sites_parallel(mapper, sites, poolsize):
+    """Yield the mapped sites for chunks of sites using worker processes.
+
+    Parameters
+    ----------
+    mapper : SiteMapper
+        The site mapper used to map the sites.
+    sites : list[tuple]
+        The UniProt ID, residue and position of each site to be mapped.
+    poolsize : int
+        The number of worker processes.
+
+    Yields
+    ------
+    tuple
+        The list of mapped sites for each chunk of sites, in the order of
+        the given sites, and a dict of the mappings added to the cache of
+        the worker while mapping the chunk.
+    """
+    global _worker_mapper
+    n_chunks = min(len(sites), poolsize * 4)
+    chunk_size = -(-len(sites) // n_chunks)
+    chunks = [sites[idx:idx + chunk_size]
+              for idx in range(0, len(sites), chunk_size)]
+    # If possible, we fork workers after setting the mapper at the module
+    # level so that it is shared with the workers without pickling.
+    # Otherwise, the mapper is sent to each worker once upon start-up.
+    if 'fork' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('fork')
+        _worker_mapper = mapper
+        pool_kwargs = {}
+    else:
+        ctx = multiprocessing.get_context()
+        pool_kwargs = {'initializer': _init_site_mapping_worker,
+                       'initargs': (mapper,)}
+    logger.info('Mapping %d sites in %d chunks using %d processes' %
+                (len(sites), len(chunks), poolsize))
+    try:
+        with ctx.Pool(poolsize, **pool_kwargs) as pool:
+            yield from pool.imap(_map_sites_for_chunk, chunks)
+    finally:
+        _worker_mapper = None
+
+
 # TODO: determine if this should be done in the protmapper or if this is the
 # preferred place
 @lru_cache(maxsize=10000)
@@ -204,15 +204,21 @@ PMID: 28824543    in a mfat-1 transgenic mouse model whose islets contained
 
 __all__ = ['get_statements', 'get_statements_for_papers',
            'get_statements_for_paper', 'get_statements_by_hash',
-           'get_statements_from_query', 'submit_curation', 'get_curations']
+           'get_statements_by_hash_bulk', 'get_statements_from_query',
+           'submit_curation', 'get_curations']
 
-from indra.util import clockit
+from concurrent.futures import ThreadPoolExecutor
+
+from indra.util import clockit, batch_iter
 from indra.statements import Complex, SelfModification,  ActiveForm, \
     Translocation, Conversion
 
 from indra.sources.indra_db_rest.query import *
+from indra.sources.indra_db_rest.query_results import StatementQueryResult
 from indra.sources.indra_db_rest.processor import DBQueryStatementProcessor
-from indra.sources.indra_db_rest.util import make_db_rest_request, get_url_base
+from indra.sources.indra_db_rest.util import make_db_rest_request, \
+    get_url_base, get_max_concurrency, get_cached_statements, \
+    cache_statements
 
 
 @clockit
@@ -393,6 +399,105 @@ def get_statements_by_hash(hash_list, limit=None, ev_limit=10,
                                      api_key=api_key)
 
 
+@clockit
+def get_statements_by_hash_bulk(hash_list, ev_limit=10, batch_size=500,
+                                tries=3, api_key=None, max_concurrency=None,
+                                use_cache=True):
+    """Get Statements for a large list of hashes with batched requests.
+
+    Duplicate hashes are only requested once, and the hashes are requested
+    in batches with up to max_concurrency batches requested in parallel. If
+    the INDRA_DB_REST_CACHE_DIR configuration is set, retrieved statements
+    are cached by hash, and statements already in the cache aren't
+    requested again. The results are merged into a single processor.
+
+    Parameters
+    ----------
+    hash_list : list[int or str]
+        A list of statement hashes.
+    ev_limit : Optional[int]
+        Limit the amount of evidence returned per Statement. Default is 10.
+    batch_size : Optional[int]
+        The number of hashes requested in each batch. Default is 500.
+    tries : Optional[int]
+        Set the number of times to try each request. Default is 3.
+    api_key : Optional[str]
+        Override or use in place of the API key given in the INDRA config file.
+    max_concurrency : Optional[int]
+        The maximum number of batches requested concurrently. If None, the
+        INDRA_DB_REST_MAX_CONCURRENCY configuration is used, or 4 if it isn't
+        set. Default is None.
+    use_cache : Optional[bool]
+        If True, statements are loaded from and saved to the cache if
+        caching is enabled. Default is True.
+
+    Returns
+    -------
+    processor : :py:class:`DBQueryStatementProcessor`
+        An instance of the DBQueryStatementProcessor, whose ``statements``
+        are in the order of the given hashes, along with their evidence
+        counts, belief scores and source counts. Hashes for which no
+        statement was found are skipped.
+    """
+    stmt_hashes = list(dict.fromkeys(int(h) for h in hash_list))
+    entries = get_cached_statements(stmt_hashes, ev_limit) if use_cache \
+        else {}
+    missing = [h for h in stmt_hashes if h not in entries]
+
+    def get_batch(batch):
+        # Get all the pages of results for a batch of hashes
+        query = HasHash(batch)
+        batch_entries = {}
+        offset = 0
+        while offset is not None:
+            result = query.get('statements', offset=offset, n_tries=tries,
+                               api_key=api_key, use_cache=False,
+                               ev_limit=ev_limit, filter_ev=True)
+            for stmt_hash, stmt_json in result.results.items():
+                batch_entries[stmt_hash] = {
+                    'stmt_json': stmt_json,
+                    'evidence_count':
+                        result.evidence_counts.get(stmt_hash),
+                    'belief_score': result.belief_scores.get(stmt_hash),
+                    'source_counts': result.source_counts.get(stmt_hash)}
+            offset = result.next_offset
+        if use_cache:
+            cache_statements(batch_entries, ev_limit)
+        return batch_entries
+
+    if missing:
+        max_concurrency = max_concurrency if max_concurrency \
+            else get_max_concurrency()
+        with ThreadPoolExecutor(max_concurrency) as executor:
+            for batch_entries in executor.map(get_batch,
+                                              batch_iter(missing,
+                                                         batch_size, list)):
+                entries.update(batch_entries)
+
+    # The results are added to the processor in batches as if they were
+    # pages of a query, in the order of the given hashes
+    query = HasHash(stmt_hashes)
+    processor = DBQueryStatementProcessor(query, limit=0, ev_limit=ev_limit,
+                                          tries=tries, api_key=api_key)
+    found = [h for h in stmt_hashes if h in entries]
+    for offset in range(0, len(found), batch_size):
+        batch = {h: entries[h] for h in found[offset:offset + batch_size]}
+        result = StatementQueryResult(
+            {h: e['stmt_json'] for h, e in batch.items()}, None, offset,
+            {h: e['evidence_count'] for h, e in batch.items()
+             if e['evidence_count'] is not None},
+            {h: e['belief_score'] for h, e in batch.items()
+             if e['belief_score'] is not None},
+            sum(len(e['stmt_json'].get('evidence', []))
+                for e in batch.values()),
+            {h: e['source_counts'] for h, e in batch.items()
+             if e['source_counts'] is not None},
+            query.to_simple_json())
+        processor._merge_query_result(result)
+    processor._compile_results()
+    return processor
+
+
 def get_statements_for_paper(*args, **kwargs):
     from warnings import warn
     warn("`get_statements_for_paper` has been replaced with "
@@ -468,7 +573,7 @@ def get_statements_from_query(query, limit=None, ev_limit=10,
                               sort_by='ev_count', persist=True, timeout=None,
                               strict_stop=False, tries=3, filter_ev=True,
                               use_obtained_counts=False,
-                              api_key=None):
+                              api_key=None, max_concurrency=None):
     """Get Statements using a Query.
 
     Example
@@ -525,6 +630,10 @@ def get_statements_from_query(query, limit=None, ev_limit=10,
         wait. Default is 3.
     api_key : Optional[str]
         Override or use in place of the API key given in the INDRA config file.
+    max_concurrency : Optional[int]
+        The maximum number of pages of results requested concurrently. If
+        None, the INDRA_DB_REST_MAX_CONCURRENCY configuration is used, or 4
+        if it isn't set. Default is None.
 
     Returns
     -------
@@ -538,7 +647,8 @@ def get_statements_from_query(query, limit=None, ev_limit=10,
                                      tries=tries, filter_ev=filter_ev,
                                      strict_stop=strict_stop,
                                      use_obtained_counts=use_obtained_counts,
-                                     api_key=api_key)
+                                     api_key=api_key,
+                                     max_concurrency=max_concurrency)
 
 
 def submit_curation(hash_val, tag, curator_email, text=None,
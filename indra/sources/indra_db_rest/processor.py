@@ -11,6 +11,7 @@ from copy import deepcopy
 
 from threading import Thread
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from requests import Timeout
 
@@ -19,7 +20,7 @@ from indra.util.statement_presentation import get_available_source_counts, \
     get_available_ev_counts
 
 from .query import Query
-from .util import RecordableLogger
+from .util import RecordableLogger, get_max_concurrency
 from .util import logger as util_logger
 from .exceptions import IndraDBRestResponseError
 
@@ -65,12 +66,19 @@ class IndraDBQueryProcessor:
         willing to wait. Default is 3
     api_key : str or None
         Override or use in place of the API key given in the INDRA config file.
+    max_concurrency : int or None
+        The maximum number of pages of results requested concurrently when
+        persist is True. Pages after the first are requested in parallel in
+        windows of the size of the first page, and their results are added
+        in order. If None, the INDRA_DB_REST_MAX_CONCURRENCY configuration
+        is used, or 4 if it isn't set. If 1, pages are requested one at a
+        time.
     """
     result_type = NotImplemented
 
     def __init__(self, query: Query, limit=None, sort_by='ev_count',
                  timeout=None, strict_stop=False, persist=True, tries=3,
-                 api_key=None):
+                 api_key=None, max_concurrency=None):
         self.query = query
         self.limit = limit
         self.sort_by = sort_by
@@ -81,6 +89,8 @@ class IndraDBQueryProcessor:
         self.__offset = 0
         self.__quota = limit
         self.__api_key = api_key
+        self.__max_concurrency = max_concurrency if max_concurrency \
+            else get_max_concurrency()
         self.__canceled = False
         self.__start_time = None
         self.__th = None
@@ -178,48 +188,45 @@ class IndraDBQueryProcessor:
     def _set_special_params(self, **params):
         self.__special_params = params
 
-    def _run_query(self):
+    def _get_query_timeout(self):
         # If we are in strict stop mode, we want to be sure we give up after
         # the given overall timeout, so we need to account for time spend on
         # other queries.
         if self.__strict_stop:
-            query_timeout = self.__timeout - self._time_since_start()
-            if query_timeout <= 0:
-                return
-        else:
-            query_timeout = None
-
-        # Run the query.
-        try:
-            r = self.requests_completed
-            nth = f"{r}{['st', 'nd', 'rd'][r-1] if 0 < r < 4 else 'th'}"
-            request_logger.info(f"Running {nth} request for {self.result_type}")
-            request_logger.info(f"  LIMIT: {self.__quota}")
-            request_logger.info(f"  OFFSET: {self.__offset}")
-            if query_timeout:
-                request_logger.info(f"  TIMEOUT: {query_timeout}")
-
-            result = self.query.get(self.result_type, offset=self.__offset,
-                                    limit=self.__quota, sort_by=self.sort_by,
-                                    timeout=query_timeout, n_tries=self.tries,
-                                    api_key=self.__api_key,
-                                    **self.__special_params)
-        except Timeout:
-            # Make sure this is the timeout we think it is.
-            self.__timed_out = True
-            if not self.__strict_stop or not self._strict_time_is_up():
-                raise
-            logger.info(f"Query timed out after {self._time_since_start()} "
-                        f"seconds, {self.requests_completed} requests, and "
-                        f"after retrieving {len(self._evidence_counts)} "
-                        f"results, with {self.__quota} remaining.")
-            return
+            return self.__timeout - self._time_since_start()
+        return None
+
+    def _request_page(self, offset, limit, query_timeout):
+        request_logger.info(f"  LIMIT: {limit}")
+        request_logger.info(f"  OFFSET: {offset}")
+        if query_timeout:
+            request_logger.info(f"  TIMEOUT: {query_timeout}")
+        return self.query.get(self.result_type, offset=offset, limit=limit,
+                              sort_by=self.sort_by, timeout=query_timeout,
+                              n_tries=self.tries, api_key=self.__api_key,
+                              **self.__special_params)
+
+    def _handle_timeout(self):
+        """Return True if a request timed out because time is up."""
+        # Make sure this is the timeout we think it is.
+        self.__timed_out = True
+        if not self.__strict_stop or not self._strict_time_is_up():
+            return False
+        logger.info(f"Query timed out after {self._time_since_start()} "
+                    f"seconds, {self.requests_completed} requests, and "
+                    f"after retrieving {len(self._evidence_counts)} "
+                    f"results, with {self.__quota} remaining.")
+        return True
 
-        # Update results
+    def _merge_query_result(self, result):
         self._evidence_counts.update(result.evidence_counts)
         self._belief_scores.update(result.belief_scores)
         self._handle_new_result(result, self._source_counts)
 
+    def _add_result(self, result):
+        # Update results
+        self._merge_query_result(result)
+
         # Update the quota
         if self.__quota is not None:
             self.__quota -= len(result.results)
@@ -230,8 +237,80 @@ class IndraDBQueryProcessor:
         # Increment the number of queries run.
         self.requests_completed += 1
 
+    def _run_query(self):
+        query_timeout = self._get_query_timeout()
+        if query_timeout is not None and query_timeout <= 0:
+            return
+
+        # Run the query.
+        try:
+            r = self.requests_completed
+            nth = f"{r}{['st', 'nd', 'rd'][r-1] if 0 < r < 4 else 'th'}"
+            request_logger.info(f"Running {nth} request for {self.result_type}")
+            result = self._request_page(self.__offset, self.__quota,
+                                        query_timeout)
+        except Timeout:
+            if not self._handle_timeout():
+                raise
+            return
+
+        self._add_result(result)
         return
 
+    def _run_queries_concurrently(self):
+        """Get the remaining pages of results with concurrent requests.
+
+        The pages are requested in windows the size of the first page, with
+        at most max_concurrency requests in flight, and their results are
+        added in the order of their offsets. If the pages returned by the
+        server don't line up with the windows, the windows are requested
+        again starting from the next offset returned by the server, using
+        the size of the last page, so the results are the same as when
+        requesting pages one at a time.
+        """
+        page_size = self.__offset
+        pending = {}
+        next_offset = self.__offset
+        with ThreadPoolExecutor(self.__max_concurrency) as executor:
+            while not self._done():
+                while len(pending) < self.__max_concurrency:
+                    if self.limit is not None and next_offset >= self.limit:
+                        break
+                    query_timeout = self._get_query_timeout()
+                    if query_timeout is not None and query_timeout <= 0:
+                        break
+                    limit = None if self.limit is None \
+                        else self.limit - next_offset
+                    pending[next_offset] = \
+                        executor.submit(self._request_page, next_offset,
+                                        limit, query_timeout)
+                    next_offset += page_size
+                if not pending:
+                    break
+                future = pending.pop(self.__offset, None)
+                if future is None:
+                    logger.debug(f"No request pending at offset "
+                                 f"{self.__offset}, requesting pages from "
+                                 f"there.")
+                    for future in pending.values():
+                        future.cancel()
+                    pending = {}
+                    next_offset = self.__offset
+                    continue
+                try:
+                    result = future.result()
+                except Timeout:
+                    if not self._handle_timeout():
+                        raise
+                    break
+                offset = self.__offset
+                self._add_result(result)
+                if self.__offset is not None and self.__offset > offset:
+                    page_size = self.__offset - offset
+            # Requests beyond the last page aren't needed
+            for future in pending.values():
+                future.cancel()
+
     def _run_queries(self, persist):
         """Use paging to get all statements requested."""
         self._mark_start()
@@ -243,6 +322,9 @@ class IndraDBQueryProcessor:
             return
 
         # Get the rest of the content.
+        if self.__max_concurrency > 1 and not self._done() \
+                and self.__offset > 0:
+            self._run_queries_concurrently()
         while not self._done():
             self._run_query()
 
@@ -347,6 +429,10 @@ class DBQueryStatementProcessor(IndraDBQueryProcessor):
         willing to wait. Default is 3.
     api_key : str or None
         Override or use in place of the API key given in the INDRA config file.
+    max_concurrency : int or None
+        The maximum number of pages of results requested concurrently. If
+        None, the INDRA_DB_REST_MAX_CONCURRENCY configuration is used, or 4
+        if it isn't set. Default is None.
 
     """
     result_type = 'statements'
@@ -354,7 +440,7 @@ class DBQueryStatementProcessor(IndraDBQueryProcessor):
     def __init__(self, query: Query, limit=None, sort_by='ev_count',
                  ev_limit=10, filter_ev=True, timeout=None, strict_stop=False,
                  persist=True, use_obtained_counts=False, tries=3,
-                 api_key=None):
+                 api_key=None, max_concurrency=None):
 
         self.statements = []
         self.statements_sample = None
@@ -367,7 +453,7 @@ class DBQueryStatementProcessor(IndraDBQueryProcessor):
         super(DBQueryStatementProcessor, self).\
             __init__(query, limit=limit, sort_by=sort_by, timeout=timeout,
                      strict_stop=strict_stop, persist=persist, tries=tries,
-                     api_key=api_key)
+                     api_key=api_key, max_concurrency=max_concurrency)
 
     # Metadata Retrieval methods.
 
@@ -491,6 +577,7 @@ class DBQueryHashProcessor(IndraDBQueryProcessor):
 
     def __init__(self, *args, **kwargs):
         self.hashes = []
+        self._set_special_params()
         super(DBQueryHashProcessor, self).__init__(*args, **kwargs)
 
     def _handle_new_result(self, result, source_counts):
@@ -203,7 +203,8 @@ __all__ = ['Query', 'And', 'Or', 'HasAgent', 'FromMeshIds', 'HasHash',
 from typing import Iterable, Tuple, Union
 
 from indra.sources.indra_db_rest.query_results import QueryResult
-from indra.sources.indra_db_rest.util import make_db_rest_request, jsonify_args
+from indra.sources.indra_db_rest.util import make_db_rest_request, \
+    jsonify_args, get_cached_response, cache_response
 
 
 class Query:
@@ -216,7 +217,8 @@ class Query:
     # Here are defined some other functions to get info from the server.
 
     def get(self, result_type, limit=None, sort_by=None, offset=None,
-            timeout=None, n_tries=2, api_key=None, **other_params):
+            timeout=None, n_tries=2, api_key=None, use_cache=True,
+            **other_params):
         """Get results from the API of the given type.
 
         Parameters
@@ -241,6 +243,10 @@ class Query:
         api_key : str or None
             Override or use in place of the API key given in the INDRA config
             file.
+        use_cache : Optional[bool]
+            If True, and a cache folder is set with the INDRA_DB_REST_CACHE_DIR
+            configuration, the response is loaded from the cache if the same
+            request was made before, and is cached otherwise. Default: True
 
         Other Parameters
         ----------------
@@ -265,14 +271,20 @@ class Query:
             query_json = self.to_simple_json()
         else:
             query_json = self.__compiled_json
-        resp = make_db_rest_request('post', f'query/{result_type}',
-                                    data={'query': query_json,
-                                          'kwargs': jsonify_args(other_params)},
-                                    params=dict(limit=limit, sort_by=sort_by,
-                                                offset=offset, simple=simple),
-                                    timeout=timeout, tries=n_tries,
-                                    api_key=api_key)
-        resp_json = resp.json()
+        data = {'query': query_json, 'kwargs': jsonify_args(other_params)}
+        params = dict(limit=limit, sort_by=sort_by, offset=offset,
+                      simple=simple)
+        cache_key = {'result_type': result_type, 'data': data,
+                     'params': params}
+        resp_json = get_cached_response(cache_key) if use_cache else None
+        if resp_json is None:
+            resp = make_db_rest_request('post', f'query/{result_type}',
+                                        data=data, params=params.copy(),
+                                        timeout=timeout, tries=n_tries,
+                                        api_key=api_key)
+            resp_json = resp.json()
+            if use_cache:
+                cache_response(cache_key, resp_json)
         self.__compiled_json = resp_json['query_json']
         self.__compiled_str = None
         return QueryResult.from_json(resp_json)
@@ -1,9 +1,13 @@
+import os
 import json
 import logging
+import threading
 from io import StringIO
+from hashlib import md5
 from contextlib import contextmanager
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from indra import get_config
 from indra.sources.indra_db_rest.exceptions import IndraDBRestAPIError
@@ -120,7 +124,7 @@ def make_db_rest_request(meth, end_point, query_str='', data=None, params=None,
     logger.info(f'params: {remove_api_key(str(params))}')
     logger.info(f'data: {remove_api_key(str(data))}')
     logger.debug(f'headers: {remove_api_key(str(headers))}')
-    method_func = getattr(requests, meth.lower())
+    method_func = getattr(get_session(), meth.lower())
     while tries > 0:
         tries -= 1
         resp = method_func(url_path, headers=headers, data=json_data,
@@ -145,3 +149,160 @@ def get_url_base(end_point):
     url = get_config('INDRA_DB_REST_URL', failure_ok=False)
     url_path = url.rstrip('/') + '/' + end_point.lstrip('/')
     return url_path
+
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+def get_max_concurrency():
+    """Return the maximum number of concurrent requests made by a query.
+
+    The value is taken from the INDRA_DB_REST_MAX_CONCURRENCY configuration,
+    if set, and is :py:data:`DEFAULT_MAX_CONCURRENCY` otherwise.
+    """
+    max_concurrency = get_config('INDRA_DB_REST_MAX_CONCURRENCY')
+    return int(max_concurrency) if max_concurrency \
+        else DEFAULT_MAX_CONCURRENCY
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the HTTP session used for requests to the REST API.
+
+    The session is shared by all requests, including those made
+    concurrently from multiple threads, so that connections to the server
+    are pooled and reused rather than opened for each request.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            pool_size = max(10, get_max_concurrency())
+            adapter = HTTPAdapter(pool_connections=pool_size,
+                                  pool_maxsize=pool_size)
+            _session = requests.Session()
+            _session.mount('http://', adapter)
+            _session.mount('https://', adapter)
+    return _session
+
+
+def _get_cache_fname(cache_key):
+    cache_dir = get_config('INDRA_DB_REST_CACHE_DIR')
+    if not cache_dir:
+        return None
+    key_str = json.dumps(cache_key, sort_keys=True)
+    return os.path.join(cache_dir,
+                        md5(key_str.encode('utf-8')).hexdigest() + '.json')
+
+
+def get_cached_response(cache_key):
+    """Return a cached response JSON for a request, if available.
+
+    Responses are cached in the folder given by the INDRA_DB_REST_CACHE_DIR
+    configuration. If it isn't set, caching is disabled.
+
+    Parameters
+    ----------
+    cache_key : dict
+        A JSON-serializable description of the request, e.g., the query JSON
+        along with the paging parameters.
+
+    Returns
+    -------
+    dict or None
+        The cached response JSON or None if caching is disabled or the
+        response isn't cached.
+    """
+    fname = _get_cache_fname(cache_key)
+    if fname is None or not os.path.exists(fname):
+        return None
+    logger.info(f'Loading cached response from {fname}')
+    with open(fname, 'r') as fh:
+        return json.load(fh)
+
+
+def cache_response(cache_key, resp_json):
+    """Cache the response JSON of a request if caching is enabled.
+
+    Parameters
+    ----------
+    cache_key : dict
+        A JSON-serializable description of the request, e.g., the query JSON
+        along with the paging parameters.
+    resp_json : dict
+        The response JSON to cache.
+    """
+    fname = _get_cache_fname(cache_key)
+    if fname is None:
+        return
+    _dump_json(resp_json, fname)
+
+
+def _get_statement_cache_dir(ev_limit):
+    cache_dir = get_config('INDRA_DB_REST_CACHE_DIR')
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, 'statements', f'ev_limit_{ev_limit}')
+
+
+def get_cached_statements(stmt_hashes, ev_limit):
+    """Return the cached statement JSONs and metadata for statement hashes.
+
+    Statements are cached by hash in the folder given by the
+    INDRA_DB_REST_CACHE_DIR configuration. If it isn't set, caching is
+    disabled.
+
+    Parameters
+    ----------
+    stmt_hashes : list[int]
+        The hashes of the statements to load from the cache.
+    ev_limit : int or None
+        The evidence limit with which the statements were retrieved.
+
+    Returns
+    -------
+    dict
+        A dict keyed by the hashes of the cached statements, with dicts as
+        values containing the statement JSON (stmt_json), the evidence
+        count, belief score and source counts of the statement.
+    """
+    cache_dir = _get_statement_cache_dir(ev_limit)
+    if cache_dir is None or not os.path.exists(cache_dir):
+        return {}
+    cached = {}
+    for stmt_hash in stmt_hashes:
+        fname = os.path.join(cache_dir, f'{stmt_hash}.json')
+        if os.path.exists(fname):
+            with open(fname, 'r') as fh:
+                cached[stmt_hash] = json.load(fh)
+    return cached
+
+
+def cache_statements(entries, ev_limit):
+    """Cache statement JSONs and metadata by hash if caching is enabled.
+
+    Parameters
+    ----------
+    entries : dict
+        A dict keyed by statement hash in the format returned by
+        :py:func:`get_cached_statements`.
+    ev_limit : int or None
+        The evidence limit with which the statements were retrieved.
+    """
+    cache_dir = _get_statement_cache_dir(ev_limit)
+    if cache_dir is None:
+        return
+    for stmt_hash, entry in entries.items():
+        _dump_json(entry, os.path.join(cache_dir, f'{stmt_hash}.json'))
+
+
+def _dump_json(obj, fname):
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+    # Write to a temporary file first so that concurrent readers never see a
+    # partially written file.
+    tmp_fname = f'{fname}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_fname, 'w') as fh:
+        json.dump(obj, fh)
+    os.replace(tmp_fname, fname)
@@ -158,7 +158,9 @@ produced by REACH.
 
 Once REACH output has been obtained in the `fries` JSON format, one can
 use :py:mod:`indra.sources.reach.api.process_json_file`
-in INDRA to process each JSON file.
+in INDRA to process each JSON file, or
+:py:mod:`indra.sources.reach.api.process_json_files` to process many JSON
+files in parallel.
 """
 
 
@@ -169,5 +171,6 @@ from .api import (process_pmc,
                   process_nxml_file,
                   process_json_str,
                   process_json_file,
+                  process_json_files,
                   reach_text_url, reach_nxml_url,
                   local_text_url, local_nxml_url)
@@ -5,6 +5,7 @@ Many file formats are supported. Many will run reach.
 import json
 import logging
 import requests
+import multiprocessing
 
 from indra.literature import id_lookup
 import indra.literature.pmc_client as pmc_client
@@ -201,7 +202,7 @@ def process_text(text, citation=None, offline=False, url=None,
     if json_str:
         with open(output_fname, 'wb') as fh:
             fh.write(json_str)
-        return process_json_str(json_str.decode('utf-8'), citation=citation,
+        return process_json_str(json_str, citation=citation,
                                 organism_priority=organism_priority)
 
 
@@ -266,7 +267,7 @@ def process_nxml_str(nxml_str, citation=None, offline=False,
     if json_str:
         with open(output_fname, 'wb') as fh:
             fh.write(json_str)
-        return process_json_str(json_str.decode('utf-8'), citation=citation,
+        return process_json_str(json_str, citation=citation,
                                 organism_priority=organism_priority)
 
 
@@ -324,7 +325,7 @@ def process_nxml_file(file_name, citation=None, offline=False,
     if json_str:
         with open(output_fname, 'wb') as fh:
             fh.write(json_str)
-        return process_json_str(json_str.decode('utf-8'), citation=citation,
+        return process_json_str(json_str, citation=citation,
                                 organism_priority=organism_priority)
 
 
@@ -337,8 +338,9 @@ def process_json_file(file_name, citation=None, organism_priority=None):
 
     Parameters
     ----------
-    file_name : str
-        The name of the json file to be processed.
+    file_name : str or file
+        The name of the json file to be processed, or a file object opened
+        for reading from which the json is read.
     citation : Optional[str]
         A PubMed ID passed to be used in the evidence for the extracted INDRA
         Statements. Default: None
@@ -354,13 +356,73 @@ def process_json_file(file_name, citation=None, organism_priority=None):
         A ReachProcessor containing the extracted INDRA Statements
         in rp.statements.
     """
-    try:
-        with open(file_name, 'rb') as fh:
-            json_str = fh.read().decode('utf-8')
-            return process_json_str(json_str, citation=citation,
-                                    organism_priority=organism_priority)
-    except IOError:
-        logger.error('Could not read file %s.' % file_name)
+    if hasattr(file_name, 'read'):
+        json_dict = _load_reach_json(json.load, file_name)
+    else:
+        try:
+            with open(file_name, 'r', encoding='utf-8') as fh:
+                json_dict = _load_reach_json(json.load, fh)
+        except IOError:
+            logger.error('Could not read file %s.' % file_name)
+            return None
+    return _process_json_dict(json_dict, citation=citation,
+                              organism_priority=organism_priority)
+
+
+def process_json_files(file_names, citations=None, organism_priority=None,
+                       poolsize=None):
+    """Yield INDRA Statements by processing the given REACH json files.
+
+    The files are processed in parallel by a pool of worker processes and
+    the extracted Statements are yielded file by file, in the order of the
+    given file names, as soon as they are available so that the Statements
+    extracted from all the files don't have to be kept in memory at once.
+
+    Parameters
+    ----------
+    file_names : iterable[str]
+        The names of the json files to be processed.
+    citations : Optional[dict]
+        A dict of PubMed IDs keyed by file name to be used in the evidence
+        for the Statements extracted from each file. Default: None
+    organism_priority : Optional[list of str]
+        A list of Taxonomy IDs providing prioritization among organisms
+        when choosing protein grounding. If not given, the default behavior
+        takes the first match produced by Reach, which is prioritized to be
+        a human protein if such a match exists.
+    poolsize : Optional[int]
+        The number of worker processes to use. If 1, the files are
+        processed in the current process. Default: the number of CPUs
+
+    Yields
+    ------
+    stmt : indra.statements.Statement
+        An INDRA Statement extracted from one of the files.
+    """
+    citations = citations if citations else {}
+    args = ((file_name, citations.get(file_name), organism_priority)
+            for file_name in file_names)
+    if poolsize == 1:
+        for arg in args:
+            yield from _process_json_file_stmts(arg)
+        return
+    # Forking is preferred where available since the workers then share
+    # the resources already loaded, e.g., for grounding
+    if 'fork' in multiprocessing.get_all_start_methods():
+        ctx = multiprocessing.get_context('fork')
+    else:
+        ctx = multiprocessing.get_context()
+    with ctx.Pool(poolsize) as pool:
+        for stmts in pool.imap(_process_json_file_stmts, args):
+            yield from stmts
+
+
+def _process_json_file_stmts(args):
+    # Return the Statements extracted from a json file in a worker
+    file_name, citation, organism_priority = args
+    rp = process_json_file(file_name, citation=citation,
+                           organism_priority=organism_priority)
+    return rp.statements if rp is not None else []
 
 
 def process_json_str(json_str, citation=None, organism_priority=None):
@@ -371,8 +433,9 @@ def process_json_str(json_str, citation=None, organism_priority=None):
 
     Parameters
     ----------
-    json_str : str
-        The json string to be processed.
+    json_str : str or bytes
+        The json string to be processed. The json can be given as bytes,
+        e.g., as returned by the REACH service, without decoding it first.
     citation : Optional[str]
         A PubMed ID passed to be used in the evidence for the extracted INDRA
         Statements. Default: None
@@ -388,17 +451,41 @@ def process_json_str(json_str, citation=None, organism_priority=None):
         A ReachProcessor containing the extracted INDRA Statements
         in rp.statements.
     """
-    fields = ['frame-id', 'argument-label', 'object-meta',
-              'doc-id', 'is-hypothesis', 'is-negated',
-              'is-direct', 'found-by']
-    for field in fields:
-        json_str = json_str.replace(field, field.replace('-', '_'))
+    json_dict = _load_reach_json(json.loads, json_str)
+    return _process_json_dict(json_dict, citation=citation,
+                              organism_priority=organism_priority)
+
+
+# Hyphenated keys in the REACH output that are renamed with underscores
+# as the ReachProcessor expects them
+_renamed_keys = {key: key.replace('-', '_') for key in
+                 ['frame-id', 'argument-label', 'object-meta',
+                  'doc-id', 'is-hypothesis', 'is-negated',
+                  'is-direct', 'found-by']}
+
+
+def _rename_hyphenated_keys(obj):
+    # Most objects don't have any of the keys to be renamed and are
+    # returned as decoded
+    if _renamed_keys.keys().isdisjoint(obj):
+        return obj
+    return {_renamed_keys.get(key, key): value for key, value in obj.items()}
+
+
+def _load_reach_json(load, source):
+    # Decode the REACH output, renaming keys as each object is decoded
+    # rather than by rewriting the whole json string up front
     try:
-        json_dict = json.loads(json_str)
+        return load(source, object_hook=_rename_hyphenated_keys)
     except ValueError as e:
         logger.error('Could not decode JSON string.')
         logger.exception(e)
         return None
+
+
+def _process_json_dict(json_dict, citation=None, organism_priority=None):
+    if json_dict is None:
+        return None
     rp = ReachProcessor(json_dict, pmid=citation,
                         organism_priority=organism_priority)
     rp.get_modifications()
@@ -47,6 +47,7 @@ class ReachProcessor(object):
     """
     def __init__(self, json_dict, pmid=None, organism_priority=None):
         self.tree = objectpath.Tree(json_dict)
+        self._index_frames(json_dict)
         self.organism_priority = organism_priority
         self.statements = []
         self.citation = pmid
@@ -60,6 +61,38 @@ class ReachProcessor(object):
                     self.citation = None
         self.get_all_events()
 
+    def _index_frames(self, json_dict):
+        # Looking up the frames referred to by each event with objectpath
+        # queries requires a scan of all the frames of the given kind per
+        # lookup so we index frames by ID and type once instead.
+        # Frames are kept in the order of the output and, as with the
+        # queries, the first frame with a given ID takes precedence.
+        self._entities_by_id = {}
+        for frame in _get_frames(json_dict, 'entities'):
+            self._entities_by_id.setdefault(frame.get('frame_id'), frame)
+        # Passages are sentence frames as well
+        self._sentences_by_id = {}
+        for frame in _get_frames(json_dict, 'sentences'):
+            self._sentences_by_id.setdefault(frame.get('frame_id'), frame)
+        self._events = _get_frames(json_dict, 'events')
+        self._events_by_type = defaultdict(list)
+        # Events by the ID of their first argument which, for regulations
+        # and activations, is the event they control
+        self._events_by_first_arg = defaultdict(list)
+        for frame in self._events:
+            self._events_by_type[frame.get('type')].append(frame)
+            args = frame.get('arguments')
+            if args:
+                self._events_by_first_arg[args[0].get('arg')].append(frame)
+
+    def _get_events_by_type(self, *event_types):
+        return [frame for event_type in event_types
+                for frame in self._events_by_type.get(event_type, [])]
+
+    def _get_controlling_events(self, frame_id, event_types):
+        return [frame for frame in self._events_by_first_arg.get(frame_id, [])
+                if frame.get('type') in event_types]
+
     def print_event_statistics(self):
         """Print the number of events in the REACH output by type."""
         logger.info('All events by type')
@@ -74,10 +107,7 @@ class ReachProcessor(object):
         These IDs are stored in the self.all_events dict.
         """
         self.all_events = {}
-        events = self.tree.execute("$.events.frames")
-        if events is None:
-            return
-        for e in events:
+        for e in self._events:
             event_type = e.get('type')
             frame_id = e.get('frame_id')
             try:
@@ -86,11 +116,7 @@ class ReachProcessor(object):
                 self.all_events[event_type] = [frame_id]
 
     def print_regulations(self):
-        qstr = "$.events.frames[(@.type is 'regulation')]"
-        res = self.tree.execute(qstr)
-        if res is None:
-            return
-        for r in res:
+        for r in self._get_events_by_type('regulation'):
             print(r['subtype'])
             for a in r['arguments']:
                 print(a['type'], '/', a['argument-type'], ':', a['text'])
@@ -98,10 +124,7 @@ class ReachProcessor(object):
     def get_modifications(self):
         """Extract Modification INDRA Statements."""
         # Find all event frames that are a type of protein modification
-        qstr = "$.events.frames[(@.type is 'protein-modification')]"
-        res = self.tree.execute(qstr)
-        if res is None:
-            return
+        res = self._get_events_by_type('protein-modification')
         # Extract each of the results when possible
         for r in res:
             # The subtype of the modification
@@ -137,10 +160,8 @@ class ReachProcessor(object):
 
                 # Now we need to look for all regulation event to get to the
                 # enzymes (the "controller" here)
-                qstr = "$.events.frames[(@.type is 'regulation') and " + \
-                       "(@.arguments[0].arg is '%s')]" % frame_id
-                reg_res = self.tree.execute(qstr)
-                reg_res = list(reg_res)
+                reg_res = self._get_controlling_events(frame_id,
+                                                       {'regulation'})
                 for reg in reg_res:
                     controller_agent, controller_coords = None, None
                     for a in reg['arguments']:
@@ -185,15 +206,7 @@ class ReachProcessor(object):
 
     def get_regulate_amounts(self):
         """Extract RegulateAmount INDRA Statements."""
-        qstr = "$.events.frames[(@.type is 'transcription')]"
-        res = self.tree.execute(qstr)
-        all_res = []
-        if res is not None:
-            all_res += list(res)
-        qstr = "$.events.frames[(@.type is 'amount')]"
-        res = self.tree.execute(qstr)
-        if res is not None:
-            all_res += list(res)
+        all_res = self._get_events_by_type('transcription', 'amount')
 
         for r in all_res:
             subtype = r.get('subtype')
@@ -211,10 +224,8 @@ class ReachProcessor(object):
             if theme is None:
                 continue
             theme_agent, theme_coords = self._get_agent_from_entity(theme)
-            qstr = "$.events.frames[((@.type is 'regulation') or "\
-                   "(@.type is 'activation')) and " + \
-                   "(@.arguments[0].arg is '%s')]" % frame_id
-            reg_res = self.tree.execute(qstr)
+            reg_res = self._get_controlling_events(
+                frame_id, {'regulation', 'activation'})
             for reg in reg_res:
                 controller_agent, controller_coords = None, None
                 for a in reg['arguments']:
@@ -237,10 +248,7 @@ class ReachProcessor(object):
 
     def get_complexes(self):
         """Extract INDRA Complex Statements."""
-        qstr = "$.events.frames[@.type is 'complex-assembly']"
-        res = self.tree.execute(qstr)
-        if res is None:
-            return
+        res = self._get_events_by_type('complex-assembly')
 
         for r in res:
             epistemics = self._get_epistemics(r)
@@ -271,10 +279,7 @@ class ReachProcessor(object):
 
     def get_activation(self):
         """Extract INDRA Activation Statements."""
-        qstr = "$.events.frames[@.type is 'activation']"
-        res = self.tree.execute(qstr)
-        if res is None:
-            return
+        res = self._get_events_by_type('activation')
         for r in res:
             epistemics = self._get_epistemics(r)
             if epistemics.get('negated'):
@@ -324,10 +329,7 @@ class ReachProcessor(object):
 
     def get_translocation(self):
         """Extract INDRA Translocation Statements."""
-        qstr = "$.events.frames[@.type is 'translocation']"
-        res = self.tree.execute(qstr)
-        if res is None:
-            return
+        res = self._get_events_by_type('translocation')
         for r in res:
             epistemics = self._get_epistemics(r)
             if epistemics.get('negated'):
@@ -359,10 +361,7 @@ class ReachProcessor(object):
             self.statements.append(st)
 
     def get_conversion(self):
-        qstr = "$.events.frames[@.type is 'conversion']"
-        res = self.tree.execute(qstr)
-        if res is None:
-            return
+        res = self._get_events_by_type('conversion')
         for r in res:
             epistemics = self._get_epistemics(r)
             if epistemics.get('negated'):
@@ -394,13 +393,8 @@ class ReachProcessor(object):
             self.statements.append(st)
 
     def _get_location_by_id(self, loc_id):
-        qstr = "$.entities.frames[(@.frame_id is \'%s\')]" % loc_id
-        res = self.tree.execute(qstr)
-        if res is None:
-            return None
-        try:
-            entity_term = next(res)
-        except StopIteration:
+        entity_term = self._entities_by_id.get(loc_id)
+        if entity_term is None:
             logger.debug(' %s is not an entity' % loc_id)
             return None
         name = entity_term.get('text')
@@ -422,13 +416,8 @@ class ReachProcessor(object):
         return None
 
     def _get_agent_from_entity(self, entity_id):
-        qstr = "$.entities.frames[(@.frame_id is \'%s\')]" % entity_id
-        res = self.tree.execute(qstr)
-        if res is None:
-            return None, None
-        try:
-            entity_term = next(res)
-        except StopIteration:
+        entity_term = self._entities_by_id.get(entity_id)
+        if entity_term is None:
             logger.debug(' %s is not an entity' % entity_id)
             return None, None
 
@@ -591,13 +580,8 @@ class ReachProcessor(object):
         sent_id = entity_term.get('sentence')
         if sent_id is None:
             return None
-        qstr = "$.sentences.frames[(@.frame_id is \'%s')]" % sent_id
-        res = self.tree.execute(qstr)
-        if res is None:
-            return None
-        try:
-            sentence = next(res)
-        except StopIteration:
+        sentence = self._sentences_by_id.get(sent_id)
+        if sentence is None:
             return None
         sent_start = sentence.get('start-pos')
         if sent_start is None:
@@ -637,11 +621,9 @@ class ReachProcessor(object):
             tissue = None
             organ = None
         else:
-            qstr = "$.entities.frames[(@.frame_id is \'%s\')]" % context_id[0]
-            res = self.tree.execute(qstr)
-            if res is None:
+            context_frame = self._entities_by_id.get(context_id[0])
+            if context_frame is None:
                 return annotations, None
-            context_frame = next(res)
             facets = context_frame['facets']
             cell_line = facets.get('cell-line')
             cell_type = facets.get('cell-type')
@@ -713,17 +695,12 @@ class ReachProcessor(object):
         sentence_id = event.get('sentence')
         section = None
         if sentence_id:
-            qstr = "$.sentences.frames[(@.frame_id is \'%s\')]" % sentence_id
-            res = self.tree.execute(qstr)
-            if res:
-                sentence_frame = list(res)[0]
+            sentence_frame = self._sentences_by_id.get(sentence_id)
+            if sentence_frame is not None:
                 passage_id = sentence_frame.get('passage')
                 if passage_id:
-                    qstr = "$.sentences.frames[(@.frame_id is \'%s\')]" % \
-                            passage_id
-                    res = self.tree.execute(qstr)
-                    if res:
-                        passage_frame = list(res)[0]
+                    passage_frame = self._sentences_by_id.get(passage_id)
+                    if passage_frame is not None:
                         section = passage_frame.get('section-id')
         # If the section is in the standard list, return as is
         if section in self._section_list:
@@ -893,6 +870,15 @@ agent_mod_map = {
 }
 
 
+def _get_frames(json_dict, key):
+    # Return the list of frames of the given kind, e.g., events, in the
+    # REACH output
+    frames = json_dict.get(key) if isinstance(json_dict, dict) else None
+    if not isinstance(frames, dict):
+        return []
+    return frames.get('frames') or []
+
+
 def _read_famplex_map():
     fname = os.path.join(os.path.dirname(os.path.abspath(__file__)),
                          '../../resources/famplex_map.tsv')
@@ -2,10 +2,12 @@ __all__ = ['Agent', 'BoundCondition', 'MutCondition', 'ModCondition',
            'ActivityCondition', 'default_ns_order']
 
 
+import sys
 import logging
 from collections import OrderedDict as _o
 from indra.statements.statements import modtype_conditions, modtype_to_modclass
 from .concept import Concept
+from .util import MatchesKeyMemo
 from .resources import get_valid_residue, activity_types, amino_acids
 
 
@@ -38,6 +40,9 @@ class Agent(Concept):
     db_refs : dict
         Dictionary of database identifiers associated with this agent.
     """
+    __slots__ = ('mods', 'bound_conditions', 'mutations', 'activity',
+                 'location')
+
     def __init__(self, name, mods=None, activity=None,
                  bound_conditions=None, mutations=None,
                  location=None, db_refs=None):
@@ -69,7 +74,7 @@ class Agent(Concept):
         self.activity = activity
         self.location = location
 
-    def matches_key(self):
+    def _make_matches_key(self):
         """Return a key to identify the identity and state of the Agent."""
         key = (self.entity_matches_key(),
                self.state_matches_key())
@@ -96,6 +101,11 @@ class Agent(Concept):
         # NOTE: Making a set of the mod matches_keys might break if
         # you have an agent with two phosphorylations at serine
         # with unknown sites.
+        # Most agents have no state other than location, in which case
+        # we format the key directly, identically to the general case below.
+        if not self.mods and not self.mutations and \
+                not self.bound_conditions and not self.activity:
+            return '([], [], None, %r, 0, ())' % (self.location,)
         act_key = (self.activity.matches_key() if self.activity else None)
         key = (sorted([m.matches_key() for m in self.mods]),
                sorted([m.matches_key() for m in self.mutations]),
@@ -302,8 +312,10 @@ class Agent(Concept):
         if not name:
             logger.error('Agent missing name.')
             return None
-        if not db_refs:
-            db_refs = {}
+        # Namespaces are interned so that the db_refs of deserialized
+        # Agents share the same key strings
+        db_refs = {sys.intern(key): val for key, val in db_refs.items()} \
+            if db_refs else {}
         agent = Agent(name, db_refs=db_refs)
         agent.mods = [ModCondition._from_json(mod) for mod in mods]
         agent.mutations = [MutCondition._from_json(mut) for mut in mutations]
@@ -342,7 +354,7 @@ class Agent(Concept):
         return '%s(%s)' % (agent_name, attr_str)
 
 
-class BoundCondition(object):
+class BoundCondition(MatchesKeyMemo):
     """Identify Agents bound (or not bound) to a given Agent in a given context.
 
     Parameters
@@ -399,7 +411,7 @@ class BoundCondition(object):
         return bc
 
 
-class MutCondition(object):
+class MutCondition(MatchesKeyMemo):
     """Mutation state of an amino acid position of an Agent.
 
     Parameters
@@ -425,7 +437,7 @@ class MutCondition(object):
     def matches(self, other):
         return (self.matches_key() == other.matches_key())
 
-    def matches_key(self):
+    def _make_matches_key(self):
         key = (str(self.position), str(self.residue_from),
                str(self.residue_to))
         return str(key)
@@ -479,7 +491,7 @@ class MutCondition(object):
         return (from_match and to_match and pos_match)
 
 
-class ModCondition(object):
+class ModCondition(MatchesKeyMemo):
     """Post-translational modification state at an amino acid position.
 
     Parameters
@@ -542,7 +554,7 @@ class ModCondition(object):
     def matches(self, other):
         return (self.matches_key() == other.matches_key())
 
-    def matches_key(self):
+    def _make_matches_key(self):
         key = (str(self.mod_type), str(self.residue),
                str(self.position), str(self.is_modified))
         return str(key)
@@ -599,7 +611,7 @@ class ModCondition(object):
         return hash(self.matches_key())
 
 
-class ActivityCondition(object):
+class ActivityCondition(MatchesKeyMemo):
     """An active or inactive state of a protein.
 
     Examples
@@ -648,7 +660,7 @@ class ActivityCondition(object):
     def matches(self, other):
         return self.matches_key() == other.matches_key()
 
-    def matches_key(self):
+    def _make_matches_key(self):
         key = (str(self.activity_type), str(self.is_active))
         return str(key)
 
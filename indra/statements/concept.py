@@ -1,5 +1,7 @@
+import sys
 import logging
 from collections import OrderedDict as _o
+from .util import get_slots_state, set_slots_state, MatchesKeyMemo
 
 
 logger = logging.getLogger(__name__)
@@ -7,7 +9,7 @@ logger = logging.getLogger(__name__)
 default_ns_order = ['WM', 'UN', 'HUME', 'SOFIA', 'CWMS']
 
 
-class Concept(object):
+class Concept(MatchesKeyMemo):
     """A concept/entity of interest that is the argument of a Statement
 
     Parameters
@@ -17,14 +19,24 @@ class Concept(object):
     db_refs : dict
         Dictionary of database identifiers associated with this concept.
     """
+    # Concepts and Agents are created in very large numbers so they use slots
+    # to avoid the memory overhead of a __dict__ for each instance.
+    __slots__ = ('name', 'db_refs')
+
     def __init__(self, name, db_refs=None):
         self.name = name
         self.db_refs = db_refs if db_refs else {}
 
+    def __getstate__(self):
+        return get_slots_state(self)
+
+    def __setstate__(self, state):
+        set_slots_state(self, state)
+
     def matches(self, other):
         return self.matches_key() == other.matches_key()
 
-    def matches_key(self):
+    def _make_matches_key(self):
         key = self.entity_matches_key()
         return str(key)
 
@@ -135,9 +147,9 @@ class Concept(object):
         # This fixes the fact that scored lists of groundings
         # are deserialized as lists of lists instead of lists
         # of tuples.
-        for key, val in db_refs.items():
-            if isinstance(val, list):
-                db_refs[key] = [tuple(v) for v in val]
+        db_refs = {sys.intern(key): ([tuple(v) for v in val]
+                                     if isinstance(val, list) else val)
+                   for key, val in db_refs.items()}
         concept = Concept(name, db_refs=db_refs)
         return concept
 
@@ -12,11 +12,12 @@ import json
 import textwrap
 from collections import OrderedDict as _o
 from .util import *
+from .util import get_slots_state, set_slots_state, MatchesKeyMemo
 from .context import Context
 
 
 @python_2_unicode_compatible
-class Evidence(object):
+class Evidence(MatchesKeyMemo):
     """Container for evidence supporting a given statement.
 
     Parameters
@@ -57,10 +58,21 @@ class Evidence(object):
         and is set by said Statement. It is useful for tracing ownership of
         an Evidence object.
     """
+    # Evidences are the most numerous objects in a corpus so they use slots
+    # to avoid the memory overhead of a __dict__ for each instance.
+    __slots__ = ('source_api', 'source_id', 'pmid', 'text_refs', 'text',
+                 'annotations', 'epistemics', 'context', 'source_hash',
+                 'stmt_tag')
+    _non_key_attrs = frozenset(['text_refs', 'context', 'source_hash',
+                                'stmt_tag'])
+
     def __init__(self, source_api=None, source_id=None, pmid=None, text=None,
                  annotations=None, epistemics=None, context=None,
                  text_refs=None):
-        self.source_api = source_api
+        # The few distinct source APIs are shared by a large number of
+        # Evidences so we make sure they don't each have their own copy
+        self.source_api = sys.intern(source_api) \
+            if isinstance(source_api, str) else source_api
         self.source_id = source_id
         self.pmid = pmid
         self.text_refs = {}
@@ -82,6 +94,9 @@ class Evidence(object):
         self.get_source_hash()
         self.stmt_tag = None
 
+    def __getstate__(self):
+        return get_slots_state(self)
+
     def __setstate__(self, state):
         if 'context' not in state:
             state['context'] = None
@@ -91,7 +106,7 @@ class Evidence(object):
             state['stmt_tag'] = None
         if 'source_hash' not in state:
             state['source_hash'] = None
-        self.__dict__ = state
+        set_slots_state(self, state)
 
     def get_source_hash(self, refresh=False):
         """Get a hash based off of the source of this statement.
@@ -110,7 +125,7 @@ class Evidence(object):
         self.source_hash = make_hash(s, 16)
         return self.source_hash
 
-    def matches_key(self):
+    def _make_matches_key(self):
         key_lst = [self.source_api, self.source_id, self.pmid,
                    self.text]
         for d in [self.annotations, self.epistemics]:
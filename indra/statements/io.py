@@ -2,8 +2,12 @@ __all__ = ['stmts_from_json', 'stmts_from_json_file', 'stmts_to_json',
            'stmts_to_json_file', 'draw_stmt_graph', 'pretty_print_stmts',
            'UnresolvedUuidError', 'InputError',
            'set_pretty_print_max_width', 'print_stmt_summary',
-           'stmt_from_json', 'stmt_from_json_str']
+           'stmt_from_json', 'stmt_from_json_str',
+           'iter_stmts_from_json_file', 'write_stmts_jsonl',
+           'iter_stmts_from_msgpack_file', 'stmts_from_msgpack_file',
+           'write_stmts_msgpack', 'resolve_support']
 
+import gzip
 import json
 import logging
 import os
@@ -17,6 +21,10 @@ from indra.statements.statements import Statement, Unresolved
 logger = logging.getLogger(__name__)
 
 
+# The version of the binary msgpack format written by write_stmts_msgpack
+MSGPACK_FORMAT_VERSION = 1
+
+
 def stmts_from_json(json_in, on_missing_support='handle'):
     """Get a list of Statements from Statement jsons.
 
@@ -52,20 +60,51 @@ def stmts_from_json(json_in, on_missing_support='handle'):
         A list of INDRA Statements.
     """
 
-    stmts = []
-    uuid_dict = {}
+    stmts = list(_iter_stmts_from_json(json_in))
+    resolve_support(stmts, on_missing_support)
+    return stmts
+
+
+def resolve_support(stmts, on_missing_support='handle'):
+    """Replace the support uuids of Statements with the Statements they refer
+    to.
+
+    Statements deserialized one by one, e.g., by
+    :py:func:`iter_stmts_from_json_file`, have the uuids of the Statements
+    they support and are supported by in their `supports` and `supported_by`
+    lists. Once all the Statements are loaded, this function links them
+    in a second pass, in place.
+
+    Parameters
+    ----------
+    stmts : list[:py:class:`Statement`]
+        A list of INDRA Statements whose support uuids are resolved.
+    on_missing_support : Optional[str]
+        Handles the behavior when a uuid reference in `supports` or
+        `supported_by` attribute cannot be resolved, see
+        :py:func:`stmts_from_json` for the options. Default: 'handle'
+
+    Returns
+    -------
+    stmts : list[:py:class:`Statement`]
+        The list of INDRA Statements given as input.
+    """
+    uuid_dict = {st.uuid: st for st in stmts}
+    for st in stmts:
+        _promote_support(st.supports, uuid_dict, on_missing_support)
+        _promote_support(st.supported_by, uuid_dict, on_missing_support)
+    return stmts
+
+
+def _iter_stmts_from_json(json_in):
+    # Deserialize statements one by one without resolving support uuids
     for json_stmt in json_in:
         try:
             st = Statement._from_json(json_stmt)
         except Exception as e:
             logger.warning("Error creating statement: %s" % e)
             continue
-        stmts.append(st)
-        uuid_dict[st.uuid] = st
-    for st in stmts:
-        _promote_support(st.supports, uuid_dict, on_missing_support)
-        _promote_support(st.supported_by, uuid_dict, on_missing_support)
-    return stmts
+        yield st
 
 
 def stmt_from_json(json_in):
@@ -103,6 +142,7 @@ def stmt_from_json_str(json_in):
 
 def stmts_from_json_file(
     fname: Union[str, pathlib.Path, os.PathLike], format='json',
+    compression='infer',
 ):
     """Return a list of statements loaded from a JSON file.
 
@@ -113,24 +153,64 @@ def stmts_from_json_file(
     format : Optional[str]
         One of 'json' to assume regular JSON formatting or
         'jsonl' assuming each statement is on a new line.
+    compression : Optional[str]
+        One of 'gzip', 'zstd' or None if the file isn't compressed. By
+        default, the compression is inferred from the extension of the file
+        name, .gz for gzip and .zst for zstd.
 
     Returns
     -------
     list[indra.statements.Statement]
         The list of INDRA Statements loaded from the JSOn file.
     """
-    with open(fname, 'r') as fh:
+    stmts = list(iter_stmts_from_json_file(fname, format=format,
+                                           compression=compression))
+    return resolve_support(stmts)
+
+
+def iter_stmts_from_json_file(
+    fname: Union[str, pathlib.Path, os.PathLike], format='jsonl',
+    compression='infer',
+):
+    """Yield statements loaded one by one from a JSON file.
+
+    Statements in JSONL files are deserialized as the file is read, so
+    the file is never loaded into memory as a whole. The uuids in the
+    `supports` and `supported_by` lists of the statements aren't resolved,
+    this can be done once all the statements are loaded using
+    :py:func:`resolve_support`.
+
+    Parameters
+    ----------
+    fname :
+        Path to the JSON file to load statements from.
+    format : Optional[str]
+        One of 'jsonl' assuming each statement is on a new line or 'json'
+        to assume regular JSON formatting, in which case the file is loaded
+        as a whole before statements are yielded. Default: 'jsonl'
+    compression : Optional[str]
+        One of 'gzip', 'zstd' or None if the file isn't compressed. By
+        default, the compression is inferred from the extension of the file
+        name, .gz for gzip and .zst for zstd.
+
+    Yields
+    ------
+    indra.statements.Statement
+        The INDRA Statements loaded from the JSON file.
+    """
+    with _open_file(fname, 'rt', compression) as fh:
         if format == 'json':
-            return stmts_from_json(json.load(fh))
+            yield from _iter_stmts_from_json(json.load(fh))
         else:
-            return stmts_from_json([json.loads(line)
-                                    for line in fh.readlines()])
+            yield from _iter_stmts_from_json(json.loads(line)
+                                             for line in fh if line.strip())
 
 
 def stmts_to_json_file(
     stmts,
     fname: Union[str, pathlib.Path, os.PathLike],
     format='json',
+    compression='infer',
     **kwargs,
 ):
     """Serialize a list of INDRA Statements into a JSON file.
@@ -144,15 +224,202 @@ def stmts_to_json_file(
     format : Optional[str]
         One of 'json' to use regular JSON with indent=1 formatting or
         'jsonl' to put each statement on a new line without indents.
+    compression : Optional[str]
+        One of 'gzip', 'zstd' or None to not compress the file. By
+        default, the compression is inferred from the extension of the file
+        name, .gz for gzip and .zst for zstd.
     """
-    sj = stmts_to_json(stmts, **kwargs)
-    with open(fname, 'w') as fh:
-        if format == 'json':
-            json.dump(sj, fh, indent=1)
-        else:
-            for json_stmt in sj:
-                json.dump(json_stmt, fh)
-                fh.write('\n')
+    if format != 'json':
+        write_stmts_jsonl(stmts, fname, compression=compression, **kwargs)
+        return
+    # Statements are serialized one by one rather than dumping the JSON
+    # of all of them at once, the output being the same as that of
+    # json.dump(stmts_to_json(stmts), fh, indent=1)
+    with _open_file(fname, 'wt', compression) as fh:
+        first = True
+        for stmt in stmts:
+            fh.write('[\n ' if first else ',\n ')
+            stmt_json = json.dumps(stmt.to_json(**kwargs), indent=1)
+            fh.write(stmt_json.replace('\n', '\n '))
+            first = False
+        fh.write('[]' if first else '\n]')
+
+
+def write_stmts_jsonl(
+    stmts,
+    fname: Union[str, pathlib.Path, os.PathLike],
+    compression='infer',
+    **kwargs,
+):
+    """Write INDRA Statements into a JSONL file, one statement per line.
+
+    Statements are serialized and written one by one, so they can be
+    given as a generator and the JSON of all the statements is never held
+    in memory at once.
+
+    Parameters
+    ----------
+    stmts : iterable[indra.statement.Statements]
+        The INDRA Statements to write into the file.
+    fname :
+        Path to the JSONL file to write Statements into.
+    compression : Optional[str]
+        One of 'gzip', 'zstd' or None to not compress the file. By
+        default, the compression is inferred from the extension of the file
+        name, .gz for gzip and .zst for zstd.
+    **kwargs :
+        Keyword arguments passed to the to_json method of each Statement,
+        e.g., use_sbo.
+
+    Returns
+    -------
+    int
+        The number of Statements written.
+    """
+    count = 0
+    with _open_file(fname, 'wt', compression) as fh:
+        for stmt in stmts:
+            json.dump(stmt.to_json(**kwargs), fh)
+            fh.write('\n')
+            count += 1
+    return count
+
+
+def write_stmts_msgpack(
+    stmts,
+    fname: Union[str, pathlib.Path, os.PathLike],
+    compression='infer',
+    support_links=True,
+    **kwargs,
+):
+    """Write INDRA Statements into a binary file in the msgpack format.
+
+    The file consists of the msgpack-encoded JSON of each statement, which
+    is faster to write and read, and smaller than JSON. Statements are
+    written one by one, so they can be given as a generator. This requires
+    the msgpack package to be installed.
+
+    Parameters
+    ----------
+    stmts : iterable[indra.statement.Statements]
+        The INDRA Statements to write into the file.
+    fname :
+        Path to the file to write Statements into.
+    compression : Optional[str]
+        One of 'gzip', 'zstd' or None to not compress the file. By
+        default, the compression is inferred from the extension of the file
+        name, .gz for gzip and .zst for zstd.
+    support_links : Optional[bool]
+        If True, the uuids of the statements each statement supports and is
+        supported by are written along with it. If False, these are left
+        out, which saves space if the links aren't needed. Default: True
+    **kwargs :
+        Keyword arguments passed to the to_json method of each Statement,
+        e.g., use_sbo.
+
+    Returns
+    -------
+    int
+        The number of Statements written.
+    """
+    import msgpack
+    packer = msgpack.Packer()
+    count = 0
+    with _open_file(fname, 'wb', compression) as fh:
+        fh.write(packer.pack({'format': 'indra_statements',
+                              'version': MSGPACK_FORMAT_VERSION}))
+        for stmt in stmts:
+            stmt_json = stmt.to_json(**kwargs)
+            if not support_links:
+                stmt_json.pop('supports', None)
+                stmt_json.pop('supported_by', None)
+            fh.write(packer.pack(stmt_json))
+            count += 1
+    return count
+
+
+def iter_stmts_from_msgpack_file(
+    fname: Union[str, pathlib.Path, os.PathLike], compression='infer',
+):
+    """Yield statements loaded one by one from a binary msgpack file.
+
+    The uuids in the `supports` and `supported_by` lists of the statements
+    aren't resolved, this can be done once all the statements are loaded
+    using :py:func:`resolve_support`. This requires the msgpack package to
+    be installed.
+
+    Parameters
+    ----------
+    fname :
+        Path to a file written by :py:func:`write_stmts_msgpack`.
+    compression : Optional[str]
+        One of 'gzip', 'zstd' or None if the file isn't compressed. By
+        default, the compression is inferred from the extension of the file
+        name, .gz for gzip and .zst for zstd.
+
+    Yields
+    ------
+    indra.statements.Statement
+        The INDRA Statements loaded from the file.
+    """
+    import msgpack
+    with _open_file(fname, 'rb', compression) as fh:
+        unpacker = msgpack.Unpacker(fh, raw=False, strict_map_key=False)
+        header = next(unpacker, None)
+        if not isinstance(header, dict) or \
+                header.get('format') != 'indra_statements':
+            raise InputError('%s is not an INDRA Statements msgpack file.'
+                             % fname)
+        if header.get('version') != MSGPACK_FORMAT_VERSION:
+            raise InputError('Unsupported INDRA Statements msgpack file '
+                             'version: %s' % header.get('version'))
+        yield from _iter_stmts_from_json(unpacker)
+
+
+def stmts_from_msgpack_file(
+    fname: Union[str, pathlib.Path, os.PathLike], compression='infer',
+    on_missing_support='handle',
+):
+    """Return a list of statements loaded from a binary msgpack file.
+
+    Parameters
+    ----------
+    fname :
+        Path to a file written by :py:func:`write_stmts_msgpack`.
+    compression : Optional[str]
+        One of 'gzip', 'zstd' or None if the file isn't compressed. By
+        default, the compression is inferred from the extension of the file
+        name, .gz for gzip and .zst for zstd.
+    on_missing_support : Optional[str]
+        Handles the behavior when a uuid reference in `supports` or
+        `supported_by` attribute cannot be resolved, see
+        :py:func:`stmts_from_json` for the options. Default: 'handle'
+
+    Returns
+    -------
+    list[indra.statements.Statement]
+        The list of INDRA Statements loaded from the file.
+    """
+    stmts = list(iter_stmts_from_msgpack_file(fname,
+                                              compression=compression))
+    return resolve_support(stmts, on_missing_support)
+
+
+def _open_file(fname, mode, compression='infer'):
+    """Open a file for reading or writing, optionally (de)compressing it."""
+    if compression == 'infer':
+        suffix = pathlib.Path(fname).suffix
+        compression = {'.gz': 'gzip', '.zst': 'zstd'}.get(suffix)
+    text_kwargs = {'encoding': 'utf-8'} if 't' in mode else {}
+    if compression is None:
+        return open(fname, mode, **text_kwargs)
+    elif compression == 'gzip':
+        return gzip.open(fname, mode, **text_kwargs)
+    elif compression == 'zstd':
+        import zstandard
+        return zstandard.open(fname, mode, **text_kwargs)
+    raise InputError('Invalid compression: %s, the options are gzip, zstd '
+                     'or None.' % compression)
 
 
 def stmts_to_json(stmts_in, use_sbo=False, matches_fun=None):
@@ -230,7 +230,10 @@ __all__ = [
     'modclass_to_modtype', 'modtype_conditions', 'modtype_to_inverse',
     'modclass_to_inverse', 'get_statement_by_name', 'make_hash', 'stmt_type',
     'default_ns_order', 'mk_str', 'pretty_print_stmts', 'print_stmt_summary',
-    'set_pretty_print_max_width'
+    'set_pretty_print_max_width', 'get_hashes', 'iter_stmts_from_json_file',
+    'write_stmts_jsonl', 'iter_stmts_from_msgpack_file',
+    'stmts_from_msgpack_file', 'write_stmts_msgpack', 'resolve_support',
+    'invalidate_matches_keys'
     ]
 
 import abc
@@ -242,6 +245,7 @@ import itertools
 from copy import deepcopy
 from collections import Counter, OrderedDict as _o
 from .util import *
+from .util import MatchesKeyMemo, get_matches_epoch, renew_matches_epoch
 from .concept import *
 from .context import *
 from .evidence import *
@@ -257,7 +261,7 @@ except NameError:  # Python 3
     basestring = str
 
 
-class Statement(object):
+class Statement(MatchesKeyMemo):
     """The parent class of all statements.
 
     Parameters
@@ -274,6 +278,8 @@ class Statement(object):
     """
 
     _agent_order = NotImplemented
+    # Public attributes that matches keys don't depend on
+    _non_key_attrs = frozenset(['belief', 'uuid', 'supports', 'supported_by'])
 
     def __init__(self, evidence=None, supports=None, supported_by=None):
         if evidence is None:
@@ -330,42 +336,66 @@ class Statement(object):
         refresh : bool
             Used to get a new copy of the hash. Default is false, so the hash,
             if it has been already created, will be read from the attribute.
-            This is primarily used for speed testing.
+            This also invalidates memoized matches keys, which is needed
+            after Agents or Evidence were changed in place.
         matches_fun : Optional[function]
             A function which takes a Statement as argument and returns a string
             matches key which is then hashed. If not provided the Statement's
-            built-in matches_key method is used.
+            built-in matches_key method is used. The hash calculated with a
+            given matches function is cached until the same function is
+            given again, as long as matches keys haven't been invalidated in
+            the meantime (see
+            :py:func:`invalidate_matches_keys`).
 
         Returns
         -------
         hash : int
             A long integer hash.
         """
+        if refresh:
+            renew_matches_epoch()
+        return self._get_hash(shallow, refresh, matches_fun)
+
+    def _get_hash(self, shallow, refresh, matches_fun):
+        kind = '_shallow_hash' if shallow else '_full_hash'
+        # The cached hash is returned if it was calculated with the same
+        # matches function. Hashes calculated with the built-in matches key
+        # are kept until they are refreshed while ones calculated with a
+        # custom matches function are only valid until matches keys are
+        # invalidated since we can't tell what they depend on.
+        cached = self.__dict__.get(kind)
+        if cached is not None and not refresh and \
+                matches_fun is self.__dict__.get(kind + '_fun') and \
+                (matches_fun is None or
+                 self.__dict__.get(kind + '_epoch') == get_matches_epoch()):
+            return cached
+        epoch = get_matches_epoch() if matches_fun else None
+        matches_key = matches_fun(self) if matches_fun else \
+            self.matches_key()
         if shallow:
-            # If the hash attribute is missing or we want to refresh it, or
-            # we are passing in a custom matches function (since we don't know
-            # if the cached value is consistent with it), then we
-            # recalculate the hash. Otherwise we just return the cached value.
-            if not hasattr(self, '_shallow_hash') or self._shallow_hash is None \
-                    or refresh or matches_fun:
-                matches_key = matches_fun(self) if matches_fun else \
-                    self.matches_key()
-                self._shallow_hash = make_hash(matches_key, 14)
-            ret = self._shallow_hash
+            new_hash = make_hash(matches_key, 14)
         else:
-            # If the hash attribute is missing or we want to refresh it, or
-            # we are passing in a custom matches function (since we don't know
-            # if the cached value is consistent with it), then we
-            # recalculate the hash. Otherwise we just return the cached value.
-            if not hasattr(self, '_full_hash') or self._full_hash is None \
-                    or refresh or matches_fun:
-                ev_mk_list = sorted([ev.matches_key() for ev in self.evidence])
-                matches_key = matches_fun(self) if matches_fun else \
-                    self.matches_key()
-                self._full_hash = \
-                    make_hash(matches_key + str(ev_mk_list), 16)
-            ret = self._full_hash
-        return ret
+            ev_mk_list = sorted([ev.matches_key() for ev in self.evidence])
+            new_hash = make_hash(matches_key + str(ev_mk_list), 16)
+        self.__dict__[kind] = new_hash
+        self.__dict__[kind + '_fun'] = matches_fun
+        self.__dict__[kind + '_epoch'] = epoch
+        return new_hash
+
+    def __getstate__(self):
+        # The matches functions that cached hashes were calculated with
+        # aren't necessarily picklable (e.g., lambdas) so they are dropped
+        # along with the hashes calculated with them, which are then
+        # recalculated when next requested.
+        state = self.__dict__
+        if state.get('_shallow_hash_fun') is not None or \
+                state.get('_full_hash_fun') is not None:
+            state = state.copy()
+            for kind in ('_shallow_hash', '_full_hash'):
+                state.pop(kind + '_epoch', None)
+                if state.pop(kind + '_fun', None) is not None:
+                    state[kind] = None
+        return state
 
     def _tag_evidence(self):
         """Set all the Evidence stmt_tag to my deep matches-key hash."""
@@ -613,6 +643,10 @@ class Statement(object):
         my_belief = kwargs.pop('belief', 1)
         my_hash = kwargs.pop('_full_hash', None)
         my_shallow_hash = kwargs.pop('_shallow_hash', None)
+        my_hash_fun = kwargs.pop('_full_hash_fun', None)
+        my_shallow_hash_fun = kwargs.pop('_shallow_hash_fun', None)
+        my_hash_epoch = kwargs.pop('_full_hash_epoch', None)
+        my_shallow_hash_epoch = kwargs.pop('_shallow_hash_epoch', None)
         for attr in self._agent_order:
             attr_value = kwargs.get(attr)
             if isinstance(attr_value, list):
@@ -620,6 +654,10 @@ class Statement(object):
         new_instance = self.__class__(**kwargs)
         new_instance._full_hash = my_hash
         new_instance._shallow_hash = my_shallow_hash
+        new_instance._full_hash_fun = my_hash_fun
+        new_instance._shallow_hash_fun = my_shallow_hash_fun
+        new_instance._full_hash_epoch = my_hash_epoch
+        new_instance._shallow_hash_epoch = my_shallow_hash_epoch
         new_instance.belief = my_belief
         return new_instance
 
@@ -2678,6 +2716,41 @@ def stmt_type(obj, mk=True):
         return type(obj).__name__
 
 
+def get_hashes(stmts, shallow=True, refresh=False, matches_fun=None):
+    """Return the hashes of a list of Statements.
+
+    Hashes are the same as the ones returned by
+    :py:meth:`Statement.get_hash` for each statement. When full hashes are
+    calculated, the matches keys of Evidence objects appearing in multiple
+    statements (e.g., after evidence is flattened) are only built once.
+
+    Parameters
+    ----------
+    stmts : list[indra.statements.Statement]
+        The statements whose hashes are returned.
+    shallow : Optional[bool]
+        If True, shallow hashes are returned, otherwise full hashes including
+        evidence. Default: True
+    refresh : Optional[bool]
+        If True, hashes are recalculated even if cached. Default: False
+    matches_fun : Optional[function]
+        A function which takes a Statement as argument and returns a string
+        matches key which is then hashed. If not provided the Statements'
+        built-in matches_key method is used.
+
+    Returns
+    -------
+    list[int]
+        The hashes of the statements.
+    """
+    # Invalidating memoized matches keys once rather than for each statement
+    # lets the matches keys of shared Agents and Evidence be reused.
+    if refresh:
+        renew_matches_epoch()
+    # noinspection PyProtectedMember
+    return [stmt._get_hash(shallow, refresh, matches_fun) for stmt in stmts]
+
+
 def mk_str(mk):
     """Replace class path for backwards compatibility of matches keys."""
     return str(mk).replace('indra.statements.statements', 'indra.statements')
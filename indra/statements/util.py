@@ -3,9 +3,10 @@ from builtins import dict, str
 from future.utils import python_2_unicode_compatible
 
 
-__all__ = ['make_hash']
+__all__ = ['make_hash', 'invalidate_matches_keys']
 
 
+import threading
 from hashlib import md5
 
 
@@ -13,4 +14,146 @@ def make_hash(s, n_bytes):
     """Make the hash from a matches key."""
     raw_h = int(md5(s.encode('utf-8')).hexdigest()[:n_bytes], 16)
     # Make it a signed int.
-    return 16**n_bytes//2 - raw_h
\ No newline at end of file
+    return 16**n_bytes//2 - raw_h
+
+
+# Memoized matches keys, and hashes calculated with custom matches functions,
+# are only valid as long as this counter doesn't change.
+_matches_epoch = 0
+# Whether anything was memoized since the counter last changed
+_memoized = False
+_memo_lock = threading.Lock()
+
+
+def invalidate_matches_keys():
+    """Invalidate all memoized matches keys.
+
+    Matches keys of Agents, Evidence and conditions, as well as Statement
+    hashes calculated with a custom matches function, are memoized. They are
+    invalidated automatically when an attribute that they depend on is
+    reassigned, but not when a mutable attribute is changed in place (e.g.,
+    ``agent.db_refs['HGNC'] = '6840'``), after which this function (or
+    :py:meth:`Statement.get_hash` with refresh=True) has to be called.
+    """
+    global _matches_epoch, _memoized
+    with _memo_lock:
+        if _memoized:
+            _memoized = False
+            del MatchesKeyMemo.__setattr__
+        _matches_epoch += 1
+
+
+def renew_matches_epoch():
+    """Invalidate all memoized matches keys and return the new epoch.
+
+    Unlike :py:func:`invalidate_matches_keys`, this keeps attributes being
+    intercepted, which is faster when values are memoized again right away.
+    """
+    global _matches_epoch
+    with _memo_lock:
+        _matches_epoch += 1
+        _intercept_setattr()
+        return _matches_epoch
+
+
+def get_matches_epoch():
+    """Return the epoch that values memoized now are valid for.
+
+    The epoch changes whenever matches keys are invalidated.
+    """
+    # The epoch is read before the flag so that a value memoized while
+    # matches keys are being invalidated is never taken to be valid.
+    epoch = _matches_epoch
+    if _memoized:
+        return epoch
+    with _memo_lock:
+        _intercept_setattr()
+        return _matches_epoch
+
+
+def _intercept_setattr():
+    # Called with the lock held. Attributes of the objects that matches keys
+    # depend on are intercepted from now on until the epoch changes.
+    global _memoized
+    if not _memoized:
+        MatchesKeyMemo.__setattr__ = _invalidating_setattr
+        _memoized = True
+
+
+def _invalidating_setattr(self, name, value):
+    if name[0] != '_' and name not in self._non_key_attrs:
+        invalidate_matches_keys()
+    object.__setattr__(self, name, value)
+
+
+class MatchesKeyMemo(object):
+    """Base class for objects which memoize their matches key.
+
+    Subclasses implement _make_matches_key, whose value is returned by
+    matches_key until memoized matches keys are invalidated, see
+    :py:func:`invalidate_matches_keys`. Reassigning an attribute of any of
+    these objects that isn't listed in _non_key_attrs invalidates them. Since
+    these objects are created in very large numbers, setting attributes
+    is only intercepted while anything is memoized, and not, e.g., while a
+    corpus is being loaded.
+    """
+    __slots__ = ('_matches_key_memo',)
+    # Public attributes that the matches key doesn't depend on
+    _non_key_attrs = frozenset()
+
+    def matches_key(self):
+        memo = getattr(self, '_matches_key_memo', None)
+        if memo is not None and memo[0] == _matches_epoch:
+            return memo[1]
+        epoch = get_matches_epoch()
+        key = self._make_matches_key()
+        object.__setattr__(self, '_matches_key_memo', (epoch, key))
+        return key
+
+    def _make_matches_key(self):
+        raise NotImplementedError()
+
+
+def get_slots_state(obj):
+    """Return the attributes of an object using slots as a dict.
+
+    The returned dict is the same as what the __dict__ of the object would
+    be if it didn't use slots, which keeps pickles of slotted classes
+    compatible with pickles of their earlier, non-slotted versions.
+    """
+    state = dict(getattr(obj, '__dict__', {}))
+    for attr in _all_slots(type(obj)):
+        if hasattr(obj, attr):
+            state[attr] = getattr(obj, attr)
+    return state
+
+
+def set_slots_state(obj, state):
+    """Set the attributes of an object using slots from a dict.
+
+    Entries which can't be set on the object, e.g., attributes of earlier
+    versions of its class, are ignored.
+    """
+    for attr, val in state.items():
+        try:
+            setattr(obj, attr, val)
+        except AttributeError:
+            pass
+
+
+def _all_slots(cls):
+    slots = _slots_by_class.get(cls)
+    if slots is None:
+        slots = []
+        for base in reversed(cls.__mro__):
+            base_slots = base.__dict__.get('__slots__', ())
+            if isinstance(base_slots, str):
+                base_slots = (base_slots,)
+            slots += [attr for attr in base_slots
+                      if attr not in ('__dict__', '__weakref__',
+                                      '_matches_key_memo')]
+        slots = _slots_by_class[cls] = tuple(slots)
+    return slots
+
+
+_slots_by_class = {}
@@ -1,6 +1,10 @@
+import os
+import tempfile
 from indra.statements import *
-from indra.tools.adaptive_assembly import AdaptiveAssembler
-from indra.preassembler import OntologyRefinementFilter, \
+from indra.belief import BeliefEngine
+from indra.tools.adaptive_assembly import AdaptiveAssembler, \
+    IncrementalAssembler
+from indra.preassembler import Preassembler, OntologyRefinementFilter, \
     RefinementConfirmationFilter
 from indra.ontology.bio import bio_ontology
 
@@ -40,3 +44,63 @@ def test_adaptive_assembly():
     test_refinements = aa.get_more_specifics(test_stmt)
     # All of these are refinements
     assert test_refinements == set()
+
+
+def test_incremental_assembly():
+    erk = Agent('ERK', db_refs={'FPLX': 'ERK'})
+    mek = Agent('MEK', db_refs={'FPLX': 'MEK'})
+    mapk = Agent('MAPK', db_refs={'FPLX': 'MAPK'})
+    mapk1 = Agent('MAPK1', db_refs={'HGNC': '6871'})
+
+    filters = [
+        OntologyRefinementFilter(ontology=bio_ontology),
+        RefinementConfirmationFilter(ontology=bio_ontology),
+    ]
+    ia = IncrementalAssembler(filters)
+    batch1 = [
+        Phosphorylation(mek, erk,
+                        evidence=[Evidence(source_api='reach', text='1')]),
+        Phosphorylation(mek, mapk,
+                        evidence=[Evidence(source_api='reach', text='2')]),
+    ]
+    erk_hash, mapk_hash = [stmt.get_hash() for stmt in batch1]
+    affected = ia.add_statements(batch1)
+    assert len(affected) == 2
+    assert set(ia.refinements_graph.edges()) == {(mapk_hash, erk_hash)}
+
+    # A duplicate with one new evidence and a new more specific statement
+    batch2 = [
+        Phosphorylation(mek, erk,
+                        evidence=[Evidence(source_api='reach', text='1'),
+                                  Evidence(source_api='reach', text='3')]),
+        Phosphorylation(mek, mapk1,
+                        evidence=[Evidence(source_api='reach', text='4')]),
+    ]
+    mapk1_hash = batch2[1].get_hash()
+    affected = ia.add_statements(batch2)
+    # The ERK and MAPK1 statements changed and the MAPK statement is
+    # refined by both
+    assert {stmt.get_hash() for stmt in affected} == \
+        {erk_hash, mapk_hash, mapk1_hash}
+    assert set(ia.refinements_graph.edges()) == \
+        {(mapk_hash, erk_hash), (mapk_hash, mapk1_hash),
+         (erk_hash, mapk1_hash)}
+    assert len(ia.stmts_by_hash[erk_hash].evidence) == 2
+    assert [stmt.get_hash() for stmt in ia.get_statements()] == [mapk1_hash]
+
+    # Beliefs match those of assembling all statements at once
+    pa = Preassembler(bio_ontology, batch1 + batch2)
+    all_stmts = pa.combine_related(return_toplevel=False)
+    BeliefEngine().set_hierarchy_probs(all_stmts)
+    for stmt in all_stmts:
+        assert abs(ia.stmts_by_hash[stmt.get_hash()].belief - stmt.belief) \
+            < 1e-9
+
+    fname = os.path.join(tempfile.mkdtemp(), 'assembler.pkl')
+    ia.save(fname)
+    ia2 = IncrementalAssembler.load(fname)
+    assert set(ia2.refinements_graph.edges()) == \
+        set(ia.refinements_graph.edges())
+    assert [stmt.get_hash() for stmt in
+            ia2.stmts_by_hash[mapk_hash].supports] == \
+        [stmt.get_hash() for stmt in ia.stmts_by_hash[mapk_hash].supports]
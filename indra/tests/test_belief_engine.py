@@ -3,7 +3,7 @@ from nose.tools import raises
 from indra.statements import *
 from indra.belief import BeliefEngine, load_default_probs, \
     sample_statements, evidence_random_noise_prior, tag_evidence_subtype, \
-    SimpleScorer
+    SimpleScorer, build_refinements_graph, get_ev_for_stmts_from_supports
 from indra.belief import BayesianScorer
 
 default_probs = load_default_probs()
@@ -126,6 +126,33 @@ def test_hierarchy_probs4():
     assert_close_enough(st4.belief, 1-0.35*(0.05 + 0.3*0.3*0.3))
 
 
+def test_score_hierarchy():
+    evs = [Evidence(source_api=source, text=str(idx),
+                    epistemics={'negated': True} if idx == 4 else {})
+           for idx, source in enumerate(['reach', 'trips', 'biopax'] * 3)]
+    stmts = [Phosphorylation(None, Agent(name), evidence=evs[idx:idx + 2])
+             for idx, name in enumerate('abcde')]
+    # A diamond of refinements with a shared refinement at the bottom
+    stmts[4].supports = [stmts[3], stmts[2]]
+    stmts[3].supports = [stmts[1], stmts[0]]
+    stmts[2].supports = [stmts[1], stmts[0]]
+    stmts[1].supports = [stmts[0]]
+    scorer = SimpleScorer()
+    graph = build_refinements_graph(stmts)
+    expected = scorer.score_statements(
+        stmts, get_ev_for_stmts_from_supports(stmts, graph))
+    beliefs = scorer.score_hierarchy(stmts, graph)
+    for belief, expected_belief in zip(beliefs, expected):
+        assert_close_enough(belief, expected_belief)
+    # Evidence shared between statements is only counted once
+    stmts[4].evidence.append(evs[0])
+    expected = scorer.score_statements(
+        stmts, get_ev_for_stmts_from_supports(stmts, graph))
+    beliefs = scorer.score_hierarchy(stmts, graph)
+    for belief, expected_belief in zip(beliefs, expected):
+        assert_close_enough(belief, expected_belief)
+
+
 def test_default_probs():
     """Make sure default probs are set with empty constructor."""
     be = BeliefEngine()
@@ -341,6 +368,28 @@ def test_bayesian_scorer():
     assert scorer.subtype_probs['eidos']['rule2'] == 0.75
 
 
+def test_score_evidence_lists():
+    prior_probs = {'rand': {'new_source': 0.1, 'other_source': 0.3},
+                   'syst': {'new_source': 0.05, 'other_source': 0.01}}
+    subtype_probs = {'biopax': {'pc11': 0.2}}
+    sources = ['new_source', 'other_source', 'reach', 'biopax']
+    evs = [Evidence(source_api=source, text=str(idx),
+                    annotations={'source_sub_id': 'pc11'}
+                    if source == 'biopax' and idx % 2 else {},
+                    epistemics={'negated': True} if idx % 5 == 0 else {})
+           for idx, source in enumerate(sources * 10)]
+    evidence_lists = [[], evs[:1], evs[:3], evs[5:6], evs[3:20], evs,
+                      evs[::-1], []]
+    scorer = SimpleScorer(prior_probs, subtype_probs)
+    beliefs = scorer.score_evidence_lists(evidence_lists)
+    assert beliefs == [scorer.score_evidence_list(evidences)
+                       for evidences in evidence_lists]
+    assert beliefs[0] == 0
+    assert beliefs[3] == 0
+    assert scorer.score_evidence_lists([]) == []
+    assert scorer.score_evidence_lists([[], []]) == [0, 0]
+
+
 @raises(AssertionError)
 def test_cycle():
     st1 = Phosphorylation(Agent('B'), Agent('A1'))
@@ -1,12 +1,19 @@
+import os
+import json
 import random
+import tempfile
 import unittest
 from datetime import datetime
 from time import sleep
+from threading import Thread
 from unittest import SkipTest
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 
 from nose.plugins.attrib import attr
 from indra.sources import indra_db_rest as dbr
 from indra.sources.indra_db_rest.api import get_statement_queries
+from indra.sources.indra_db_rest.processor import DBQueryHashProcessor
 from indra.sources.indra_db_rest.query import HasAgent, HasEvidenceBound
 from indra.statements import Agent, Phosphorylation
 
@@ -343,3 +350,137 @@ def test_namespace_only_agent_query():
     assert all(any("CHEBI" in ag.db_refs for ag in s.agent_list())
                and any(ag.db_refs.get("FPLX") == "MEK" for ag in s.agent_list())
                for s in p.statements)
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Serve pages of statements like the query endpoint of the REST API."""
+    page_size = 7
+    stmt_jsons = [Phosphorylation(Agent('A%d' % i), Agent('B')).to_json()
+                  for i in range(60)]
+    requests = []
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        data = json.loads(self.rfile.read(int(self.headers['content-length'])))
+        self.requests.append((url.path, params))
+        if url.path.endswith('compile/string'):
+            return self._respond(b'a stand-in query')
+        stmt_jsons = self.stmt_jsons
+        hashes = data['query'].get('constraint', {}).get('stmt_hashes')
+        if hashes is not None:
+            stmt_jsons = [sj for sj in stmt_jsons
+                          if int(sj['matches_hash']) in set(hashes)]
+        offset = int(params.get('offset', 0))
+        limit = int(params['limit']) if 'limit' in params else None
+        end = min(offset + self.page_size, len(stmt_jsons))
+        if limit is not None:
+            end = min(end, offset + limit)
+        page = {int(sj['matches_hash']): sj
+                for sj in stmt_jsons[offset:end]}
+        result_type = url.path.split('/')[-1]
+        resp = {'limit': limit, 'offset': offset,
+                'next_offset': end if end < len(stmt_jsons) or
+                (limit is not None and len(page) == limit) else None,
+                'query_json': data['query'],
+                'evidence_counts': {str(h): 1 for h in page},
+                'belief_scores': {str(h): 1.0 for h in page},
+                'source_counts': {str(h): {'reach': 1} for h in page},
+                'total_evidence': len(page),
+                'result_type': result_type, 'offset_comp': len(page)}
+        if result_type == 'statements':
+            resp['results'] = {str(h): sj for h, sj in page.items()}
+            resp['returned_evidence'] = len(page)
+        else:
+            resp['results'] = list(page)
+        self._respond(json.dumps(resp).encode('utf-8'))
+
+    def _respond(self, content):
+        self.send_response(200)
+        self.send_header('content-length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+def _run_with_stand_in_server(test_fun):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StandInHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    old_env = {key: os.environ.get(key)
+               for key in ['INDRA_DB_REST_URL', 'INDRA_DB_REST_CACHE_DIR']}
+    os.environ['INDRA_DB_REST_URL'] = 'http://127.0.0.1:%d' % \
+        server.server_address[1]
+    try:
+        _StandInHandler.requests = []
+        test_fun()
+    finally:
+        server.shutdown()
+        server.server_close()
+        for key, val in old_env.items():
+            if val is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = val
+
+
+def test_concurrent_paging():
+    def test_fun():
+        expected = [sj['matches_hash'] for sj in _StandInHandler.stmt_jsons]
+        for max_concurrency in (1, 3):
+            p = dbr.get_statements_from_query(
+                HasAgent('B'), max_concurrency=max_concurrency)
+            assert [str(s.get_hash()) for s in p.statements] == expected
+            p = dbr.get_statements_from_query(
+                HasAgent('B'), limit=30, max_concurrency=max_concurrency)
+            assert [str(s.get_hash()) for s in p.statements] == expected[:30]
+        p = DBQueryHashProcessor(HasAgent('B'), max_concurrency=4)
+        assert [str(h) for h in p.hashes] == expected
+    _run_with_stand_in_server(test_fun)
+
+
+def test_response_cache():
+    def test_fun():
+        os.environ['INDRA_DB_REST_CACHE_DIR'] = tempfile.mkdtemp()
+        # Pages are requested one at a time since concurrently requested
+        # pages past the last one may or may not have been requested
+        p = dbr.get_statements_from_query(HasAgent('B'), timeout=10,
+                                          max_concurrency=1)
+        query_requests = [r for r, _ in _StandInHandler.requests
+                          if r.startswith('/query')]
+        assert len(query_requests) >= 9, query_requests
+        _StandInHandler.requests = []
+        p2 = dbr.get_statements_from_query(HasAgent('B'), timeout=10,
+                                           max_concurrency=1)
+        assert not _StandInHandler.requests, _StandInHandler.requests
+        assert [s.get_hash() for s in p2.statements] == \
+            [s.get_hash() for s in p.statements]
+    _run_with_stand_in_server(test_fun)
+
+
+def test_get_statements_by_hash_bulk():
+    def test_fun():
+        os.environ['INDRA_DB_REST_CACHE_DIR'] = tempfile.mkdtemp()
+        all_hashes = [int(sj['matches_hash'])
+                      for sj in _StandInHandler.stmt_jsons]
+        hashes = all_hashes[40:] + all_hashes[:10] + all_hashes[45:50] + [1]
+        p = dbr.get_statements_by_hash_bulk(hashes, batch_size=8,
+                                            max_concurrency=3)
+        expected = all_hashes[40:] + all_hashes[:10]
+        assert [s.get_hash() for s in p.statements] == expected
+        assert set(p.get_ev_counts()) == set(expected)
+        assert set(p.get_belief_scores()) == set(expected)
+        assert p.get_source_count_by_hash(expected[0]) == {'reach': 1}
+        # The 31 unique hashes are requested in 4 batches, the first 3 of
+        # which have 2 pages of results with the stand-in's page size of 7
+        query_requests = [r for r, _ in _StandInHandler.requests
+                          if r.startswith('/query')]
+        assert len(query_requests) == 7, query_requests
+
+        # Only the hashes missing from the cache are requested again
+        _StandInHandler.requests = []
+        p = dbr.get_statements_by_hash_bulk(all_hashes[:12], batch_size=8)
+        assert [s.get_hash() for s in p.statements] == all_hashes[:12]
+        assert len(_StandInHandler.requests) == 1
+    _run_with_stand_in_server(test_fun)
@@ -2,7 +2,7 @@ from indra.preassembler.grounding_mapper import default_mapper as gm
 from indra.preassembler.grounding_mapper import GroundingMapper
 from indra.preassembler.grounding_mapper.analysis import *
 from indra.preassembler.grounding_mapper.gilda import ground_statements, \
-    get_gilda_models, ground_statement
+    get_gilda_models, ground_statement, get_grounding, get_groundings
 from indra.statements import Agent, Phosphorylation, Complex, Inhibition, \
     Evidence, BoundCondition
 from indra.util import unicode_strs
@@ -394,6 +394,20 @@ def test_ground_gilda():
         assert stmt.sub.db_refs['UP'] == 'P27361'
 
 
+def test_get_groundings():
+    for mode in ['web', 'local']:
+        groundings = get_groundings([('MEK', None), ('Erk1', None),
+                                     ('MEK', None)], mode=mode)
+        assert len(groundings) == 3
+        assert groundings[0][0] == {'FPLX': 'MEK'}, groundings[0]
+        assert groundings[1][0] == {'HGNC': '6877'}, groundings[1]
+        assert groundings[2] == groundings[0]
+        assert get_grounding('Erk1', mode=mode) == groundings[1]
+        # Cached groundings are copied for each caller
+        groundings[0][0]['FPLX'] = 'XXX'
+        assert get_grounding('MEK', mode=mode)[0] == {'FPLX': 'MEK'}
+
+
 def test_ground_gilda_source():
     ev1 = Evidence(source_api='reach')
     ev2 = Evidence(source_api='sparser')
@@ -541,3 +555,25 @@ def test_none_text_corner_case():
     stmt = Phosphorylation(None, ag)
     res = gm.map_stmts([stmt])
     assert res[0].sub.name == 'x', res[0]
+
+
+def test_map_stmts_reused_mappings():
+    stmts = [Phosphorylation(Agent('pkbA', db_refs={'TEXT': 'p-Akt'}),
+                             Agent('ERK1', db_refs={'TEXT': 'ERK1'}),
+                             evidence=[Evidence(text='sentence %d' % idx)])
+             for idx in range(5)] + \
+        [Complex([Agent('ERK1', db_refs={'TEXT': 'ERK1'}),
+                  Agent('FA', db_refs={'TEXT': 'FA'})])]
+    expected = [gm.map_agents_for_stmt(stmt) for stmt in stmts]
+    assert expected[-1] is None
+    expected = expected[:-1]
+    for poolsize in [None, 2]:
+        mapped_stmts = gm.map_stmts(stmts, poolsize=poolsize)
+        assert [stmt.to_json() for stmt in mapped_stmts] == \
+            [stmt.to_json() for stmt in expected]
+        # Agents mapped the same way don't share any state
+        first, second = mapped_stmts[:2]
+        assert first.enz is not second.enz
+        assert first.sub.db_refs is not second.sub.db_refs
+        first.sub.db_refs['UP'] = 'XXXXXX'
+        assert second.sub.db_refs['UP'] == 'P27361'
@@ -0,0 +1,76 @@
+import sys
+import json
+import subprocess
+
+
+# The time in seconds that importing the core modules below is allowed to
+# take in a fresh interpreter
+IMPORT_TIME_BUDGET = 3.0
+
+
+def _run_fresh(code):
+    # Run code in a fresh interpreter so that modules imported by other tests
+    # don't affect the result, and return what it printed as JSON
+    out = subprocess.check_output([sys.executable, '-c', code])
+    return json.loads(out.decode('utf-8').strip().splitlines()[-1])
+
+
+def test_import_time_budget():
+    code = ('import sys, json, time\n'
+            'ts = time.perf_counter()\n'
+            'import indra.statements\n'
+            'import indra.pipeline\n'
+            'print(json.dumps(time.perf_counter() - ts))\n')
+    # The fastest of a few runs is taken to make the test robust to noise
+    import_time = min(_run_fresh(code) for _ in range(3))
+    assert import_time < IMPORT_TIME_BUDGET, import_time
+
+
+def test_pipeline_lazy_imports():
+    code = ('import sys, json\n'
+            'from indra.pipeline import AssemblyPipeline\n'
+            'ap = AssemblyPipeline([{"function": "filter_grounded_only"}])\n'
+            'print(json.dumps(sorted(sys.modules)))\n')
+    modules = set(_run_fresh(code))
+    # Neither the registered functions nor the ontology are needed to
+    # instantiate a pipeline
+    assert 'indra.tools.assemble_corpus' not in modules
+    assert 'indra.preassembler.grounding_mapper.gilda' not in modules
+    assert 'indra.ontology.bio' not in modules
+
+    # Running a pipeline with plain string arguments only imports the
+    # module defining the function that is run
+    code = ('import sys, json\n'
+            'from indra.statements import Complex, Agent\n'
+            'from indra.pipeline import AssemblyPipeline\n'
+            'ap = AssemblyPipeline()\n'
+            'ap.append("filter_by_type", "Complex")\n'
+            'stmts = ap.run([Complex([Agent("A"), Agent("B")])])\n'
+            'assert len(stmts) == 1\n'
+            'print(json.dumps(sorted(sys.modules)))\n')
+    modules = set(_run_fresh(code))
+    assert 'indra.tools.assemble_corpus' in modules
+    assert 'indra.preassembler.grounding_mapper.gilda' not in modules
+
+
+def test_pipeline_function_lookup():
+    from indra.pipeline import AssemblyPipeline, pipeline_functions
+    func = AssemblyPipeline.get_function_from_name('filter_grounded_only')
+    assert func.__module__ == 'indra.tools.assemble_corpus'
+    assert 'agent_grounding_matches' in pipeline_functions
+    assert 'not_a_pipeline_function' not in pipeline_functions
+    assert 'ground_statements' in set(pipeline_functions)
+
+
+def test_lazy_resource_tables():
+    code = ('import json\n'
+            'from indra.databases import chebi_client, mesh_client\n'
+            'print(json.dumps(sorted(set(vars(chebi_client)) |\n'
+            '                        set(vars(mesh_client)))))\n')
+    names = set(_run_fresh(code))
+    for table in ['cas_chebi', 'hmdb_chebi', 'chebi_pubchem', '_obo_client',
+                  'mesh_id_to_name', 'mesh_to_db']:
+        assert table not in names, table
+    from indra.databases import chebi_client
+    assert chebi_client.cas_chebi['24696-26-2'] == 'CHEBI:17761'
+    assert chebi_client.get_chebi_id_from_cas('24696-26-2') == 'CHEBI:17761'
@@ -213,6 +213,24 @@ def test_to_signed_graph():
                           (float, np.longfloat)) for e in signed_graph.edges)
 
 
+def test_graphs_from_df():
+    ac = Complex([Agent('a'), Agent('c')], evidence=[
+        Evidence(source_api='reach')])
+    ia = IndraNetAssembler([ab1, ab2, ab3, ab4, bc1, bc2, bc3, bc4, ac])
+    df = ia.make_df()
+    net = IndraNet.from_df(df)
+    # Flattening the data frame directly gives the same graphs as
+    # flattening the IndraNet built from it
+    for graph, graph_from_df in [
+            (net.to_digraph(), IndraNet.digraph_from_df(df)),
+            (net.to_signed_graph(), IndraNet.signed_from_df(df))]:
+        assert dict(graph.nodes(data=True)) == \
+            dict(graph_from_df.nodes(data=True))
+        assert set(graph.edges) == set(graph_from_df.edges)
+        for e in graph.edges:
+            assert graph.edges[e] == graph_from_df.edges[e]
+
+
 def _weight_mapping(G):
     for edge in G.edges:
         G.edges[edge]['weight'] = 1 - G.edges[edge]['belief']
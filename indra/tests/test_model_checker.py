@@ -1,6 +1,7 @@
 from __future__ import absolute_import, print_function, unicode_literals
 
 import os
+import tempfile
 import unittest
 from collections import Counter
 from copy import deepcopy
@@ -510,6 +511,76 @@ def test_check_activation():
                                     ('C_kinase_active_obs', 1))]
 
 
+def test_check_activation_im_cache():
+    a = Agent('A', db_refs={'HGNC': '1'})
+    b = Agent('B', db_refs={'HGNC': '2'})
+    c = Agent('C', db_refs={'HGNC': '3'})
+    st1 = Activation(a, b)
+    st2 = Inhibition(b, c, 'kinase')
+    st3 = Activation(a, c, 'kinase')
+
+    def make_model(stmts):
+        pa = PysbAssembler()
+        pa.add_statements(stmts)
+        return pa.make_model(policies='one_step')
+
+    def get_edges(graph):
+        return sorted(graph.edges)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        mc = PysbModelChecker(make_model([st1, st2]), [st1, st2],
+                              im_cache_dir=cache_dir)
+        results = mc.check_model()
+        graph = mc.get_graph()
+        # The influence map and graph are loaded from the cache for the same
+        # model without generating the influence map
+        mc = PysbModelChecker(make_model([st1, st2]), [st1, st2],
+                              im_cache_dir=cache_dir)
+
+        def generate_im(model):
+            assert False, 'The influence map should not be generated'
+        mc.generate_im = generate_im
+        cached_results = mc.check_model()
+        assert get_edges(mc.get_graph()) == get_edges(graph)
+        assert [res.paths for _, res in cached_results] == \
+            [res.paths for _, res in results]
+
+        # When a rule is added, the cached influence map is updated
+        model = make_model([st1, st2, st3])
+        mc = PysbModelChecker(model, [st1, st2], im_cache_dir=cache_dir,
+                              update_im_incrementally=True)
+        updated_graph = mc.get_graph()
+        assert mc._im_incremental
+        mc = PysbModelChecker(make_model([st1, st2, st3]), [st1, st2])
+        assert get_edges(updated_graph) == get_edges(mc.get_graph())
+
+        # The updated influence map isn't reused without incremental updates
+        mc = PysbModelChecker(make_model([st1, st2, st3]), [st1, st2],
+                              im_cache_dir=cache_dir)
+        generated = []
+
+        def generate_im(model):
+            generated.append(model)
+            return PysbModelChecker.generate_im(mc, model)
+        mc.generate_im = generate_im
+        mc.get_graph()
+        assert len(generated) == 1
+
+        # The graph is cached for the content of the model statements, which
+        # can be rebuilt
+        model_stmts = [Activation(a, b), Inhibition(b, c, 'kinase')]
+        mc = PysbModelChecker(make_model([st1, st2]), [st1, st2],
+                              model_stmts=[st1, st2], im_cache_dir=cache_dir)
+        graph = mc.get_graph()
+        mc = PysbModelChecker(make_model([st1, st2]), [st1, st2],
+                              model_stmts=model_stmts, im_cache_dir=cache_dir)
+
+        def prune_influence_map():
+            assert False, 'The graph should be loaded from the cache'
+        mc.prune_influence_map = prune_influence_map
+        assert get_edges(mc.get_graph()) == get_edges(graph)
+
+
 def test_check_increase_grounded():
     mmp9 = Agent('MMP9', activity=ActivityCondition('catalytic', True),
                  db_refs={'HGNC': '7176', 'UP': 'P14780'})
@@ -1653,6 +1724,21 @@ def test_signed_path():
     assert stmts6 == [[st2, st7], [st5], [st8]]
 
 
+def test_signed_path_parallel():
+    ia = IndraNetAssembler(statements)
+    signed_model = ia.make_model(graph_type='signed')
+    smc = SignedGraphModelChecker(signed_model, test_statements)
+    results = smc.check_model()
+    par_smc = SignedGraphModelChecker(signed_model, test_statements)
+    par_results = par_smc.check_model(poolsize=2)
+    # Results are in the order of the statements
+    assert [stmt for stmt, _ in par_results] == test_statements
+    for (_, res), (_, par_res) in zip(results, par_results):
+        assert par_res.result_code == res.result_code
+        assert par_res.paths == res.paths
+        assert par_res.time is not None and res.time is not None
+
+
 def test_pybel_path():
     pba = PybelAssembler(statements)
     pybel_model = pba.make_model()
@@ -394,3 +394,144 @@ def test_eccode_isa():
         ('ECCODE', '1.1.1'), ('ECCODE', '1.1'), ('ECCODE', '1')
     }, parents
     assert bio_ontology.isa('ECCODE', '1.1.1.1', 'ECCODE', '1.1.1')
+
+
+def test_ontology_index():
+    import tempfile
+    from indra.ontology.ontology_index import OntologyIndex
+    entities = [('HGNC', '1097'), ('FPLX', 'RAF'), ('FPLX', 'HIF_alpha'),
+                ('HGNC', '9385'), ('ECCODE', '1.1.1.1'),
+                ('INDRA_MODS', 'phosphorylation'), ('HGNC', 'xxx')]
+
+    def get_relations():
+        relations = []
+        for ns, id in entities:
+            relations.append(set(bio_ontology.get_parents(ns, id)))
+            relations.append(set(bio_ontology.get_children(ns, id)))
+            for ns2, id2 in entities:
+                relations.append((bio_ontology.isa(ns, id, ns2, id2),
+                                  bio_ontology.partof(ns, id, ns2, id2)))
+        return relations
+
+    orig_index = bio_ontology._index
+    bio_ontology.set_index(None)
+    try:
+        expected = get_relations()
+        index = bio_ontology.build_index()
+        assert index.is_compatible(bio_ontology)
+        assert get_relations() == expected
+        with tempfile.TemporaryDirectory() as path:
+            index.dump(path)
+            loaded_index = OntologyIndex.load(path)
+            bio_ontology.set_index(loaded_index)
+            assert get_relations() == expected
+    finally:
+        bio_ontology.set_index(orig_index)
+
+
+def test_compiled_ontology():
+    import pickle
+    import tempfile
+    from indra.ontology.compiled import CompiledOntology
+    entities = [('HGNC', '1097'), ('FPLX', 'RAF'), ('FPLX', 'HIF_alpha'),
+                ('UP', 'P15056'), ('GO', 'GO:0036442'), ('HGNC', 'xxx')]
+
+    def query(ontology):
+        results = []
+        for ns, id in entities:
+            results += [set(ontology.get_parents(ns, id)),
+                        set(ontology.get_children(ns, id)),
+                        set(ontology.get_mappings(ns, id)),
+                        ontology.get_name(ns, id),
+                        ontology.get_type(ns, id),
+                        ontology.get_replacement(ns, id),
+                        ontology.get_node_property(ns, id, 'obsolete')]
+            name = ontology.get_name(ns, id)
+            if name:
+                results.append(ontology.get_id_from_name(ns, name))
+            for ns2, id2 in entities:
+                results.append(ontology.isa_or_partof(ns, id, ns2, id2))
+        return results
+
+    with tempfile.TemporaryDirectory() as path:
+        compiled = CompiledOntology(path, source=bio_ontology)
+        assert query(compiled) == query(bio_ontology)
+        assert compiled.version == bio_ontology.version
+        unpickled = pickle.loads(pickle.dumps(compiled))
+        assert query(unpickled) == query(bio_ontology)
+
+
+def test_compiled_ontology_recompile():
+    import os
+    import tempfile
+    from indra.ontology import IndraOntology
+    from indra.ontology.compiled import CompiledOntology
+
+    class SmallOntology(IndraOntology):
+        name = 'small'
+        version = '1'
+
+        def initialize(self):
+            self.add_node('HGNC:1', name='A', type='human_gene')
+            self.add_node('FPLX:B', name='B', type='family')
+            self.add_edge('HGNC:1', 'FPLX:B', type='isa')
+            self._initialized = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'compiled')
+        compiled = CompiledOntology(path, source=SmallOntology())
+        assert list(compiled.child_rel('HGNC', '1', {'isa'})) == \
+            [('FPLX', 'B')]
+        assert list(compiled.child_rel('HGNC', '1', {'partof'})) == []
+        assert len(compiled._edge_type_codes) == 2
+        # Compiling the ontology again replaces the folder as a whole, and
+        # the ontology compiled previously can still be used
+        source = SmallOntology()
+        source.version = '2'
+        recompiled = CompiledOntology(path, source=source)
+        assert list(recompiled.child_rel('HGNC', '1', {'isa'})) == \
+            [('FPLX', 'B')]
+        assert recompiled.version == '2'
+        assert list(compiled.child_rel('HGNC', '1', {'isa'})) == \
+            [('FPLX', 'B')]
+        assert os.listdir(tmp) == ['compiled']
+
+
+def test_virtual_ontology():
+    import os
+    import pickle
+    import tempfile
+    import threading
+    from werkzeug.serving import make_server
+    from indra.ontology.app.app import app
+    from indra.ontology.virtual import VirtualOntology
+    entities = [('HGNC', '1097'), ('FPLX', 'RAF'), ('FPLX', 'HIF_alpha'),
+                ('UP', 'P15056'), ('GO', 'GO:0036442'), ('HGNC', 'xxx')]
+
+    def query(ontology):
+        results = []
+        for ns, id in entities:
+            results += [set(ontology.get_parents(ns, id)),
+                        set(ontology.get_children(ns, id)),
+                        set(ontology.get_mappings(ns, id)),
+                        ontology.get_name(ns, id),
+                        ontology.get_type(ns, id),
+                        ontology.get_replacement(ns, id)]
+            for ns2, id2 in entities:
+                results.append(ontology.isa_or_partof(ns, id, ns2, id2))
+        return results
+
+    with tempfile.TemporaryDirectory() as path:
+        socket_path = os.path.join(path, 'ontology.sock')
+        server = make_server('unix://%s' % socket_path, 0, app,
+                             threaded=True)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            virtual = VirtualOntology('unix://%s' % socket_path)
+            virtual.prefetch(entities)
+            assert query(virtual) == query(bio_ontology)
+            unpickled = pickle.loads(pickle.dumps(virtual))
+            assert query(unpickled) == query(bio_ontology)
+        finally:
+            server.shutdown()
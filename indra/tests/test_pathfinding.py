@@ -3,7 +3,8 @@ import networkx as nx
 
 from indra.explanation.pathfinding.pathfinding import bfs_search, \
     shortest_simple_paths, bfs_search_multiple_nodes, open_dijkstra_search, \
-    simple_paths_with_constraints
+    simple_paths_with_constraints, find_sources
+from indra.explanation.pathfinding.compiled import CompiledGraph
 from indra.explanation.pathfinding.util import get_subgraph
 from indra.explanation.model_checker.model_checker import \
     signed_edges_to_signed_nodes
@@ -628,3 +629,51 @@ def test_get_subgraph_custom_filter():
     filtered_ug = get_subgraph(ug, filter_to_high_belief)
     assert len(filtered_ug.edges) == 7
     assert ('A4', 'B2') not in filtered_ug.edges
+
+
+def test_compiled_graph():
+    dg, all_ns = _setup_unsigned_graph()
+    seg, sng, all_ns = _setup_signed_graph()
+    cdg = CompiledGraph(dg)
+    csng = CompiledGraph(sng)
+    assert len(cdg) == len(dg)
+    assert 'C1' in cdg and 'X1' not in cdg
+    path = (cdg.get_node_id('A1'), cdg.get_node_id('B1'))
+    assert cdg.get_path(path) == ('A1', 'B1')
+
+    def same_paths(func, g, cg, *args, **kwargs):
+        paths = [tuple(p) for p in func(g, *args, **kwargs)]
+        assert paths == [tuple(p) for p in func(cg, *args, **kwargs)], \
+            (args, kwargs)
+        return paths
+
+    # Breadth first searches give the same paths in the same order
+    assert len(same_paths(bfs_search, dg, cdg, 'D1', depth_limit=5,
+                          reverse=True)) == 9
+    same_paths(bfs_search, dg, cdg, 'C1', depth_limit=2, reverse=True,
+               node_filter=['c', 'b'])
+    same_paths(bfs_search, dg, cdg, 'C1', depth_limit=2, reverse=True,
+               terminal_ns=['a'])
+    same_paths(bfs_search, dg, cdg, 'C1', depth_limit=2, reverse=True,
+               node_blacklist={'B2'}, path_limit=4)
+    same_paths(bfs_search, sng, csng, ('C1', INT_PLUS), depth_limit=4,
+               reverse=True, sign=INT_PLUS)
+    same_paths(bfs_search, sng, csng, ('D1', INT_MINUS), depth_limit=4,
+               reverse=True, sign=INT_MINUS)
+
+    # Shortest paths, with and without weights
+    same_paths(shortest_simple_paths, dg, cdg, 'A1', 'D1')
+    same_paths(shortest_simple_paths, dg, cdg, 'A1', 'D1', weight='weight')
+    same_paths(shortest_simple_paths, sng, csng, ('A1', INT_PLUS),
+               ('D1', INT_MINUS), weight='weight')
+    same_paths(open_dijkstra_search, dg, cdg, 'C1', reverse=True,
+               weight='weight')
+    same_paths(find_sources, sng, csng, ('D1', INT_PLUS), None)
+
+    # Nodes to ignore can be sent to searches on compiled graphs by name
+    def send_ignored(g):
+        gen = bfs_search(g, 'D1', depth_limit=5, reverse=True)
+        paths = [next(gen)]
+        paths.append(gen.send(({paths[0][-1]}, set())))
+        return paths + list(gen)
+    assert send_ignored(cdg) == send_ignored(dg)
@@ -1,5 +1,9 @@
 import unittest
-from indra.pipeline import AssemblyPipeline, RunnableArgument
+import unittest.mock
+from indra.pipeline import AssemblyPipeline, RunnableArgument, \
+    register_pipeline, decorators
+from indra.pipeline.decorators import ExistingFunctionError, \
+    _PipelineFunctions, _find_decorated_functions
 from indra.pipeline.pipeline import jsonify_arg_input
 from indra.tests.test_assemble_corpus import st1, st2, st3, st4
 from indra.tools.assemble_corpus import *
@@ -128,3 +132,56 @@ def test_jsonify_arg():
         {'hume': [13, 7], 'cwms': [13, 7], 'sofia': [13, 7]})) == {
             'function': 'get_eidos_bayesian_scorer',
             'args': [{'hume': [13, 7], 'cwms': [13, 7], 'sofia': [13, 7]}]}
+
+
+def test_register_lazy_function_name():
+    # Names of functions registered by pipeline modules that aren't
+    # imported yet can't be registered by other modules either
+    funcs = _PipelineFunctions()
+    funcs._modules_to_load = ['indra.preassembler.custom_preassembly']
+
+    def agent_grounding_matches(stmt):
+        return stmt.matches_key()
+
+    with unittest.mock.patch.object(decorators, 'pipeline_functions', funcs):
+        try:
+            register_pipeline(agent_grounding_matches)
+            assert False, 'ExistingFunctionError not raised'
+        except ExistingFunctionError:
+            pass
+        assert funcs._modules_to_load == \
+            ['indra.preassembler.custom_preassembly']
+        assert 'agent_grounding_matches' in funcs
+        assert funcs['agent_grounding_matches'] is not agent_grounding_matches
+
+
+def test_find_decorated_functions():
+    source = """
+from indra.pipeline import register_pipeline
+from indra.pipeline import register_pipeline as register
+from indra import pipeline
+
+@register_pipeline
+def f1(stmts):
+    return stmts
+
+@register
+def f2(stmts):
+    return stmts
+
+@pipeline.register_pipeline
+def f3(stmts):
+    return stmts
+
+def f4(stmts):
+    return stmts
+"""
+    assert _find_decorated_functions(source) == {'f1', 'f2', 'f3'}
+    # Functions registered in other ways can't be found from the source
+    assert _find_decorated_functions(
+        source + '\nregister_pipeline(f4)\n') is None
+    assert _find_decorated_functions(
+        source + '\nreg = pipeline.register_pipeline\n') is None
+    assert _find_decorated_functions(
+        source + '\nclass A:\n    @register\n    def f5(self):\n'
+                 '        pass\n') is None
@@ -39,6 +39,33 @@ def test_duplicates_copy():
     assert len(stmts[1].evidence) == 1
 
 
+def test_combine_duplicates_streaming():
+    raf = Agent('RAF1')
+    mek = Agent('MEK1')
+    erk = Agent('ERK2')
+    stmts = [Phosphorylation(raf, mek, evidence=[Evidence(text='foo')]),
+             Phosphorylation(mek, erk, evidence=[Evidence(text='bar')]),
+             Phosphorylation(raf, mek, evidence=[Evidence(text='baz')]),
+             Phosphorylation(raf, mek, evidence=[Evidence(text='foo')]),
+             Dephosphorylation(mek, erk, evidence=[Evidence(text='bar')])]
+    pa = Preassembler(bio_ontology)
+    unique_stmts = pa.combine_duplicates_streaming(iter(stmts),
+                                                   n_partitions=2,
+                                                   buffer_size=1)
+    unique_stmts = sorted(unique_stmts, key=lambda x: x.get_hash())
+    expected = sorted(Preassembler(bio_ontology, stmts).combine_duplicates(),
+                      key=lambda x: x.get_hash())
+    assert [stmt.get_hash() for stmt in unique_stmts] == \
+        [stmt.get_hash() for stmt in expected]
+    assert [sorted(ev.text for ev in stmt.evidence)
+            for stmt in unique_stmts] == \
+        [sorted(ev.text for ev in stmt.evidence) for stmt in expected]
+    # The input statements are not modified
+    assert all(len(stmt.evidence) == 1 for stmt in stmts)
+    assert all('prior_uuids' not in stmt.evidence[0].annotations
+               for stmt in stmts)
+
+
 def test_duplicates_sorting():
     mc = ModCondition('phosphorylation')
     map2k1_1 = Agent('MAP2K1', mods=[mc])
@@ -1052,6 +1079,31 @@ def test_split_idx():
          (st3.get_hash(), st1.get_hash())}
 
 
+
+def test_generate_relations_matches_fun():
+    def matches_fun(stmt):
+        return stmt.matches_key() + 'x'
+
+    ras = Agent('RAS', db_refs={'FPLX': 'RAS'})
+    kras = Agent('KRAS', db_refs={'HGNC': '6407'})
+    hras = Agent('HRAS', db_refs={'HGNC': '5173'})
+    st1 = Phosphorylation(Agent('x'), ras)
+    st2 = Phosphorylation(Agent('x'), kras)
+    st3 = Phosphorylation(Agent('x'), hras)
+    h1, h2, h3 = [st.get_hash(matches_fun=matches_fun)
+                  for st in [st1, st2, st3]]
+    # The filters have to look up statements by the same hashes as the
+    # preassembler otherwise statements are found to refine themselves
+    pa = Preassembler(bio_ontology, matches_fun=matches_fun)
+    refinements = pa._generate_relations([st1, st2, st3])
+    assert refinements == {h2: {h1}, h3: {h1}}, refinements
+    assert pa._comparison_counter == 2, pa._comparison_counter
+    pa = Preassembler(bio_ontology, matches_fun=matches_fun)
+    refinements = pa._generate_relations([st1, st2, st3], split_idx=1)
+    assert refinements == {h3: {h1}}, refinements
+    assert pa._comparison_counter == 1, pa._comparison_counter
+
+
 def test_refinement_filters():
     ras = Agent('RAS', db_refs={'FPLX': 'RAS'})
     kras = Agent('KRAS', db_refs={'HGNC': '6407'})
@@ -1127,3 +1179,26 @@ def test_refinement_filters():
             OntologyRefinementFilter(bio_ontology)
         ])
     assert pa._comparison_counter == 0, pa._comparison_counter
+
+
+def test_generate_relations_parallel():
+    ras = Agent('RAS', db_refs={'FPLX': 'RAS'})
+    kras = Agent('KRAS', db_refs={'HGNC': '6407'})
+    hras = Agent('HRAS', db_refs={'HGNC': '5173'})
+    stmts = []
+    for stmt_type in [Phosphorylation, Activation, Inhibition]:
+        stmts += [stmt_type(Agent('x'), ras), stmt_type(Agent('x'), kras),
+                  stmt_type(Agent('x'), hras)]
+    pa = Preassembler(bio_ontology)
+    serial_relations = pa._generate_relations(stmts)
+    serial_counter = pa._comparison_counter
+    pa = Preassembler(bio_ontology)
+    parallel_relations = pa._generate_relations(stmts, poolsize=2,
+                                                size_cutoff=1)
+    assert parallel_relations == serial_relations, parallel_relations
+    assert list(parallel_relations) == list(serial_relations)
+    assert pa._comparison_counter == serial_counter == 6
+
+    pa = Preassembler(bio_ontology, stmts=stmts)
+    top_level = pa.combine_related(poolsize=2, size_cutoff=1)
+    assert len(top_level) == 6, top_level
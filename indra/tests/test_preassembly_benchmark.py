@@ -0,0 +1,29 @@
+from indra.ontology.bio import bio_ontology
+from indra.benchmarks.preassembly import make_corpus, compare_results
+
+
+def test_make_corpus():
+    stmts = make_corpus(bio_ontology, 100, seed=1)
+    assert len(stmts) == 100
+    hashes = [stmt.get_hash(shallow=False) for stmt in stmts]
+    # The same corpus is generated for the same seed
+    assert [stmt.get_hash(shallow=False) for stmt in
+            make_corpus(bio_ontology, 100, seed=1)] == hashes
+    assert [stmt.get_hash(shallow=False) for stmt in
+            make_corpus(bio_ontology, 100, seed=2)] != hashes
+
+
+def test_compare_results():
+    old = [{'size': 10, 'stages': {'combine_duplicates':
+                                   {'time': 2.0, 'peak_memory': 4.0},
+                                   'belief_prior': {'time': 0.0}}},
+           {'size': 100, 'stages': {'combine_duplicates': {'time': 1.0}}}]
+    new = [{'size': 10, 'stages': {'combine_duplicates':
+                                   {'time': 1.0, 'peak_memory': 6.0},
+                                   'belief_prior': {'time': 1.0},
+                                   'combine_related': {'time': 1.0}}},
+           {'size': 1000, 'stages': {'combine_duplicates': {'time': 1.0}}}]
+    # Only sizes and stages in both results are compared
+    assert compare_results(old, new) == \
+        {10: {'combine_duplicates': {'time': 0.5, 'peak_memory': 1.5},
+              'belief_prior': {'time': None}}}
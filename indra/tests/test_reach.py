@@ -482,6 +482,39 @@ def test_phosphorylation_regulation():
     assert not stmt.sub.mods
 
 
+def test_process_json_bytes_and_file_handle():
+    here = os.path.dirname(os.path.abspath(__file__))
+    test_file = os.path.join(here, 'reach_reg_phos.json')
+    expected = reach.process_json_file(test_file).statements
+    with open(test_file, 'rb') as fh:
+        json_bytes = fh.read()
+    assert b'frame-id' in json_bytes
+    rp = reach.process_json_str(json_bytes)
+    assert [stmt.get_hash() for stmt in rp.statements] == \
+        [stmt.get_hash() for stmt in expected]
+    with open(test_file, 'rb') as fh:
+        rp = reach.process_json_file(fh)
+    assert [stmt.get_hash() for stmt in rp.statements] == \
+        [stmt.get_hash() for stmt in expected]
+    assert reach.process_json_str('{"events":') is None
+
+
+def test_process_json_files():
+    here = os.path.dirname(os.path.abspath(__file__))
+    test_files = [os.path.join(here, fname) for fname in
+                  ['reach_conversion.json', 'reach_act_amt.json',
+                   'reach_reg_phos.json']]
+    expected = [stmt for test_file in test_files
+                for stmt in reach.process_json_file(test_file).statements]
+    for poolsize in [1, 2]:
+        stmts = list(reach.process_json_files(test_files, poolsize=poolsize))
+        assert [stmt.get_hash() for stmt in stmts] == \
+            [stmt.get_hash() for stmt in expected]
+    stmts = list(reach.process_json_files(
+        test_files[:1], citations={test_files[0]: '12345'}, poolsize=1))
+    assert stmts[0].evidence[0].pmid == '12345'
+
+
 def test_organism_prioritization():
     here = os.path.dirname(os.path.abspath(__file__))
     test_file = os.path.join(here, 'reach_reg_phos.json')
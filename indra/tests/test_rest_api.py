@@ -1,8 +1,14 @@
+import os
 import json
+import time
+import uuid
+import socket
+import subprocess
 from datetime import datetime
 from copy import deepcopy
 from nose.plugins.attrib import attr
 from os import path
+from rest_api import jobs
 from rest_api.api import api
 from indra.statements import *
 
@@ -996,6 +1002,92 @@ def test_pipeline():
     assert len(res_json['statements']) == 1
 
 
+def test_jsonl_statements():
+    route = 'preassembly/filter_grounded_only'
+    # Statements are sent as JSON lines after a line with other arguments
+    lines = [json.dumps({'remove_bound': True})] + \
+        [json.dumps(stmt_json) for stmt_json in stmts_to_json([st1, st3, st4])]
+    res = _call_api('post', route, data='\n'.join(lines) + '\n',
+                    content_type='application/x-ndjson',
+                    headers={'Accept': 'application/x-ndjson'})
+    assert res.mimetype == 'application/x-ndjson'
+    res_lines = res.get_data(as_text=True).splitlines()
+    st_out = stmts_from_json([json.loads(line) for line in res_lines])
+    assert [st.uuid for st in st_out] == [st1.uuid, st4.uuid]
+
+
+def _run_job(route, **kwargs):
+    res = _call_api('post', 'jobs/' + route, **kwargs)
+    job_id = json.loads(res.get_data())['job_id']
+    for _ in range(600):
+        status = json.loads(_call_api('get', 'jobs/%s' % job_id).get_data())
+        if status['status'] in ('finished', 'failed'):
+            break
+        time.sleep(0.1)
+    assert status['status'] == 'finished', status
+    return job_id
+
+
+def test_pipeline_job():
+    p = [{'function': 'filter_grounded_only'},
+         {'function': 'filter_by_type', 'args': ['Complex']}]
+    job_id = _run_job('preassembly/pipeline',
+                      json={'statements': [STMT_JSON], 'pipeline': p})
+    res = _call_api('get', 'jobs/%s/result' % job_id)
+    res_json = json.loads(res.get_data())
+    assert len(res_json['statements']) == 1
+    assert res_json['statements'][0]['id'] == STMT_JSON['id']
+
+
+def test_preassembly_function_job():
+    lines = [json.dumps({})] + \
+        [json.dumps(stmt_json) for stmt_json in stmts_to_json([st1, st3, st4])]
+    job_id = _run_job('preassembly/filter_grounded_only',
+                      data='\n'.join(lines),
+                      content_type='application/x-ndjson')
+    res = _call_api('get', 'jobs/%s/result' % job_id,
+                    headers={'Accept': 'application/x-ndjson'})
+    st_out = stmts_from_json([json.loads(line) for line in
+                              res.get_data(as_text=True).splitlines()])
+    assert [st.uuid for st in st_out] == [st1.uuid, st4.uuid]
+
+
+def test_job_not_found():
+    tc = api.app.test_client()
+    assert tc.get('jobs/%s' % ('0' * 32)).status_code == 404
+    assert tc.get('jobs/xyz').status_code == 404
+    assert tc.post('jobs/preassembly/xyz', json={}).status_code == 404
+
+
+def test_orphaned_job_failed():
+    job_id = uuid.uuid4().hex
+    os.makedirs(jobs.get_job_dir(job_id))
+    # A process that has already exited
+    proc = subprocess.Popen(['true'])
+    proc.wait()
+    jobs._update_status(job_id, status='running', host=socket.gethostname(),
+                        pid=proc.pid)
+    status = jobs.get_job_status(job_id)
+    assert status['status'] == 'failed', status
+    assert status['finished']
+
+
+def test_cleanup_jobs():
+    old_id, new_id, running_id = [uuid.uuid4().hex for _ in range(3)]
+    for job_id in (old_id, new_id, running_id):
+        os.makedirs(jobs.get_job_dir(job_id))
+    jobs._update_status(old_id, status='finished',
+                        finished='2000-01-01T00:00:00+00:00')
+    jobs._update_status(new_id, status='finished', finished=jobs._now())
+    jobs._update_status(running_id, status='running', host=socket.gethostname(),
+                        pid=os.getpid())
+    deleted = jobs.cleanup_jobs(expiry=1)
+    assert old_id in deleted
+    assert not os.path.exists(jobs.get_job_dir(old_id))
+    assert jobs.get_job_status(new_id)['status'] == 'finished'
+    assert jobs.get_job_status(running_id)['status'] == 'running'
+
+
 @attr('webservice')
 def test_ccle_mrna():
     res = _call_api('post', 'databases/cbio/get_ccle_mrna',
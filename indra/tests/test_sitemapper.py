@@ -1,7 +1,10 @@
 from protmapper import MappedSite
 from indra.statements import *
 from indra.util import unicode_strs
+import os
+import tempfile
 from indra.preassembler.sitemapper import default_mapper as sm, MappedStatement
+from indra.preassembler.sitemapper import SiteMapper, default_site_map
 from indra.preassembler.sitemapper import _valid_position_str
 
 
@@ -247,6 +250,75 @@ def get_invalid_mapks():
     return (mapk1_invalid, mapk3_invalid)
 
 
+def _get_mapk_stmts():
+    mapk1_invalid = Agent('MAPK1',
+                          mods=[ModCondition('phosphorylation', 'T', '183'),
+                                ModCondition('phosphorylation', 'Y', '185')],
+                          db_refs={'UP': 'P28482'})
+    mapk1_valid = Agent('MAPK1',
+                        mods=[ModCondition('phosphorylation', 'T', '185')],
+                        db_refs={'UP': 'P28482'})
+    mapk3 = Agent('MAPK3', db_refs={'UP': 'P27361'})
+    return [Phosphorylation(mapk1_invalid, mapk3, 'Y', '203'),
+            Phosphorylation(mapk1_valid, mapk3, 'Y', '204'),
+            Phosphorylation(mapk1_invalid, mapk3, 'T', '202'),
+            Phosphorylation(mapk1_valid, mapk3, 'Y', '204x')]
+
+
+def test_map_sites_poolsize():
+    stmts = _get_mapk_stmts()
+    valid, mapped = SiteMapper(default_site_map).map_sites(stmts)
+    # Statements without invalid sites are returned without being copied
+    assert valid == [stmts[1]]
+    assert valid[0] is stmts[1]
+    assert [ms.original_stmt for ms in mapped] == [stmts[0], stmts[2]]
+    valid_par, mapped_par = \
+        SiteMapper(default_site_map).map_sites(stmts, poolsize=2)
+    assert valid_par == valid
+    assert [str(ms) for ms in mapped_par] == [str(ms) for ms in mapped]
+
+
+def test_site_cache_round_trip():
+    stmts = _get_mapk_stmts()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_path = os.path.join(tmp_dir, 'sm_cache.pkl')
+        sm_cache = SiteMapper(default_site_map, use_cache=True,
+                              cache_path=cache_path)
+        valid, mapped = sm_cache.map_sites(stmts)
+        sm_cache.save_cache()
+        sm_loaded = SiteMapper(default_site_map, use_cache=True,
+                               cache_path=cache_path)
+        assert len(sm_loaded._stored_sites) == len(sm_cache._cache)
+        valid_loaded, mapped_loaded = sm_loaded.map_sites(stmts)
+        assert valid_loaded == valid
+        assert [str(ms) for ms in mapped_loaded] == \
+            [str(ms) for ms in mapped]
+        # Only the mappings that weren't cached had to be looked up again
+        assert not sm_loaded._cache
+
+
+def test_map_sites_uniprot_errors():
+    looked_up = []
+
+    def map_to_human_ref(prot_id, prot_ns, residue, position, **kwargs):
+        looked_up.append((prot_id, residue, position))
+        return MappedSite(prot_id, None, residue, position,
+                          error_code='UNIPROT_HTTP_OTHER')
+
+    mapper = SiteMapper(default_site_map)
+    mapper.map_to_human_ref = map_to_human_ref
+    mapk1 = Agent('MAPK1', db_refs={'UP': 'P28482'})
+    stmts = [Phosphorylation(None, mapk1, 'T', '185'),
+             Phosphorylation(None, mapk1, 'T', '185')]
+    valid, mapped = mapper.map_sites(stmts)
+    assert valid == stmts
+    # Sites that couldn't be looked up because of UniProt errors aren't kept
+    # and are looked up again for each statement
+    assert looked_up == [('P28482', 'T', '185')] * 3, looked_up
+    # Mapped sites are only kept during map_sites
+    assert mapper._mapped_sites is None
+
+
 def check_validated_mapks(res, st1):
     """Validate that the invalid MAPKs have been fixed appropriately."""
     assert len(res) == 2
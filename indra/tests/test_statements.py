@@ -2029,3 +2029,30 @@ def test_none_values_from_json():
           'matches_hash': '-15231783235137984'}
     s = Statement._from_json(sj)
     assert s
+
+
+def test_slotted_pickle():
+    import pickle
+    ev = Evidence(source_api='reach', pmid='12345', text='x')
+    agent = Agent('x', db_refs={'HGNC': '1'}, location='nucleus')
+    for obj in (ev, agent):
+        assert not hasattr(obj, '__dict__')
+        # The pickled state is the same as before these classes used slots
+        state = obj.__getstate__()
+        assert state == {attr: getattr(obj, attr) for attr in state}
+    assert set(agent.__getstate__()) == \
+        {'name', 'db_refs', 'mods', 'mutations', 'bound_conditions',
+         'activity', 'location'}
+    stmt = Activation(agent, Agent('y'), evidence=[ev])
+    stmt2 = pickle.loads(pickle.dumps(stmt))
+    assert stmt2.to_json() == stmt.to_json()
+    assert stmt2.get_hash(shallow=False, refresh=True) == \
+        stmt.get_hash(shallow=False, refresh=True)
+    # Pickles of the earlier classes have state dicts which may be missing
+    # newer attributes
+    ev2 = Evidence.__new__(Evidence)
+    ev2.__setstate__({'source_api': 'reach', 'source_id': None,
+                      'pmid': '12345', 'text': 'x', 'annotations': {},
+                      'epistemics': {}})
+    assert ev2.stmt_tag is None
+    assert ev2.matches_key() == ev.matches_key()
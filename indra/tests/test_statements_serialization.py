@@ -1,7 +1,9 @@
 from __future__ import absolute_import, print_function, unicode_literals
 from builtins import dict, str
 import json
+import pickle
 import datetime
+from copy import deepcopy
 import jsonschema
 from indra.statements import *
 from .test_json_schema import schema
@@ -298,6 +300,77 @@ def test_hash():
     assert stmt_ret.get_hash() == sh
 
 
+def test_hash_matches_fun():
+    stmts = [Phosphorylation(Agent('a'), Agent('b'), 'S', evidence=[ev]),
+             Activation(Agent('a', location='nucleus'), Agent('b'),
+                        evidence=[ev])]
+    shallow = [stmt.get_hash() for stmt in stmts]
+    full = [stmt.get_hash(shallow=False) for stmt in stmts]
+
+    def matches_fun(stmt):
+        return stmt.matches_key() + 'x'
+    mf_hashes = [stmt.get_hash(matches_fun=matches_fun) for stmt in stmts]
+    assert not set(mf_hashes) & set(shallow)
+    assert stmts[0].get_hash(matches_fun=lambda s: s.matches_key()) == \
+        shallow[0]
+    # Hashes calculated with a matches function aren't used without it
+    stmts[0].get_hash(matches_fun=matches_fun)
+    assert stmts[0].get_hash() == shallow[0]
+    stmts[1].get_hash(shallow=False, matches_fun=matches_fun)
+    assert stmts[1].get_hash(shallow=False) == full[1]
+
+    # Hashes calculated with a matches function are cached for that
+    # function but are recalculated once the statement has changed
+    calls = []
+
+    def counting_matches_fun(stmt):
+        calls.append(stmt)
+        return matches_fun(stmt)
+    stmt = deepcopy(stmts[0])
+    mf_hash = stmt.get_hash(matches_fun=counting_matches_fun)
+    assert stmt.get_hash(matches_fun=counting_matches_fun) == mf_hash
+    assert len(calls) == 1
+    stmt.enz.name = 'c'
+    new_mf_hash = stmt.get_hash(matches_fun=counting_matches_fun)
+    assert new_mf_hash != mf_hash
+    assert len(calls) == 2
+    # In-place changes need the hash to be refreshed
+    stmt.enz.db_refs['HGNC'] = '6840'
+    assert stmt.get_hash(matches_fun=counting_matches_fun) == new_mf_hash
+    assert stmt.get_hash(matches_fun=counting_matches_fun, refresh=True) != \
+        new_mf_hash
+
+    # The matches function isn't pickled with the statement, and neither is
+    # the hash calculated with it
+    stmts[1].get_hash(matches_fun=matches_fun)
+    stmt = pickle.loads(pickle.dumps(stmts[1]))
+    assert stmt._shallow_hash is None
+    assert stmt.get_hash(matches_fun=matches_fun) == mf_hashes[1]
+    assert stmt.get_hash() == shallow[1]
+
+    # Memoized matches keys are invalidated when the objects they depend on
+    # are changed
+    ag = Agent('a', mods=[ModCondition('phosphorylation', 'S', '222')])
+    key = ag.matches_key()
+    assert ag.matches_key() is key
+    ag.mods[0].position = '218'
+    assert ag.matches_key() != key
+    assert ag.matches_key() == \
+        Agent('a', mods=[ModCondition('phosphorylation', 'S', '218')]
+              ).matches_key()
+    ev_key = ev.matches_key()
+    ev.stmt_tag = 1
+    assert ev.matches_key() is ev_key
+    # Copies don't keep the memoized matches keys of the original
+    ev_copy = deepcopy(ev)
+    ev_copy.annotations['x'] = 1
+    assert ev_copy.matches_key() != ev_key
+
+    # Batch hashes are the same as individual ones
+    assert get_hashes(stmts, refresh=True) == shallow
+    assert get_hashes(stmts, shallow=False, refresh=True) == full
+
+
 def test_time_context():
     tc = TimeContext(text='2018',
                      start=datetime.datetime(2018, 1, 1, 0, 0),
@@ -396,6 +469,58 @@ def test_file_serialization_json_lines():
     assert stmts[0].matches(stmt)
 
 
+def _get_supported_stmts():
+    st1 = Phosphorylation(Agent('a', db_refs={'HGNC': '1'}), Agent('b'),
+                          'S', '10', evidence=[ev])
+    st2 = Phosphorylation(Agent('a', db_refs={'HGNC': '1'}), Agent('b'),
+                          evidence=[ev])
+    st1.supports = [st2]
+    st2.supported_by = [st1]
+    return [st1, st2]
+
+
+def test_file_serialization_json_stream():
+    import os
+    import tempfile
+    stmts = _get_supported_stmts()
+    with tempfile.TemporaryDirectory() as path:
+        fname = os.path.join(path, 'stmts.json')
+        stmts_to_json_file(stmts, fname)
+        with open(fname, 'r') as fh:
+            assert fh.read() == json.dumps(stmts_to_json(stmts), indent=1)
+        stmts_to_json_file([], fname)
+        assert stmts_from_json_file(fname) == []
+        for ext in ['.jsonl', '.jsonl.gz']:
+            fname = os.path.join(path, 'stmts' + ext)
+            assert write_stmts_jsonl(iter(stmts), fname) == 2
+            # Statements are read one by one with unresolved support
+            stmts_iter = list(iter_stmts_from_json_file(fname))
+            assert stmts_iter[0].supports == [stmts[1].uuid]
+            loaded = resolve_support(stmts_iter)
+            assert loaded[0].supports[0] is loaded[1]
+            assert loaded[1].supported_by[0] is loaded[0]
+            assert stmts_to_json(loaded) == stmts_to_json(stmts)
+            assert stmts_to_json(stmts_from_json_file(
+                fname, format='jsonl')) == stmts_to_json(stmts)
+
+
+def test_file_serialization_msgpack():
+    import os
+    import tempfile
+    stmts = _get_supported_stmts()
+    with tempfile.TemporaryDirectory() as path:
+        for ext in ['.msgpack', '.msgpack.gz']:
+            fname = os.path.join(path, 'stmts' + ext)
+            assert write_stmts_msgpack(stmts, fname) == 2
+            loaded = stmts_from_msgpack_file(fname)
+            assert loaded[0].supports[0] is loaded[1]
+            assert stmts_to_json(loaded) == stmts_to_json(stmts)
+            write_stmts_msgpack(stmts, fname, support_links=False)
+            loaded = list(iter_stmts_from_msgpack_file(fname))
+            assert not loaded[0].supports and not loaded[1].supported_by
+            assert loaded[0].get_hash() == stmts[0].get_hash()
+
+
 def test_single_stmt_serialization():
     stmt = IncreaseAmount(Agent('a'), Agent('b'), evidence=[ev])
     stmt_json = stmt.to_json()
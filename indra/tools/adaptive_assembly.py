@@ -1,3 +1,14 @@
+import pickle
+import logging
+import networkx
+from indra.util import fast_deepcopy
+from indra.belief import BeliefEngine
+from indra.preassembler import merge_duplicate_evidence
+
+
+logger = logging.getLogger(__name__)
+
+
 class AdaptiveAssembler:
     def __init__(self, unique_statements, filters, matches_fun=None):
         self.filters = filters
@@ -7,6 +18,7 @@ class AdaptiveAssembler:
                               for stmt in self.unique_statements}
         assert len(self.stmts_by_hash) == len(self.unique_statements)
         for filter in self.filters:
+            filter.matches_fun = matches_fun
             filter.initialize(self.stmts_by_hash)
 
     def get_all_refinements(self):
@@ -31,3 +43,229 @@ class AdaptiveAssembler:
                 filter.get_less_specifics(
                     stmt, possibly_related=possibly_related)
         return possibly_related
+
+
+class IncrementalAssembler(AdaptiveAssembler):
+    """Assembles statements incrementally, one batch at a time.
+
+    The assembler keeps the deduplicated statements, the initialized
+    refinement filters and the refinements graph of the statements it has
+    assembled so far. When a new batch of statements is added, duplicates are
+    merged into existing statements by hash, refinements are only found
+    between new statements and all other statements, and beliefs are only
+    recalculated for the statements whose evidence or refinements changed,
+    along with the statements they refine. The cost of adding a batch
+    therefore depends on the size of the batch and the part of the
+    refinements graph it touches rather than on the size of the corpus.
+
+    The assembler can be saved into a file and loaded in a later run
+    using :py:meth:`save` and :py:meth:`load`. Since the filters are saved
+    along with the assembler, so is the ontology used by them. For large
+    ontologies, a :py:class:`indra.ontology.compiled.CompiledOntology`
+    can be used which is saved by reference to its folder.
+
+    Parameters
+    ----------
+    filters : list[indra.preassembler.refinement.RefinementFilter]
+        A list of refinement filters, typically an OntologyRefinementFilter
+        followed by a RefinementConfirmationFilter.
+    matches_fun : Optional[function]
+        A function which takes a Statement object as argument and
+        returns a string key that is used for duplicate recognition. It
+        needs to be picklable (i.e., defined at the module level) for the
+        assembler to be saved. Default: None
+    belief_scorer : Optional[indra.belief.BeliefScorer]
+        The scorer used to calculate beliefs. If None, the default scorer
+        of the BeliefEngine is used. Default: None
+
+    Attributes
+    ----------
+    refinements_graph : networkx.DiGraph
+        A graph whose nodes are statement hashes carrying a stmt attribute
+        with the corresponding statement, and whose edges point from less
+        specific to more specific statements.
+    evidence_keys : dict[int, set]
+        The keys of the evidences of each statement, keyed by statement
+        hash, used to avoid adding the same evidence again.
+    """
+    def __init__(self, filters, matches_fun=None, belief_scorer=None):
+        super().__init__([], filters, matches_fun=matches_fun)
+        self.belief_scorer = belief_scorer
+        self.refinements_graph = networkx.DiGraph()
+        self.evidence_keys = {}
+
+    def add_statements(self, stmts):
+        """Add a batch of statements to the assembled statements.
+
+        Parameters
+        ----------
+        stmts : list[indra.statements.Statement]
+            The statements to add. These are copied and aren't modified.
+
+        Returns
+        -------
+        list[indra.statements.Statement]
+            The new and existing unique statements whose belief was
+            recalculated due to the batch, i.e., those that got new
+            evidences or refinements and those that they refine.
+        """
+        stmts = fast_deepcopy(stmts)
+        new_stmts_by_hash = {}
+        updated_hashes = set()
+        # Step 1. Merge duplicates into existing or new unique statements
+        for stmt in stmts:
+            stmt_hash = stmt.get_hash(matches_fun=self.matches_fun,
+                                      refresh=True)
+            unique_stmt = self.stmts_by_hash.get(stmt_hash)
+            if unique_stmt is not None:
+                updated_hashes.add(stmt_hash)
+            else:
+                unique_stmt = new_stmts_by_hash.get(stmt_hash)
+            if unique_stmt is None:
+                unique_stmt = stmt.make_generic_copy()
+                unique_stmt.uuid = stmt.uuid
+                new_stmts_by_hash[stmt_hash] = unique_stmt
+                self.evidence_keys[stmt_hash] = set()
+            merge_duplicate_evidence(unique_stmt, stmt,
+                                     self.evidence_keys[stmt_hash])
+        for stmt in list(new_stmts_by_hash.values()) + \
+                [self.stmts_by_hash[sh] for sh in updated_hashes]:
+            for shallow in (True, False):
+                stmt.get_hash(shallow=shallow, refresh=True,
+                              matches_fun=self.matches_fun)
+        logger.info('Adding %d new unique statements and new evidences to '
+                    '%d existing statements' %
+                    (len(new_stmts_by_hash), len(updated_hashes)))
+
+        # Step 2. Extend the filters and find refinements for new statements
+        self.stmts_by_hash.update(new_stmts_by_hash)
+        self.unique_statements += list(new_stmts_by_hash.values())
+        for filt in self.filters:
+            filt.extend(new_stmts_by_hash)
+        new_hashes = set(new_stmts_by_hash)
+        for stmt_hash, stmt in new_stmts_by_hash.items():
+            self.refinements_graph.add_node(stmt_hash, stmt=stmt)
+        for stmt_hash, stmt in new_stmts_by_hash.items():
+            # Refinements among the new statements are all found as less
+            # specifics so more specifics are only looked for among the
+            # existing statements.
+            less_specifics = self.get_less_specifics(stmt)
+            more_specifics = self._get_related(stmt, 'more_specific',
+                                               exclude=new_hashes)
+            for less_spec in less_specifics:
+                self._add_refinement(stmt_hash, less_spec)
+            for more_spec in more_specifics:
+                self._add_refinement(more_spec, stmt_hash)
+
+        # Step 3. Update the beliefs of affected statements
+        affected_hashes = self._get_reachable(new_hashes | updated_hashes,
+                                              self.refinements_graph.pred)
+        affected_stmts = [self.stmts_by_hash[sh] for sh in affected_hashes]
+        self._set_beliefs(affected_stmts, affected_hashes)
+        return affected_stmts
+
+    def get_statements(self, return_toplevel=True):
+        """Return the assembled statements.
+
+        Parameters
+        ----------
+        return_toplevel : Optional[bool]
+            If True, only the top-level statements are returned, otherwise
+            all unique statements are returned. Default: True
+
+        Returns
+        -------
+        list[indra.statements.Statement]
+            The assembled statements.
+        """
+        if return_toplevel:
+            return [stmt for stmt in self.unique_statements
+                    if not stmt.supports]
+        return self.unique_statements
+
+    def save(self, fname):
+        """Save the assembler into a pickle file.
+
+        Parameters
+        ----------
+        fname : str
+            The name of the pickle file.
+        """
+        # Links between statements are restored from the refinements graph
+        # upon loading since pickling long chains of linked statements can
+        # exceed the recursion limit.
+        links = {sh: (stmt.supports, stmt.supported_by)
+                 for sh, stmt in self.stmts_by_hash.items()}
+        try:
+            for stmt in self.stmts_by_hash.values():
+                stmt.supports = []
+                stmt.supported_by = []
+            with open(fname, 'wb') as fh:
+                pickle.dump(self, fh, protocol=4)
+        finally:
+            for sh, (supports, supported_by) in links.items():
+                self.stmts_by_hash[sh].supports = supports
+                self.stmts_by_hash[sh].supported_by = supported_by
+
+    @classmethod
+    def load(cls, fname):
+        """Load an assembler from a pickle file.
+
+        Parameters
+        ----------
+        fname : str
+            The name of a pickle file saved with :py:meth:`save`.
+
+        Returns
+        -------
+        IncrementalAssembler
+            The loaded assembler.
+        """
+        with open(fname, 'rb') as fh:
+            assembler = pickle.load(fh)
+        for less_spec, more_spec in assembler.refinements_graph.edges():
+            assembler._link_statements(more_spec, less_spec)
+        return assembler
+
+    def _get_related(self, stmt, direction, exclude=None):
+        possibly_related = None
+        for filt in self.filters:
+            possibly_related = \
+                filt.get_related(stmt, possibly_related=possibly_related,
+                                 direction=direction)
+            if exclude:
+                possibly_related = set(possibly_related) - exclude
+        return possibly_related
+
+    def _add_refinement(self, more_spec, less_spec):
+        self.refinements_graph.add_edge(less_spec, more_spec)
+        self._link_statements(more_spec, less_spec)
+
+    def _link_statements(self, more_spec, less_spec):
+        self.stmts_by_hash[more_spec].supported_by.append(
+            self.stmts_by_hash[less_spec])
+        self.stmts_by_hash[less_spec].supports.append(
+            self.stmts_by_hash[more_spec])
+
+    def _set_beliefs(self, stmts, stmt_hashes):
+        # Beliefs only depend on the more specific statements so the
+        # belief engine is given the part of the graph below the statements
+        nodes = self._get_reachable(stmt_hashes, self.refinements_graph.succ)
+        belief_engine = \
+            BeliefEngine(self.belief_scorer, matches_fun=self.matches_fun,
+                         refinements_graph=self.refinements_graph.subgraph(
+                             nodes))
+        belief_engine.set_hierarchy_probs(stmts)
+
+    @staticmethod
+    def _get_reachable(sources, adjacency):
+        # Return the given nodes and all nodes reachable from them
+        reachable = set(sources)
+        stack = list(sources)
+        while stack:
+            node = stack.pop()
+            for neighbor in adjacency[node]:
+                if neighbor not in reachable:
+                    reachable.add(neighbor)
+                    stack.append(neighbor)
+        return reachable
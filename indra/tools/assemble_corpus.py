@@ -9,7 +9,9 @@ except ImportError:
     # Python 3
     import pickle
 
+import gzip
 import logging
+import itertools
 from typing import List
 from collections import defaultdict
 from copy import deepcopy, copy
@@ -37,6 +39,12 @@ def _filter(kwargs, arg_list):
 def dump_statements(stmts_in, fname, protocol=4):
     """Dump a list of statements into a pickle file.
 
+    Files with a .jsonl or .msgpack extension (optionally followed by .gz
+    or .zst for compression) are instead written one statement at a time
+    in the JSONL or binary msgpack format, see
+    :py:func:`indra.statements.io.write_stmts_jsonl` and
+    :py:func:`indra.statements.io.write_stmts_msgpack`.
+
     Parameters
     ----------
     fname : str
@@ -46,14 +54,24 @@ def dump_statements(stmts_in, fname, protocol=4):
         Default: 4
     """
     logger.info('Dumping %d statements into %s...' % (len(stmts_in), fname))
-    with open(fname, 'wb') as fh:
-        pickle.dump(stmts_in, fh, protocol=protocol)
+    stmt_format = _get_stmt_file_format(fname)
+    if stmt_format == 'jsonl':
+        write_stmts_jsonl(stmts_in, fname)
+    elif stmt_format == 'msgpack':
+        write_stmts_msgpack(stmts_in, fname)
+    else:
+        with open(fname, 'wb') as fh:
+            pickle.dump(stmts_in, fh, protocol=protocol)
     return stmts_in
 
 
 def load_statements(fname, as_dict=False):
     """Load statements from a pickle file.
 
+    Files with a .jsonl or .msgpack extension (optionally followed by .gz
+    or .zst for compression) are instead loaded as written by
+    :py:func:`dump_statements` in the JSONL or binary msgpack format.
+
     Parameters
     ----------
     fname : str
@@ -69,6 +87,15 @@ def load_statements(fname, as_dict=False):
         A list or dict of statements that were loaded.
     """
     logger.info('Loading %s...' % fname)
+    stmt_format = _get_stmt_file_format(fname)
+    if stmt_format == 'jsonl':
+        stmts = stmts_from_json_file(fname, format='jsonl')
+        logger.info('Loaded %d statements' % len(stmts))
+        return stmts
+    elif stmt_format == 'msgpack':
+        stmts = stmts_from_msgpack_file(fname)
+        logger.info('Loaded %d statements' % len(stmts))
+        return stmts
     with open(fname, 'rb') as fh:
         # Encoding argument not available in pickle for Python 2
         if sys.version_info[0] < 3:
@@ -89,10 +116,135 @@ def load_statements(fname, as_dict=False):
     return stmts
 
 
+def _get_stmt_file_format(fname):
+    # Return jsonl or msgpack if the file name has the corresponding
+    # extension, possibly followed by a compression extension
+    base_fname = str(fname)
+    for ext in ('.gz', '.zst'):
+        if base_fname.endswith(ext):
+            base_fname = base_fname[:-len(ext)]
+    for stmt_format in ('jsonl', 'msgpack'):
+        if base_fname.endswith('.' + stmt_format):
+            return stmt_format
+    return None
+
+
+def stream_statements(fnames):
+    """Yield statements from a list of files one file at a time.
+
+    Parameters
+    ----------
+    fnames : list[str]
+        The names of files to load statements from. Files with a .pkl
+        extension are loaded as pickle files (see
+        :py:func:`load_statements`), files with a .jsonl extension are read
+        line by line with one statement on each line, files with a .msgpack
+        extension are read one statement at a time in the binary format
+        written by :py:func:`indra.statements.io.write_stmts_msgpack` and
+        other files are loaded as JSON. Files with an additional .gz (or,
+        except for pickle files, .zst) extension are decompressed when read.
+
+    Returns
+    -------
+    generator[indra.statements.Statement]
+        A generator of the statements in the given files.
+    """
+    for fname in fnames:
+        base_fname = fname[:-3] if fname.endswith('.gz') else fname
+        stmt_format = _get_stmt_file_format(fname)
+        if base_fname.endswith('.pkl'):
+            if fname.endswith('.gz'):
+                with gzip.open(fname, 'rb') as fh:
+                    stmts = pickle.load(fh)
+            else:
+                stmts = load_statements(fname)
+            if isinstance(stmts, dict):
+                stmts = [stmt for st_list in stmts.values()
+                         for stmt in st_list]
+            yield from stmts
+        elif stmt_format:
+            logger.info('Streaming statements from %s...' % fname)
+            stmts = iter_stmts_from_json_file(fname) \
+                if stmt_format == 'jsonl' else \
+                iter_stmts_from_msgpack_file(fname)
+            # Support links can't be resolved while streaming statements
+            # so, as for single statements loaded with stmt_from_json,
+            # they are left out
+            for stmt in stmts:
+                yield resolve_support([stmt], on_missing_support='ignore')[0]
+        else:
+            logger.info('Loading %s...' % fname)
+            yield from stmts_from_json_file(fname)
+
+
+def run_preassembly_duplicate_streaming(fnames, out_fname, n_partitions=None,
+                                        tmp_dir=None, belief_scorer=None,
+                                        matches_fun=None, batch_size=None):
+    """Combine duplicates among statements in files too large for memory.
+
+    Statements are streamed from the given files and duplicates are
+    combined out of core using
+    :py:meth:`indra.preassembler.Preassembler.combine_duplicates_streaming`.
+    Prior beliefs are set on the unique statements in batches and the
+    statements are written into a JSONL file as they are produced.
+
+    Parameters
+    ----------
+    fnames : list[str]
+        The names of files to load statements from, see
+        :py:func:`stream_statements` for supported formats.
+    out_fname : str
+        The name of a JSONL file into which unique statements are written,
+        one statement per line. The file is compressed if its name ends
+        with .gz or .zst, see
+        :py:func:`indra.statements.io.write_stmts_jsonl`.
+    n_partitions : Optional[int]
+        The number of partitions statements are split into. This should be
+        set such that each partition fits in memory. Default: 64
+    tmp_dir : Optional[str]
+        A folder in which the temporary partition files are created. If None,
+        the system's default temporary folder is used. Default: None
+    belief_scorer : Optional[indra.belief.BeliefScorer]
+        Instance of BeliefScorer class to use in calculating Statement
+        probabilities. If None is provided (default), then the default
+        scorer is used.
+    matches_fun : Optional[function]
+        A function to override the built-in matches_key function of statements.
+    batch_size : Optional[int]
+        The number of unique statements whose beliefs are set and which are
+        written into the output file at a time. Default: 10000
+
+    Returns
+    -------
+    int
+        The number of unique statements written into the output file.
+    """
+    batch_size = batch_size if batch_size else 10000
+    be = BeliefEngine(scorer=belief_scorer, matches_fun=matches_fun)
+    pa = Preassembler(bio_ontology, matches_fun=matches_fun)
+    unique_stmts = pa.combine_duplicates_streaming(stream_statements(fnames),
+                                                   n_partitions=n_partitions,
+                                                   tmp_dir=tmp_dir)
+
+    def iter_with_beliefs():
+        while True:
+            batch = list(itertools.islice(unique_stmts, batch_size))
+            if not batch:
+                break
+            be.set_prior_probs(batch)
+            yield from batch
+
+    n_unique = write_stmts_jsonl(iter_with_beliefs(), out_fname,
+                                 matches_fun=matches_fun)
+    logger.info('Wrote %d unique statements into %s' % (n_unique, out_fname))
+    return n_unique
+
+
 @register_pipeline
 def map_grounding(stmts_in, do_rename=True, grounding_map=None,
                   misgrounding_map=None, agent_map=None, ignores=None, use_adeft=True,
-                  gilda_mode=None, grounding_map_policy='replace', **kwargs):
+                  gilda_mode=None, grounding_map_policy='replace',
+                  poolsize=None, **kwargs):
     """Map grounding using the GroundingMapper.
 
     Parameters
@@ -124,6 +276,10 @@ def map_grounding(stmts_in, do_rename=True, grounding_map=None,
     grounding_map_policy : Optional[str]
         If a grounding map is provided, use the policy to extend or replace
         a default grounding map. Default: 'replace'.
+    poolsize : Optional[int]
+        The number of worker processes used to map statements. If not given
+        or 1, the statements are mapped in the current process.
+        Default: None
 
     Returns
     -------
@@ -147,7 +303,8 @@ def map_grounding(stmts_in, do_rename=True, grounding_map=None,
     gm = GroundingMapper(gm, agent_map=agent_map,
                          misgrounding_map=misgm, ignores=ignores,
                          use_adeft=use_adeft, gilda_mode=gilda_mode)
-    stmts_out = gm.map_stmts(stmts_in, do_rename=do_rename)
+    stmts_out = gm.map_stmts(stmts_in, do_rename=do_rename,
+                             poolsize=poolsize)
     # Patch wrong locations in Translocation statements
     for stmt in stmts_out:
         if isinstance(stmt, Translocation):
@@ -246,7 +403,8 @@ def merge_groundings(stmts_in):
 
 @register_pipeline
 def map_sequence(stmts_in, do_methionine_offset=True,
-                 do_orthology_mapping=True, do_isoform_mapping=True, **kwargs):
+                 do_orthology_mapping=True, do_isoform_mapping=True,
+                 poolsize=None, **kwargs):
     """Map sequences using the SiteMapper.
 
     Parameters
@@ -275,6 +433,10 @@ def map_sequence(stmts_in, do_methionine_offset=True,
         SITEMAPPER_CACHE_PATH, defined in your INDRA config or the environment.
         If False, no cache is used. For more details on the cache, see the
         SiteMapper class definition.
+    poolsize : Optional[int]
+        The number of worker processes in which the distinct sites of the
+        statements are mapped. If not given or 1, the sites are mapped in
+        the current process. Default: None
     save : Optional[str]
         The name of a pickle file to save the results (stmts_out) into.
 
@@ -290,7 +452,7 @@ def map_sequence(stmts_in, do_methionine_offset=True,
                     do_methionine_offset=do_methionine_offset,
                     do_orthology_mapping=do_orthology_mapping,
                     do_isoform_mapping=do_isoform_mapping)
-    valid, mapped = sm.map_sites(stmts_in)
+    valid, mapped = sm.map_sites(stmts_in, poolsize=poolsize)
     correctly_mapped_stmts = []
     for ms in mapped:
         correctly_mapped = all([mm.has_mapping() for mm in ms.mapped_mods])
@@ -324,15 +486,14 @@ def run_preassembly(stmts_in, return_toplevel=True, poolsize=None,
         all statements are returned irrespective of level of specificity.
         Default: True
     poolsize : Optional[int]
-        The number of worker processes to use to parallelize the
-        comparisons performed by the function. If None (default), no
-        parallelization is performed. NOTE: Parallelization is only
-        available on Python 3.4 and above.
+        The number of worker processes to use to parallelize finding
+        refinements among statements. If None (default), no
+        parallelization is performed.
     size_cutoff : Optional[int]
-        Groups with size_cutoff or more statements are sent to worker
-        processes, while smaller groups are compared in the parent process.
-        Default value is 100. Not relevant when parallelization is not
-        used.
+        The minimum number of unique statements for which refinements
+        are found using worker processes, smaller sets of statements are
+        compared in the parent process. Default value is 100. Not relevant
+        when parallelization is not used.
     belief_scorer : Optional[indra.belief.BeliefScorer]
         Instance of BeliefScorer class to use in calculating Statement
         probabilities. If None is provided (default), then the default
@@ -453,11 +614,15 @@ def run_preassembly_related(preassembler, beliefengine, **kwargs):
         If True, only the top-level statements are returned. If False,
         all statements are returned irrespective of level of specificity.
         Default: True
+    poolsize : Optional[int]
+        The number of worker processes to use to parallelize finding
+        refinements among statements. If None (default), no
+        parallelization is performed.
     size_cutoff : Optional[int]
-        Groups with size_cutoff or more statements are sent to worker
-        processes, while smaller groups are compared in the parent process.
-        Default value is 100. Not relevant when parallelization is not
-        used.
+        The minimum number of unique statements for which refinements
+        are found using worker processes, smaller sets of statements are
+        compared in the parent process. Default value is 100. Not relevant
+        when parallelization is not used.
     flatten_evidence : Optional[bool]
         If True, evidences are collected and flattened via supports/supported_by
         links. Default: False
@@ -477,9 +642,11 @@ def run_preassembly_related(preassembler, beliefengine, **kwargs):
     logger.info('Combining related on %d statements...' %
                 len(preassembler.unique_stmts))
     return_toplevel = kwargs.get('return_toplevel', True)
+    poolsize = kwargs.get('poolsize', None)
     size_cutoff = kwargs.get('size_cutoff', 100)
     filters = kwargs.get('filters', None)
     stmts_out = preassembler.combine_related(return_toplevel=False,
+                                             poolsize=poolsize,
                                              size_cutoff=size_cutoff,
                                              filters=filters)
     # Calculate beliefs
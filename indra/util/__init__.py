@@ -44,8 +44,8 @@ def unicode_strs(obj, attr_filter=None):
             has_unicode_strs = unicode_strs(item)
             if not has_unicode_strs:
                 return False
-    if hasattr(obj, '__dict__'):
-        for item_name, item in obj.__dict__.items():
+    if hasattr(obj, '__dict__') or hasattr(obj, '__slots__'):
+        for item_name, item in _get_attrs(obj).items():
             if attr_filter and item_name in attr_filter:
                 continue
             has_unicode_strs = unicode_strs(item)
@@ -60,14 +60,26 @@ def unicode_strs(obj, attr_filter=None):
     return True
 
 
+def _get_attrs(obj):
+    # Return the attributes of an object including those stored in slots
+    attrs = dict(getattr(obj, '__dict__', {}))
+    for cls in type(obj).__mro__:
+        slots = cls.__dict__.get('__slots__', ())
+        for attr in ((slots,) if isinstance(slots, str) else slots):
+            if attr not in ('__dict__', '__weakref__') and \
+                    hasattr(obj, attr):
+                attrs[attr] = getattr(obj, attr)
+    return attrs
+
+
 def decode_obj(obj, encoding='utf-8'):
     if isinstance(obj, non_unicode):
         return obj.decode(encoding)
     elif isinstance(obj, list) or isinstance(obj, tuple):
         return [decode_obj(item) for item in obj]
-    elif hasattr(obj, '__dict__'):
-        for k, v in obj.__dict__.items():
-            obj.__dict__[k] = decode_obj(v)
+    elif hasattr(obj, '__dict__') or hasattr(obj, '__slots__'):
+        for k, v in _get_attrs(obj).items():
+            setattr(obj, k, decode_obj(v))
         return obj
     elif isinstance(obj, dict):
         dec_obj = {}
@@ -1,3 +1,4 @@
+import gc
 import argparse
 import inspect
 import logging
@@ -5,7 +6,7 @@ import json
 import base64
 
 from docstring_parser import parse
-from flask import Flask, request
+from flask import Flask, Response, request
 from flask_restx import Api, Resource, fields, abort
 from flask_cors import CORS
 
@@ -29,6 +30,14 @@ from indra.ontology.bio import bio_ontology
 from indra.pipeline import AssemblyPipeline, pipeline_functions
 from indra.preassembler.custom_preassembly import *
 
+try:
+    from rest_api.jobs import submit_job, get_job_status, \
+        get_job_result_lines
+except ImportError:
+    # When this file is run as a script, the rest_api package isn't
+    # importable but its modules are
+    from jobs import submit_job, get_job_status, get_job_result_lines
+
 
 logger = logging.getLogger('rest_api')
 logger.setLevel(logging.DEBUG)
@@ -51,6 +60,8 @@ indra_db_rest_ns = api.namespace(
     'INDRA DB REST', 'Use INDRA DB REST API', path='/indra_db_rest/')
 databases_ns = api.namespace(
     'Databases', 'Access external databases', path='/databases/')
+jobs_ns = api.namespace(
+    'Jobs', 'Run long preassembly jobs asynchronously', path='/jobs/')
 
 # Models that can be inherited and reused in different namespaces
 dict_model = api.model('dict', {})
@@ -90,7 +101,57 @@ dict_args = [
     'grounding_map', 'misgrounding_map', 'whitelist', 'mutations']
 
 
+# Very large lists of Statements can be sent and received as JSON lines
+# instead of JSON. In a JSON lines request body, the first line is a JSON
+# object with the arguments other than statements, and each following line
+# is the JSON of a Statement. Responses consist of a line for each Statement
+# if JSON lines are accepted by the client.
+JSONL_MIMETYPE = 'application/x-ndjson'
+
+
+def _accepts_jsonl():
+    return request.accept_mimetypes.best_match(
+        ['application/json', JSONL_MIMETYPE]) == JSONL_MIMETYPE
+
+
+def _iter_request_lines():
+    for line in request.stream:
+        line = line.decode('utf-8').strip()
+        if line:
+            yield line
+
+
+def _get_request_json():
+    # Return the JSON of a request, where the Statements of a JSON lines
+    # request are put in a list under the statements key
+    if request.mimetype != JSONL_MIMETYPE:
+        return request.json
+    lines = _iter_request_lines()
+    args = json.loads(next(lines, '{}'))
+    args['statements'] = [json.loads(line) for line in lines]
+    return args
+
+
+def _get_request_stmt_lines():
+    # Return the arguments of a request other than statements, and the JSON
+    # strings of its Statements which, for a JSON lines request, are read
+    # from the request as they are consumed
+    if request.mimetype != JSONL_MIMETYPE:
+        args = request.json
+        return args, (json.dumps(stmt_json)
+                      for stmt_json in args.pop('statements', []))
+    lines = _iter_request_lines()
+    return json.loads(next(lines, '{}')), lines
+
+
+def _stream_lines(lines):
+    return Response(lines, mimetype=JSONL_MIMETYPE)
+
+
 def _return_stmts(stmts):
+    if _accepts_jsonl():
+        return _stream_lines(json.dumps(stmt.to_json()) + '\n'
+                             for stmt in (stmts if stmts else []))
     if stmts:
         stmts_json = stmts_to_json(stmts)
         res = {'statements': stmts_json}
@@ -100,12 +161,7 @@ def _return_stmts(stmts):
 
 
 def _stmts_from_proc(proc):
-    if proc and proc.statements:
-        stmts = stmts_to_json(proc.statements)
-        res = {'statements': stmts}
-    else:
-        res = {'statements': []}
-    return res
+    return _return_stmts(proc.statements if proc else None)
 
 
 # Create Resources in Preassembly Namespace
@@ -147,46 +203,75 @@ class RunPipeline(Resource):
             The list of INDRA Statements resulting from running the pipeline
             on the list of input Statements.
         """
-        args = request.json
-        stmts = stmts_from_json(args.get('statements'))
-        pipeline_steps = args.get('pipeline')
-        ap = AssemblyPipeline(pipeline_steps)
-        stmts_out = ap.run(stmts)
+        args = _get_request_json()
+        stmts = stmts_from_json(args.pop('statements'))
+        stmts_out = run_stmts_function('pipeline', stmts, args)
         return _return_stmts(stmts_out)
 
 
 # Dynamically generate resources for assembly corpus functions
+def process_args(args_json):
+    """Convert the JSON arguments of an assembly corpus function."""
+    for arg in args_json:
+        if arg == 'stmt_type':
+            args_json[arg] = get_statement_by_name(args_json[arg])
+        elif arg in ['matches_fun', 'refinement_fun']:
+            args_json[arg] = pipeline_functions[args_json[arg]]
+        elif arg == 'belief_scorer':
+            # Here we could handle various string values of args_json[arg]
+            # but there currently aren't any specific options
+            args_json[arg] = None
+        elif arg == 'ontology':
+            # Here we could handle various string values of args_json[arg]
+            # but there currently aren't any specific options
+            args_json[arg] = bio_ontology
+        elif arg == 'whitelist' or arg == 'mutations':
+            args_json[arg] = {
+                gene: [tuple(mod) for mod in mods]
+                for gene, mods in args_json[arg].items()}
+    return args_json
+
+
+def run_stmts_function(func_name, stmts, args):
+    """Run an assembly corpus function or a pipeline on a list of Statements.
+
+    Parameters
+    ----------
+    func_name : str
+        The name of an assembly corpus function or "pipeline" to run the
+        pipeline given by the pipeline argument.
+    stmts : list[indra.statements.Statement]
+        The Statements to run the function on.
+    args : dict
+        The JSON arguments of the function other than the Statements.
+
+    Returns
+    -------
+    list[indra.statements.Statement]
+        The Statements returned by the function.
+    """
+    if func_name == 'pipeline':
+        ap = AssemblyPipeline(args.get('pipeline'))
+        return ap.run(stmts)
+    args = process_args(args)
+    return pipeline_functions[func_name](stmts, **args)
+
+
 class PreassembleStatements(Resource):
     """Parent Resource for Preassembly resources."""
     func_name = None
 
     def process_args(self, args_json):
-        for arg in args_json:
-            if arg == 'stmt_type':
-                args_json[arg] = get_statement_by_name(args_json[arg])
-            elif arg in ['matches_fun', 'refinement_fun']:
-                args_json[arg] = pipeline_functions[args_json[arg]]
-            elif arg == 'belief_scorer':
-                # Here we could handle various string values of args_json[arg]
-                # but there currently aren't any specific options
-                args_json[arg] = None
-            elif arg == 'ontology':
-                # Here we could handle various string values of args_json[arg]
-                # but there currently aren't any specific options
-                args_json[arg] = bio_ontology
-            elif arg == 'whitelist' or arg == 'mutations':
-                args_json[arg] = {
-                    gene: [tuple(mod) for mod in mods]
-                    for gene, mods in args_json[arg].items()}
-        return args_json
+        return process_args(args_json)
 
     @api.doc(False)
     def options(self):
         return {}
 
     def post(self):
-        args = self.process_args(request.json)
+        args = _get_request_json()
         stmts = stmts_from_json(args.pop('statements'))
+        args = self.process_args(args)
         stmts_out = pipeline_functions[self.func_name](stmts, **args)
         return _return_stmts(stmts_out)
 
@@ -298,6 +383,109 @@ for func_name, func in pipeline_functions.items():
             post.__doc__ = doc
 
 
+# Create resources for Jobs namespace
+@jobs_ns.expect(stmts_model)
+@jobs_ns.route('/preassembly/<string:func_name>')
+class SubmitJob(Resource):
+    @api.doc(False)
+    def options(self, func_name):
+        return {}
+
+    def post(self, func_name):
+        """Submit a job running a preassembly function or pipeline.
+
+        The request is the same as for the corresponding Preassembly
+        endpoint, e.g., /preassembly/run_preassembly for func_name
+        run_preassembly, or /preassembly/pipeline for func_name pipeline.
+        The job is run asynchronously and its status can be polled with
+        /jobs/{job_id}.
+
+        Parameters
+        ----------
+        statements : list[indra.statements.Statement.to_json()]
+            A list of INDRA Statements to run the function on.
+
+        Returns
+        -------
+        job_id : str
+            The ID of the submitted job.
+
+        status : str
+            The status of the submitted job.
+        """
+        if func_name != 'pipeline' and func_name not in pipeline_functions:
+            abort(404, 'No function named %s.' % func_name)
+        args, stmt_lines = _get_request_stmt_lines()
+        return submit_job(run_stmts_function, func_name, args, stmt_lines)
+
+
+@jobs_ns.route('/<string:job_id>')
+class JobStatus(Resource):
+    @api.doc(False)
+    def options(self, job_id):
+        return {}
+
+    def get(self, job_id):
+        """Return the status of a job.
+
+        Returns
+        -------
+        job_id : str
+            The ID of the job.
+
+        function : str
+            The name of the function run by the job.
+
+        status : str
+            One of queued, running, finished or failed.
+
+        error : str
+            The error raised by a failed job.
+        """
+        return _get_job_status(job_id)
+
+
+@jobs_ns.route('/<string:job_id>/result')
+class JobResult(Resource):
+    @api.doc(False)
+    def options(self, job_id):
+        return {}
+
+    def get(self, job_id):
+        """Return the Statements resulting from a finished job.
+
+        Returns
+        -------
+        statements : list[indra.statements.Statement.to_json()]
+            The list of INDRA Statements resulting from the job.
+        """
+        status = _get_job_status(job_id)
+        if status['status'] != 'finished':
+            abort(409, 'Job %s is %s.' % (job_id, status['status']))
+        lines = get_job_result_lines(job_id)
+        if _accepts_jsonl():
+            return _stream_lines(lines)
+
+        # The result is streamed as JSON without deserializing the
+        # Statements
+        def generate_json():
+            yield '{"statements": ['
+            for idx, line in enumerate(lines):
+                yield (',' if idx else '') + line.strip()
+            yield ']}'
+        return Response(generate_json(), mimetype='application/json')
+
+
+def _get_job_status(job_id):
+    try:
+        status = get_job_status(job_id)
+    except ValueError:
+        status = None
+    if status is None:
+        abort(404, 'No job with ID %s.' % job_id)
+    return status
+
+
 # Create resources for Sources namespace
 
 # REACH
@@ -1202,9 +1390,70 @@ class CbioMutations(Resource):
         return res
 
 
+def preload():
+    """Load resources shared by all requests before serving the API.
+
+    The bio ontology is initialized here rather than upon the first request
+    that needs it. When the API is served by multiple workers forked from
+    a process in which this function was called, the memory holding these
+    resources is shared by the workers until it is written to. Objects that
+    exist at this point are therefore moved out of the garbage collector's
+    reach, since collections would otherwise write to all of them.
+    """
+    bio_ontology.initialize()
+    gc.freeze()
+
+
+def run_workers(host, port, workers, timeout=None):
+    """Serve the API with multiple worker processes using gunicorn.
+
+    The application is loaded and :py:func:`preload` is called once before
+    the workers are forked so that they share the loaded resources.
+
+    Parameters
+    ----------
+    host : str
+        The host to bind to.
+    port : int
+        The port to bind to.
+    workers : int
+        The number of worker processes.
+    timeout : Optional[int]
+        The number of seconds after which a worker handling a request is
+        restarted. Default: gunicorn's default of 30 seconds
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class IndraRestApiApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', '%s:%d' % (host, port))
+            self.cfg.set('workers', workers)
+            self.cfg.set('preload_app', True)
+            if timeout:
+                self.cfg.set('timeout', timeout)
+
+        def load(self):
+            preload()
+            return app
+
+    IndraRestApiApplication().run()
+
+
 if __name__ == '__main__':
     argparser = argparse.ArgumentParser('Run the INDRA REST API')
     argparser.add_argument('--host', default='0.0.0.0')
     argparser.add_argument('--port', default=8080, type=int)
+    argparser.add_argument('--workers', default=1, type=int,
+                           help='The number of worker processes serving the '
+                                'API. More than one worker requires gunicorn.')
+    argparser.add_argument('--timeout', type=int,
+                           help='The number of seconds after which a worker '
+                                'handling a request is restarted when '
+                                'running more than one worker.')
     argparserargs = argparser.parse_args()
-    app.run(host=argparserargs.host, port=argparserargs.port)
+    if argparserargs.workers > 1:
+        run_workers(argparserargs.host, argparserargs.port,
+                    argparserargs.workers, argparserargs.timeout)
+    else:
+        preload()
+        app.run(host=argparserargs.host, port=argparserargs.port)
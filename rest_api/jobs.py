@@ -0,0 +1,318 @@
+"""An asynchronous job queue for long-running REST API requests.
+
+Jobs are kept in a folder shared by all the workers serving the API, given
+by the INDRA_REST_API_JOB_DIR configuration (a folder in the system's
+temporary directory by default), so that the status and result of a job
+can be requested from any worker, independently of the one the job was
+submitted to. Each job has its own subfolder with the following files:
+
+- status.json: the status of the job, updated as the job runs.
+- args.json: the arguments of the function run by the job.
+- input.jsonl: the input Statements, one Statement JSON per line.
+- result.jsonl: the output Statements, one Statement JSON per line, once
+  the job has finished.
+
+Jobs are run in a pool of processes started by each worker upon the first
+job submitted to it. The number of processes is given by the
+INDRA_REST_API_JOB_WORKERS configuration (1 by default).
+
+Jobs that are still queued or running when the process that they depend on
+has exited (e.g., a worker that was restarted, or a pool process that was
+killed for running out of memory) are marked as failed. The folders of jobs
+that finished or failed longer ago than given by the
+INDRA_REST_API_JOB_EXPIRY configuration (in hours, 24 by default) are
+deleted when new jobs are submitted.
+"""
+import os
+import json
+import time
+import uuid
+import shutil
+import socket
+import logging
+import tempfile
+import threading
+import multiprocessing
+from functools import partial
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from indra import get_config
+from indra.statements import stmts_from_json, stmts_to_json_file
+
+
+logger = logging.getLogger(__name__)
+
+
+_pool = None
+# The time at which expired jobs were last deleted by this process
+_last_cleanup = 0
+# Expired jobs are deleted at most this often (in seconds) by each process
+CLEANUP_INTERVAL = 600
+
+
+def get_job_dir(job_id=None):
+    """Return the folder of all jobs or of a given job.
+
+    Parameters
+    ----------
+    job_id : Optional[str]
+        The ID of a job. If not given, the folder containing all jobs is
+        returned.
+
+    Returns
+    -------
+    str
+        The path to the folder.
+    """
+    job_dir = get_config('INDRA_REST_API_JOB_DIR')
+    if not job_dir:
+        job_dir = os.path.join(tempfile.gettempdir(), 'indra_rest_api_jobs')
+    if job_id:
+        job_dir = os.path.join(job_dir, job_id)
+    return job_dir
+
+
+def submit_job(func, func_name, args, stmt_lines):
+    """Submit a job running a function on a list of Statements.
+
+    Parameters
+    ----------
+    func : function
+        A module-level function taking a function name, a list of INDRA
+        Statements and a dict of arguments, and returning a list of INDRA
+        Statements.
+    func_name : str
+        The name of the function to run, passed on to func.
+    args : dict
+        The arguments of the function, passed on to func.
+    stmt_lines : iterable[str]
+        The JSON strings of the input Statements. They are written to the
+        job's folder without being deserialized.
+
+    Returns
+    -------
+    dict
+        The status of the submitted job.
+    """
+    _cleanup_jobs_periodically()
+    job_id = uuid.uuid4().hex
+    job_dir = get_job_dir(job_id)
+    os.makedirs(job_dir)
+    with open(os.path.join(job_dir, 'args.json'), 'w') as fh:
+        json.dump(args, fh)
+    with open(os.path.join(job_dir, 'input.jsonl'), 'w') as fh:
+        for line in stmt_lines:
+            fh.write(line.strip() + '\n')
+    # The job depends on this process until it is started by the pool
+    status = _update_status(job_id, function=func_name, status='queued',
+                            submitted=_now(), host=socket.gethostname(),
+                            pid=os.getpid())
+    future = _get_pool().submit(_run_job, func, func_name, job_id)
+    future.add_done_callback(partial(_job_done, job_id))
+    logger.info('Submitted job %s running %s' % (job_id, func_name))
+    return status
+
+
+def get_job_status(job_id):
+    """Return the status of a job.
+
+    Parameters
+    ----------
+    job_id : str
+        The ID of the job.
+
+    Returns
+    -------
+    dict or None
+        The status of the job, with the status key being one of queued,
+        running, finished or failed, or None if there is no such job.
+    """
+    status = _read_status(_check_job_id(job_id))
+    if status and status['status'] in {'queued', 'running'} and \
+            _is_process_gone(status):
+        logger.info('Job %s was %s by a process that exited' %
+                    (job_id, status['status']))
+        status = _update_status(job_id, status='failed', finished=_now(),
+                                error='The process running the job exited.')
+    return status
+
+
+def cleanup_jobs(expiry=None):
+    """Delete the folders of jobs that finished or failed a while ago.
+
+    Parameters
+    ----------
+    expiry : Optional[float]
+        The number of hours after which the folder of a job that finished or
+        failed is deleted. By default, the INDRA_REST_API_JOB_EXPIRY
+        configuration is used, or 24 hours if it isn't set.
+
+    Returns
+    -------
+    list[str]
+        The IDs of the jobs whose folders were deleted.
+    """
+    if expiry is None:
+        expiry = float(get_config('INDRA_REST_API_JOB_EXPIRY') or 24)
+    job_root = get_job_dir()
+    if not os.path.isdir(job_root):
+        return []
+    now = datetime.now(timezone.utc)
+    deleted = []
+    for job_id in os.listdir(job_root):
+        try:
+            status = get_job_status(job_id)
+        except ValueError:
+            continue
+        # Jobs whose submission didn't complete don't have a status so the
+        # time their folder was last modified is used instead
+        if status is None:
+            finished = datetime.fromtimestamp(
+                os.path.getmtime(get_job_dir(job_id)), timezone.utc)
+        elif status['status'] in {'finished', 'failed'}:
+            finished = datetime.fromisoformat(status['finished'])
+        else:
+            continue
+        if (now - finished).total_seconds() > expiry * 3600:
+            shutil.rmtree(get_job_dir(job_id), ignore_errors=True)
+            deleted.append(job_id)
+    if deleted:
+        logger.info('Deleted %d expired jobs' % len(deleted))
+    return deleted
+
+
+def get_job_result_lines(job_id):
+    """Yield the lines of the result of a finished job.
+
+    Parameters
+    ----------
+    job_id : str
+        The ID of the job.
+
+    Yields
+    ------
+    str
+        The JSON of a Statement in the result of the job followed by a
+        newline.
+    """
+    fname = os.path.join(get_job_dir(_check_job_id(job_id)), 'result.jsonl')
+    with open(fname, 'r') as fh:
+        for line in fh:
+            yield line
+
+
+def _run_job(func, func_name, job_id):
+    # Run a job in a process of the pool and record its status
+    job_dir = get_job_dir(job_id)
+    _update_status(job_id, status='running', started=_now(),
+                   host=socket.gethostname(), pid=os.getpid())
+    try:
+        with open(os.path.join(job_dir, 'args.json'), 'r') as fh:
+            args = json.load(fh)
+        with open(os.path.join(job_dir, 'input.jsonl'), 'r') as fh:
+            stmts = stmts_from_json([json.loads(line) for line in fh])
+        stmts_out = func(func_name, stmts, args)
+        # The result is written to a temporary file first so that it is
+        # complete once the job is marked as finished
+        tmp_fname = os.path.join(job_dir, 'result.jsonl.tmp')
+        stmts_to_json_file(stmts_out if stmts_out else [], tmp_fname,
+                           format='jsonl')
+        os.replace(tmp_fname, os.path.join(job_dir, 'result.jsonl'))
+    except Exception as e:
+        logger.exception('Job %s failed' % job_id)
+        _update_status(job_id, status='failed', finished=_now(),
+                       error='%s: %s' % (type(e).__name__, e))
+        return
+    _update_status(job_id, status='finished', finished=_now(),
+                   num_statements=len(stmts_out) if stmts_out else 0)
+
+
+def _job_done(job_id, future):
+    # Jobs whose pool process died, e.g., after running out of memory, can't
+    # record that they failed themselves. The pool can't run any more jobs
+    # after that so a new one is started for the next job.
+    global _pool
+    if future.cancelled() or future.exception() is None:
+        return
+    if isinstance(future.exception(), BrokenProcessPool):
+        _pool = None
+    status = _read_status(job_id)
+    if status and status['status'] in {'queued', 'running'}:
+        _update_status(job_id, status='failed', finished=_now(),
+                       error='%s: %s' % (type(future.exception()).__name__,
+                                         future.exception()))
+
+
+def _is_process_gone(status):
+    # Return True if the process that a queued or running job depends on
+    # has exited. This can only be told on the machine the process ran on.
+    if status.get('host') != socket.gethostname() or not status.get('pid'):
+        return False
+    try:
+        os.kill(status['pid'], 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        pass
+    return False
+
+
+def _cleanup_jobs_periodically():
+    global _last_cleanup
+    if time.time() - _last_cleanup < CLEANUP_INTERVAL:
+        return
+    _last_cleanup = time.time()
+    try:
+        cleanup_jobs()
+    except Exception:
+        logger.exception('Could not delete expired jobs')
+
+
+def _read_status(job_id):
+    fname = os.path.join(get_job_dir(job_id), 'status.json')
+    if not os.path.exists(fname):
+        return None
+    with open(fname, 'r') as fh:
+        return json.load(fh)
+
+
+def _update_status(job_id, **kwargs):
+    status = _read_status(job_id) or {'job_id': job_id}
+    status.update(kwargs)
+    fname = os.path.join(get_job_dir(job_id), 'status.json')
+    # The status may be updated by the thread handling finished jobs as well
+    # as by the one submitting them
+    tmp_fname = '%s.%d.%d.tmp' % (fname, os.getpid(), threading.get_ident())
+    with open(tmp_fname, 'w') as fh:
+        json.dump(status, fh)
+    os.replace(tmp_fname, fname)
+    return status
+
+
+def _get_pool():
+    # The pool is started lazily in each worker so that it isn't inherited
+    # by workers forked from a preloaded application
+    global _pool
+    if _pool is None:
+        max_workers = int(get_config('INDRA_REST_API_JOB_WORKERS') or 1)
+        if 'fork' in multiprocessing.get_all_start_methods():
+            ctx = multiprocessing.get_context('fork')
+        else:
+            ctx = multiprocessing.get_context()
+        _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx)
+    return _pool
+
+
+def _check_job_id(job_id):
+    # Job IDs are used as folder names so only the hex IDs given to jobs
+    # are accepted
+    try:
+        return uuid.UUID(hex=job_id).hex
+    except ValueError:
+        raise ValueError('Invalid job ID: %s' % job_id)
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
@@ -25,6 +25,7 @@ def main():
                       'geneways': ['stemming', 'nltk<3.6'],
                       'bel': ['pybel>=0.15.0,<0.16.0'],
                       'sbml': ['python-libsbml'],
+                      'stmt_io': ['msgpack', 'zstandard'],
                       # Tools and analysis
                       'machine': ['pytz', 'tzlocal', 'tweepy', 'pyyaml>=5.1.0',
                                   'click'],
@@ -67,7 +68,7 @@ def main():
                     'indra.explanation.pathfinding',
                     'indra.literature', 'indra.mechlinker',
                     'indra.ontology', 'indra.ontology.bio',
-                    'indra.ontology.virtual',
+                    'indra.ontology.virtual', 'indra.ontology.compiled',
                     'indra.ontology.app', 'indra.pipeline',
                     'indra.preassembler',
                     'indra.preassembler.grounding_mapper', 'indra.sources',